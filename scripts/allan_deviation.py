@@ -0,0 +1,103 @@
+"""
+加速度計の時系列のオーバーラッピング・アラン偏差（ADEV）
+
+サンプリング間隔 τ₀ の加速度 y_i を積分した位相（速度）x_i = τ₀ Σ y を使うと、
+平均化時間 τ = m τ₀ のオーバーラッピング・アラン分散は
+    σ²(τ) = Σ_i (x_{i+2m} - 2x_{i+m} + x_i)² / (2 τ² (N - 2m))
+と書ける（N は位相の点数）。区間平均を毎回取り直す代わりに累積和の差分を使うので、
+1つの τ あたり O(N) で計算できる。位相の配列全体は作らず、max_elements / 2 サンプルごとの
+区切りの位相（累積和）だけを保持し、差分に必要な3つの区間 x_i・x_{i+m}・x_{i+2m} を
+その都度区切りから累積和で復元する。入力は np.memmap でもよく、数百万サンプル以上の
+時系列でも一時配列の大きさは一定（区切りの位相だけが N / (max_elements / 2) 点）
+
+誤差モデル（ins_error.AccelerometerSpec）に対する解析解:
+    ホワイトノイズ N:                σ = N / √τ
+    バイアスのランダムウォーク K:    σ = K √(τ/3)
+
+使用例:
+    accel = simulate_acceleration(MEMS_SPEC, rng, duration=3 * 3600, rate=100.0)
+    taus, adev = overlapping_adev(accel, rate=100.0)
+    model = model_adev(MEMS_SPEC, taus)
+
+    # 記録済みのデータをメモリマップで読む
+    taus, adev = overlapping_adev(np.load("accel.npy", mmap_mode="r"), rate=1000.0)
+"""
+
+import numpy as np
+
+# 1チャンクで読み込む要素数（float64 で 32 MB）
+MAX_ELEMENTS = 1 << 22
+
+
+def log_spaced_factors(n_samples, points_per_decade=8, max_factor=None):
+    """平均化の倍率 m（1 から最大 (N - 1) / 2 まで対数等間隔、重複なし）"""
+    limit = (n_samples - 1) // 2 if max_factor is None else min(max_factor, (n_samples - 1) // 2)
+    if limit < 1:
+        return np.array([], dtype=np.int64)
+    decades = np.log10(limit)
+    factors = np.logspace(0, decades, int(np.ceil(decades * points_per_decade)) + 1)
+    return np.unique(np.round(factors).astype(np.int64))
+
+
+def phase_checkpoints(samples, dt, block):
+    """位相 x を block 点ごとに取り出したもの（x₀ = 0, x_block, x_2block, ...）"""
+    n = len(samples)
+    checkpoints = np.zeros(n // block + 1)
+    for k, start in enumerate(range(0, n - n % block, block)):
+        block_sum = np.asarray(samples[start:start + block], dtype=float).sum()
+        checkpoints[k + 1] = checkpoints[k] + block_sum * dt
+    return checkpoints
+
+
+def phase_window(samples, dt, checkpoints, block, start, length):
+    """位相 x[start:start + length] を直前の区切りからの累積和で復元する（length ≤ block）"""
+    first = start // block * block
+    # x_p は samples[:p] の和なので、x[first:start + length] には samples[first:start + length - 1] を使う
+    window = np.empty(start + length - first)
+    window[0] = checkpoints[first // block]
+    np.cumsum(np.asarray(samples[first:start + length - 1], dtype=float), out=window[1:])
+    window[1:] *= dt
+    window[1:] += window[0]
+    return window[start - first:]
+
+
+def overlapping_adev(samples, rate, factors=None, max_elements=MAX_ELEMENTS):
+    """オーバーラッピング・アラン偏差
+
+    Args:
+        samples: 加速度の時系列 (N,)（np.memmap 可）
+        rate: サンプリング周波数 [Hz]
+        factors: 平均化の倍率 m の配列（既定: log_spaced_factors()）
+    Returns:
+        (taus, adev): 平均化時間 [s] とアラン偏差（samples と同じ単位）
+    """
+    dt = 1.0 / rate
+    n_phase = len(samples) + 1
+    block = max(1, max_elements // 2)
+    checkpoints = phase_checkpoints(samples, dt, block)
+    if factors is None:
+        factors = log_spaced_factors(n_phase - 1)
+    factors = np.asarray(factors, dtype=np.int64)
+
+    adev = np.empty(len(factors))
+    for j, m in enumerate(factors):
+        count = n_phase - 2 * m
+        total = 0.0
+        for start in range(0, count, block):
+            length = min(block, count - start)
+            diff = phase_window(samples, dt, checkpoints, block, start + 2 * m, length)
+            diff -= 2 * phase_window(samples, dt, checkpoints, block, start + m, length)
+            diff += phase_window(samples, dt, checkpoints, block, start, length)
+            total += diff @ diff
+        tau = m * dt
+        adev[j] = np.sqrt(total / (2 * tau**2 * count))
+    return factors * dt, adev
+
+
+def model_adev(spec, taus):
+    """誤差モデルのアラン偏差の解析解 √(N²/τ + K²τ/3)
+
+    固定バイアスは差分で消えるのでアラン偏差には現れない
+    """
+    taus = np.asarray(taus, dtype=float)
+    return np.sqrt(spec.noise_density**2 / taus + spec.bias_random_walk**2 * taus / 3)
@@ -0,0 +1,130 @@
+"""
+⁸⁷Rb D2線のドップラーシフトした吸収スペクトルと、対向2ビームの散乱力（光糖蜜）
+
+速度 v（ビームの進行方向を正）の原子から見たレーザーの離調は δ - k v なので、
+1本のビームによる散乱率は
+    R(δ, v) = (Γ/2) s₀ / (1 + s_tot + 4 (δ - k v)² / Γ²)
+対向する2本のビーム（s_tot = 2 s₀）による正味の力は
+    F(v) = ħk [R(δ, v) - R(δ, -v)]
+で、|v| が小さいところでは F ≈ -β v（δ < 0 で β > 0 の減衰力）になる。
+どの関数も離調と速度をブロードキャストするので、(離調 × 速度) の格子を1回で計算できる
+
+force_table() は (離調, 速度) の格子上の散乱率と力をパラメータの組ごとにキャッシュするので、
+離調をスイープするアニメーションでは各フレームで格子の行を補間するだけで済む
+
+使用例:
+    v = np.linspace(-10, 10, 2001)
+    F = molasses_force(v, detuning=-0.5 * GAMMA_D2, saturation=0.5)   # (2001,) [N]
+    F = molasses_force(v[None, :], detunings[:, None])                  # (離調, 速度)
+    table = force_table(v_max=10.0, detuning_range=(-3.0, -0.1))
+    table.force_at(-0.8 * GAMMA_D2)   # 格子の行を補間した F(v)
+"""
+
+import numpy as np
+
+from rb87_constants import GAMMA_D2, HBAR, K_D2
+
+# パラメータの組ごとの ForceTable
+_table_cache = {}
+
+
+def doppler_shift(velocity, k=K_D2):
+    """速度 v の原子が感じる周波数のずれ k v [rad/s]（ビームに向かう向きが負の v）"""
+    return k * np.asarray(velocity, dtype=float)
+
+
+def scattering_rate(detuning, velocity=0.0, saturation=1.0, total_saturation=None, k=K_D2):
+    """1本のビームによる散乱率 [1/s]（detuning [rad/s] と velocity [m/s] はブロードキャスト）
+
+    Args:
+        velocity: ビームの進行方向に沿った原子の速度（負ならビームに向かって進む）
+        total_saturation: 分母の飽和項（既定: saturation）
+    """
+    if total_saturation is None:
+        total_saturation = saturation
+    effective = np.asarray(detuning, dtype=float) - doppler_shift(velocity, k)
+    return (GAMMA_D2 / 2) * saturation / (
+        1 + total_saturation + 4 * (effective / GAMMA_D2) ** 2
+    )
+
+
+def absorption_spectrum(detuning, velocity=0.0, saturation=0.0, k=K_D2):
+    """ドップラーシフトした吸収スペクトル（共鳴で 1 に規格化、飽和による線幅の広がりを含む）"""
+    return scattering_rate(detuning, velocity, 1.0, saturation, k) * 2 * (1 + saturation) / GAMMA_D2
+
+
+def molasses_force(velocity, detuning, saturation=0.5, k=K_D2):
+    """対向2ビームによる正味の力 F(v) [N]（正の v はビーム1の進行方向）"""
+    total = 2 * saturation
+    forward = scattering_rate(detuning, velocity, saturation, total, k)
+    backward = scattering_rate(detuning, -np.asarray(velocity, dtype=float), saturation, total, k)
+    return HBAR * k * (forward - backward)
+
+
+def damping_coefficient(detuning, saturation=0.5, k=K_D2):
+    """|v| ≪ Γ/k での減衰係数 β（F ≈ -β v）[kg/s]
+
+    β = -8ħk² s₀ (δ/Γ) / (1 + 2s₀ + 4(δ/Γ)²)²
+    """
+    x = np.asarray(detuning, dtype=float) / GAMMA_D2
+    return -8 * HBAR * k**2 * saturation * x / (1 + 2 * saturation + 4 * x**2) ** 2
+
+
+class ForceTable:
+    """(離調, 速度) 格子上の2ビームの散乱率と力
+
+    Attributes:
+        detunings: (D,) 離調 [rad/s]
+        velocities: (V,) 速度 [m/s]
+        rate_forward, rate_backward: (D, V) 各ビームの散乱率 [1/s]
+        force: (D, V) 正味の力 [N]
+    """
+
+    def __init__(self, detunings, velocities, saturation=0.5, k=K_D2):
+        self.detunings = np.asarray(detunings, dtype=float)
+        self.velocities = np.asarray(velocities, dtype=float)
+        self.saturation = saturation
+        total = 2 * saturation
+        d = self.detunings[:, None]
+        v = self.velocities[None, :]
+        self.rate_forward = scattering_rate(d, v, saturation, total, k)
+        self.rate_backward = scattering_rate(d, -v, saturation, total, k)
+        self.force = HBAR * k * (self.rate_forward - self.rate_backward)
+        # キャッシュで共有するので書き換えられないようにする
+        for array in (self.detunings, self.velocities, self.rate_forward,
+                      self.rate_backward, self.force):
+            array.setflags(write=False)
+
+    def _rows(self, table, detuning):
+        """離調方向に線形補間した行（detuning は格子の範囲にクリップ）"""
+        position = np.interp(detuning, self.detunings, np.arange(len(self.detunings)))
+        lower = min(int(position), len(self.detunings) - 2)
+        weight = position - lower
+        return (1 - weight) * table[lower] + weight * table[lower + 1]
+
+    def force_at(self, detuning):
+        """離調 detuning [rad/s] での F(v)（velocities 上の (V,) 配列）"""
+        return self._rows(self.force, detuning)
+
+    def rate_at(self, detuning):
+        """離調 detuning [rad/s] での (前向きビーム, 後ろ向きビーム) の散乱率"""
+        return self._rows(self.rate_forward, detuning), self._rows(self.rate_backward, detuning)
+
+
+def force_table(v_max=10.0, n_velocities=801, detuning_range=(-4.0, 0.0), n_detunings=161,
+                saturation=0.5):
+    """パラメータの組ごとにキャッシュした ForceTable
+
+    Args:
+        v_max: 速度の範囲 ±v_max [m/s]
+        detuning_range: 離調の範囲（Γ 単位）
+    """
+    key = (float(v_max), int(n_velocities), tuple(map(float, detuning_range)),
+           int(n_detunings), float(saturation))
+    if key not in _table_cache:
+        _table_cache[key] = ForceTable(
+            np.linspace(*detuning_range, n_detunings) * GAMMA_D2,
+            np.linspace(-v_max, v_max, n_velocities),
+            saturation,
+        )
+    return _table_cache[key]
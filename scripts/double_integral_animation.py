@@ -9,6 +9,13 @@
 """
 
 from manim import *
+import numpy as np
+
+from ins_error import AccelerometerSpec, simulate_position_error
+from scene_rng import scene_rng
+
+# δa = 1 のバイアスにホワイトノイズを加えた説明用の加速度計
+UNIT_BIAS_SPEC = AccelerometerSpec("unit_bias", bias=1.0, noise_density=0.2)
 
 
 class DoubleIntegral(Scene):
@@ -353,6 +360,29 @@ class ErrorAccumulationGraph(Scene):
         self.play(Write(curve_label))
         self.wait(0.5)
 
+        # ノイズを含むモンテカルロ試行: 個々の軌道はばらつくが平均は t² に乗る
+        runs = simulate_position_error(
+            UNIT_BIAS_SPEC,
+            scene_rng(self),
+            duration=5,
+            rate=200.0,
+            runs=12,
+            output_interval=0.05,
+        )
+        trajectories = VGroup(*[
+            axes.plot(
+                lambda t, x=x: np.interp(t, runs.times, x),
+                x_range=[0, 5],
+                use_vectorized=True,
+                color=MEASURED_COLOR,
+                stroke_width=1.5,
+                stroke_opacity=0.5,
+            )
+            for x in runs.positions
+        ])
+        self.play(LaggedStart(*[Create(c) for c in trajectories], lag_ratio=0.1), run_time=2)
+        self.wait(0.5)
+
         # 時間経過で誤差が急増することを示す
         # t=2 と t=4 の点を比較
         dot_t2 = Dot(axes.c2p(2, 0.5 * 4), color=YELLOW, radius=0.1)
@@ -0,0 +1,199 @@
+"""
+シミュレーション結果をフレーム単位で保存・遅延読み込みするアーカイブ
+
+物理計算を使うシーンは、レンダリングのたびに（画質を変えただけでも）同じ計算をやり直している。
+アーカイブはシミュレーションの出力をフレーム軸（時刻や温度など）に沿った配列として1度だけ書き出し、
+シーンはそれをメモリマップで開いてフレーム番号や軸の値で必要な行だけを読む。
+フレーム軸はシーンのフレームレートと無関係なので、-ql / -qm / -qh のレンダリングが
+同じ出力を再計算なしで共有できる
+
+ディレクトリ構成（<media_dir>/sim_cache/<名前>-<ハッシュ>/）:
+    header.json   {"format", "name", "hash", "params", "code", "frame_axis", "num_frames", "arrays"}
+    <配列名>.npy   先頭の軸がフレーム（np.load(mmap_mode="r") で開く）
+
+ハッシュはパラメータ（JSON）・計算のコードのダイジェスト・FORMAT_VERSION から計算するので、
+パラメータを変えても、計算する関数を定義したシーンのファイルやそれが使う scripts/ 内の
+モジュール（particle_box、rb87_constants など）を編集しても別のアーカイブになる。書き込みは一時ディレクトリに行ってから名前を変えるので、
+中断しても壊れたアーカイブは残らない
+
+キャッシュの場所は環境変数 MANIM_SIM_CACHE（既定: manim の media_dir の sim_cache、
+render_all.py --media-dir で変えたならその中）で変えられる
+
+使用例:
+    def compute():
+        times, frames = box.simulate(duration=3.0)
+        return {"times": times, "positions": frames}
+
+    archive = cached_archive("HotVsColdParticles", params, compute, frame_axis="times")
+    archive.frame(0, "positions")          # 最初のフレーム
+    archive.frame_at(1.25, "positions")    # 軸の値で補間
+    archive.drive(cloud, "positions")      # PointCloud を再生する updater
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+from pathlib import Path
+
+import numpy as np
+
+from render_manifest import function_digest
+
+FORMAT_VERSION = 1
+REPO_DIR = Path(__file__).resolve().parent.parent
+CACHE_ENV = "MANIM_SIM_CACHE"
+DEFAULT_CACHE_DIR = REPO_DIR / "media" / "sim_cache"
+HEADER_NAME = "header.json"
+
+# このプロセスでの cached_archive のヒット・ミスと計算時間（render_profiler が記録する）
+stats = {"hits": 0, "misses": 0, "compute_time": 0.0}
+
+
+def cache_dir_from_env():
+    """アーカイブを置くディレクトリ
+
+    MANIM_SIM_CACHE があればそこ、なければ manim の設定の media_dir の下（manim を
+    import できない場合は ./media/sim_cache）
+    """
+    root = os.environ.get(CACHE_ENV, "")
+    if root:
+        return Path(root)
+    try:
+        from manim import config
+    except ImportError:
+        return DEFAULT_CACHE_DIR
+    return Path(config.media_dir).resolve() / "sim_cache"
+
+
+def archive_hash(name, params, code=""):
+    """名前・パラメータ・コードのダイジェスト・フォーマットのバージョンから決まるハッシュ（16桁）"""
+    payload = json.dumps(
+        {"format": FORMAT_VERSION, "name": name, "params": params, "code": code},
+        sort_keys=True,
+        ensure_ascii=False,
+    )
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+def archive_path(name, params, cache_dir=None, code=""):
+    cache_dir = cache_dir_from_env() if cache_dir is None else Path(cache_dir)
+    return cache_dir / f"{name}-{archive_hash(name, params, code)}"
+
+
+class FrameArchive:
+    """書き出したアーカイブを開く（配列は最初に使うときにメモリマップで開く）
+
+    Args:
+        path: アーカイブのディレクトリ
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.header = json.loads((self.path / HEADER_NAME).read_text(encoding="utf-8"))
+        if self.header.get("format") != FORMAT_VERSION:
+            raise ValueError(f"unsupported archive format: {self.header.get('format')}")
+        self._arrays = {}
+
+    @property
+    def params(self):
+        return self.header["params"]
+
+    @property
+    def num_frames(self):
+        return self.header["num_frames"]
+
+    @property
+    def names(self):
+        return list(self.header["arrays"])
+
+    def __getitem__(self, name):
+        if name not in self._arrays:
+            if name not in self.header["arrays"]:
+                raise KeyError(name)
+            self._arrays[name] = np.load(self.path / f"{name}.npy", mmap_mode="r")
+        return self._arrays[name]
+
+    def frame(self, index, name):
+        """index 番目のフレーム（配列として読み込む）"""
+        return np.asarray(self[name][index])
+
+    def frame_at(self, value, name):
+        """フレーム軸の値 value での name の行（前後のフレームを線形補間、範囲外は端の値）"""
+        axis = self[self.header["frame_axis"]]
+        position = float(np.interp(value, axis, np.arange(len(axis))))
+        i = min(int(position), len(axis) - 2)
+        weight = position - i
+        return (1 - weight) * self[name][i] + weight * self[name][i + 1]
+
+    def drive(self, cloud, name, time_scale=1.0):
+        """経過時間をフレーム軸の値として cloud.set_positions() する updater を追加する"""
+        elapsed = [0.0]
+
+        def updater(mob, dt):
+            elapsed[0] += dt * time_scale
+            mob.set_positions(self.frame_at(elapsed[0], name))
+
+        cloud.add_updater(updater)
+        return updater
+
+
+def write_archive(path, name, params, arrays, frame_axis, code=""):
+    """arrays（{名前: 先頭の軸がフレームの配列}）をアーカイブとして書き出す"""
+    path = Path(path)
+    num_frames = len(arrays[frame_axis])
+    for key, array in arrays.items():
+        if len(array) != num_frames:
+            raise ValueError(f"{key}: expected {num_frames} frames, got {len(array)}")
+
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+    tmp.mkdir(parents=True, exist_ok=True)
+    specs = {}
+    for key, array in arrays.items():
+        array = np.ascontiguousarray(array)
+        np.save(tmp / f"{key}.npy", array)
+        specs[key] = {"shape": list(array.shape), "dtype": array.dtype.str}
+    header = {
+        "format": FORMAT_VERSION,
+        "name": name,
+        "hash": archive_hash(name, params, code),
+        "params": params,
+        "code": code,
+        "frame_axis": frame_axis,
+        "num_frames": num_frames,
+        "arrays": specs,
+    }
+    (tmp / HEADER_NAME).write_text(
+        json.dumps(header, indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+    )
+    try:
+        os.replace(tmp, path)
+    except OSError:
+        # 別のプロセスが先に同じアーカイブを書き終えていた
+        shutil.rmtree(tmp, ignore_errors=True)
+    return FrameArchive(path)
+
+
+def cached_archive(name, params, compute, frame_axis="times", cache_dir=None, code=None):
+    """パラメータとコードが同じアーカイブがあれば開き、なければ compute() の結果を書き出して開く
+
+    Args:
+        params: JSON にできるパラメータ（シード値など結果を変えるものをすべて含める）
+        compute: 引数なしで {名前: 配列} を返す関数（アーカイブがないときだけ呼ぶ）
+        cache_dir: アーカイブを置くディレクトリ（既定: cache_dir_from_env()）
+        code: 計算のコードのバージョン（既定: compute を定義したモジュール全体と、
+            それが import する scripts/ 内のモジュールのダイジェスト）
+    """
+    if code is None:
+        code = function_digest(compute)
+    path = archive_path(name, params, cache_dir, code)
+    if (path / HEADER_NAME).exists():
+        stats["hits"] += 1
+        return FrameArchive(path)
+    stats["misses"] += 1
+    path.parent.mkdir(parents=True, exist_ok=True)
+    start = time.perf_counter()
+    arrays = compute()
+    stats["compute_time"] += time.perf_counter() - start
+    return write_archive(path, name, params, arrays, frame_axis, code)
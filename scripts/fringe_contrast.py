@@ -0,0 +1,97 @@
+"""
+熱い原子集団の干渉縞とコントラストの計算（NumPyベクトル化版）
+
+原子 i の波数 k_i・位相 φ_i・重み w_i から、(原子数 × x の点数) の位相配列を
+1回のブロードキャストで作り、
+    Σ w cos(k x + φ)、Σ w sin(k x + φ)
+をまとめて計算する。原子数が多いときは位相配列の要素数が max_elements を超えないように
+原子をチャンクに分けて足し合わせるので、メモリ使用量は原子数によらず一定
+
+    superpose():      Σ a sin(k x + φ)（波の重ね合わせ）
+    coherence():      <e^{i(k x + φ)}>（集団平均した複素振幅）
+    fringe_pattern(): 平均の干渉縞 (1 + Re<e^{iθ}>) / 2 とコントラスト |<e^{iθ}>|
+
+速度分布から決まる波数 k = α v（既定は物質波 α = m/ħ）については、
+マクスウェル・ボルツマン分布からサンプリングする方法と、
+ガウス平均の解析解 <e^{ikx}> = e^{iαv₀x} e^{-(ασx)²/2} を使う方法を選べる
+
+使用例:
+    x = np.linspace(-2, 2, 400)
+    y = superpose(x, 2 * np.pi / wavelengths, phases, amplitudes=0.1)
+    pattern, contrast = fringe_pattern(x, sample_wavenumbers(rng, T, 10**6, v0=1.0))
+    C = thermal_contrast(x[None, :], T[:, None])   # 温度 × 位置のコントラスト
+"""
+
+import numpy as np
+
+from mb_distribution import velocity_sigma
+from rb87_constants import HBAR, K_B, M_RB87
+
+# 1チャンクの位相配列の最大要素数（float64 で 32 MB）
+MAX_ELEMENTS = 1 << 22
+
+
+def _weighted_sums(x, wavenumbers, phases=0.0, weights=1.0, max_elements=MAX_ELEMENTS):
+    """Σ w cos(k x + φ) と Σ w sin(k x + φ)（x と同じ形状）"""
+    x = np.asarray(x, dtype=float)
+    points = x.ravel()
+    k = np.asarray(wavenumbers, dtype=float).ravel()
+    n = len(k)
+    phases = np.broadcast_to(np.asarray(phases, dtype=float), (n,))
+    weights = np.broadcast_to(np.asarray(weights, dtype=float), (n,))
+
+    cos_sum = np.zeros(len(points))
+    sin_sum = np.zeros(len(points))
+    chunk = max(1, max_elements // max(len(points), 1))
+    for start in range(0, n, chunk):
+        rows = slice(start, start + chunk)
+        theta = np.multiply.outer(k[rows], points)
+        theta += phases[rows, None]
+        cos_sum += weights[rows] @ np.cos(theta)
+        sin_sum += weights[rows] @ np.sin(theta)
+    return cos_sum.reshape(x.shape), sin_sum.reshape(x.shape)
+
+
+def superpose(x, wavenumbers, phases=0.0, amplitudes=1.0, max_elements=MAX_ELEMENTS):
+    """波の重ね合わせ Σ a sin(k x + φ)"""
+    _, sin_sum = _weighted_sums(x, wavenumbers, phases, amplitudes, max_elements)
+    return sin_sum
+
+
+def coherence(x, wavenumbers, phases=0.0, weights=1.0, max_elements=MAX_ELEMENTS):
+    """集団平均した複素振幅 <e^{i(k x + φ)}>（重み付き平均）"""
+    n = np.size(wavenumbers)
+    total = np.broadcast_to(np.asarray(weights, dtype=float), (n,)).sum()
+    cos_sum, sin_sum = _weighted_sums(x, wavenumbers, phases, weights, max_elements)
+    return (cos_sum + 1j * sin_sum) / total
+
+
+def fringe_pattern(x, wavenumbers, phases=0.0, weights=1.0, max_elements=MAX_ELEMENTS):
+    """平均の干渉縞 (1 + cos) / 2 とコントラスト（どちらも x と同じ形状）"""
+    c = coherence(x, wavenumbers, phases, weights, max_elements)
+    return (1 + c.real) / 2, np.abs(c)
+
+
+def sample_wavenumbers(rng, T, n, v0=0.0, alpha=M_RB87 / HBAR, m=M_RB87, k_B=K_B):
+    """温度 T の1次元速度分布（平均 v0）からサンプリングした波数 k = α v"""
+    velocities = rng.normal(v0, float(velocity_sigma(T, m, k_B)), size=n)
+    return alpha * velocities
+
+
+def thermal_coherence(x, T, v0=0.0, alpha=M_RB87 / HBAR, m=M_RB87, k_B=K_B):
+    """温度 T の速度分布で平均した複素振幅の解析解（x と T はブロードキャスト）"""
+    x = np.asarray(x, dtype=float)
+    sigma_k = alpha * velocity_sigma(T, m, k_B)
+    return np.exp(1j * alpha * v0 * x - 0.5 * (sigma_k * x) ** 2)
+
+
+def thermal_contrast(x, T, alpha=M_RB87 / HBAR, m=M_RB87, k_B=K_B):
+    """温度 T での干渉縞のコントラスト e^{-(ασx)²/2}（x と T はブロードキャスト）"""
+    sigma_k = alpha * velocity_sigma(T, m, k_B)
+    return np.exp(-0.5 * (sigma_k * np.asarray(x, dtype=float)) ** 2)
+
+
+def thermal_fringe_pattern(x, T, v0=0.0, alpha=M_RB87 / HBAR, m=M_RB87, k_B=K_B):
+    """温度 T での平均の干渉縞とコントラスト（解析解）"""
+    c = thermal_coherence(x, T, v0, alpha, m, k_B)
+    return (1 + c.real) / 2, np.abs(c)
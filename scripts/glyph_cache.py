@@ -0,0 +1,267 @@
+"""
+Text の文字ごとの輪郭キャッシュ（日本語の多いシーン向け）
+
+manim の Text は文字列ごとに Pango でレイアウトして SVG を書き出し、その SVG を読み込む。
+ディスクのキャッシュも文字列単位なので、「原子の運動」「経路A」「検出器1」のように
+文字の組み合わせが変わるたびに Pango を呼ぶことになる。
+
+install() は Text._text2svg を差し替え、1行のテキストを文字ごとの輪郭から組み立てる:
+    フォント・太さ・傾き・サイズ（= 書体）ごとに、文字の輪郭（SVG のパス）と送り幅を
+    media/glyph_cache/<書体のハッシュ>.json に保存しておき、
+    文字列の SVG は各文字の輪郭を送り幅の分ずらして並べるだけで作る。
+キャッシュにない文字だけ、その文字を2つ並べた文字列を Pango で描いて
+（2つ目の位置から送り幅がわかる）輪郭を取り出す。すべての文字がキャッシュにあれば
+Pango は呼ばれない。
+
+組み立てた SVG は Pango のものとはカーニング（"AV" などの字詰め）と合字が違う
+（manim -pql で直接レンダリングしたものと字詰めが変わる）ので、オプトインにしている。
+有効にしているあいだは、キャッシュの状態によらず同じ結果になるよう、条件を満たすテキストは
+常にこの方法で作る（ファイル名も Pango のものと分ける）。有効かどうかは
+render_manifest のシーンのハッシュに含まれるので、切り替えると再レンダリングされる。複数行・複数の書体を混ぜたテキスト（t2f・t2w など）・
+MarkupText は従来どおり Pango で描く。t2c などの色の指定はそのまま使える。
+フォントの実体は環境によって違うので、キャッシュはマシンごと（共有しない）
+
+環境変数 MANIM_GLYPH_CACHE で有効にする（on なら media/glyph_cache、パスならその場所。
+既定は無効）。有効にすると render_all.py / render_daemon.py / prewarm.py のワーカーが使う
+
+使用方法:
+    MANIM_GLYPH_CACHE=on python scripts/render_all.py -q l
+
+使用例:
+    import glyph_cache
+    glyph_cache.install()
+    Text("① 分割（π/2パルス）", font_size=28)   # 未知の文字だけ Pango で描く
+"""
+
+import hashlib
+import json
+import os
+import uuid
+import xml.etree.ElementTree as ET
+from pathlib import Path
+from xml.sax.saxutils import escape
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FORMAT_VERSION = 1
+REPO_DIR = Path(__file__).resolve().parent.parent
+CACHE_ENV = "MANIM_GLYPH_CACHE"
+DEFAULT_CACHE_DIR = REPO_DIR / "media" / "glyph_cache"
+
+SVG_NS = "http://www.w3.org/2000/svg"
+XLINK_NS = "http://www.w3.org/1999/xlink"
+
+# 空白の送り幅を測るときに両側に置く文字
+SPACE_PROBE = "."
+
+# 書体のキーごとの GlyphFace
+_faces = {}
+# install() 済みの設定（プロセスにつき1つ）
+_installed = {}
+
+
+def parse_pango_svg(path):
+    """cairo が書き出した SVG から ({id: 輪郭のパス}, [(参照する id, x, y)]) を返す
+
+    グリフは <defs> 内の <symbol>（cairo 1.18 以降は <g>）で、本文の <use> が並べる
+    """
+    root = ET.parse(path).getroot()
+    outlines = {}
+    for element in root.iter():
+        ident = element.get("id")
+        if ident:
+            paths = [p.get("d", "") for p in element.iter(f"{{{SVG_NS}}}path")]
+            outlines[ident] = " ".join(d.strip() for d in paths if d.strip())
+    uses = []
+    for use in root.iter(f"{{{SVG_NS}}}use"):
+        href = use.get(f"{{{XLINK_NS}}}href") or use.get("href") or ""
+        uses.append((href.lstrip("#"), float(use.get("x", 0)), float(use.get("y", 0))))
+    return outlines, uses
+
+
+class GlyphFace:
+    """1つの書体（フォント・傾き・太さ・サイズ）の文字ごとの輪郭と送り幅
+
+    glyphs は {文字: {"d": 輪郭のパス, "advance": 送り幅, "x": 原点からのずれ, "y": ベースライン}}
+    """
+
+    def __init__(self, root, font, slant, weight, size):
+        self.font = font
+        self.slant = slant
+        self.weight = weight
+        self.size = float(size)
+        payload = json.dumps([FORMAT_VERSION, font, slant, weight, round(self.size, 6)])
+        self.key = hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+        self.path = Path(root) / f"{self.key}.json"
+        self.glyphs = self._read()
+
+    def _read(self):
+        try:
+            return json.loads(self.path.read_text(encoding="utf-8"))["glyphs"]
+        except (FileNotFoundError, json.JSONDecodeError, KeyError):
+            return {}
+
+    def save(self):
+        """ディスク上の内容（他のプロセスが追加した文字）とまとめて書き込む
+
+        読み込みから置き換えまでをロックファイルで排他するので、並列のワーカーが
+        同じ書体に別々の文字を追加しても失われない
+        """
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path.with_suffix(".lock"), "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock, fcntl.LOCK_EX)
+            self.glyphs = {**self._read(), **self.glyphs}
+            tmp = self.path.with_name(f"{self.path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+            header = {"font": self.font, "slant": self.slant, "weight": self.weight,
+                      "size": self.size}
+            tmp.write_text(
+                json.dumps({"format": FORMAT_VERSION, **header, "glyphs": self.glyphs},
+                           ensure_ascii=False),
+                encoding="utf-8",
+            )
+            os.replace(tmp, self.path)
+
+    def missing(self, text):
+        return sorted({c for c in text if c not in self.glyphs})
+
+    def _render(self, sample, line_spacing):
+        """sample を Pango で描いた SVG を解析する"""
+        import manimpango
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        file_name = self.path.with_name(f"probe-{os.getpid()}-{uuid.uuid4().hex[:8]}.svg")
+        setting = manimpango.TextSetting(0, len(sample), self.font, self.slant, self.weight,
+                                         line_num=0)
+        try:
+            manimpango.text2svg([setting], self.size, line_spacing, True, str(file_name),
+                                0, 0, 4096, 1024, sample)
+            return parse_pango_svg(file_name)
+        finally:
+            file_name.unlink(missing_ok=True)
+
+    def measure(self, char, line_spacing=0):
+        """char の輪郭と送り幅を Pango で求めて glyphs に加える"""
+        outlines, uses = self._render(char * 2, line_spacing)
+        if len(uses) >= 2:
+            (glyph, x0, y0), (_, x1, _) = uses[:2]
+            self.glyphs[char] = {"d": outlines.get(glyph, ""), "advance": x1 - x0, "x": x0, "y": y0}
+            return
+        # 空白など輪郭のない文字は、両側に置いた文字の間隔の差から送り幅を求める
+        _, pair = self._render(SPACE_PROBE * 2, line_spacing)
+        _, spaced = self._render(SPACE_PROBE + char + SPACE_PROBE, line_spacing)
+        advance = 0.0
+        if len(pair) >= 2 and len(spaced) >= 2:
+            advance = (spaced[1][1] - spaced[0][1]) - (pair[1][1] - pair[0][1])
+        self.glyphs[char] = {"d": "", "advance": advance, "x": 0.0, "y": 0.0}
+
+    def compose(self, text, colors, width, height, origin=(0.0, 0.0)):
+        """キャッシュ済みの輪郭を並べた SVG の文字列（colors は文字ごとの塗り色）"""
+        glyphs = [self.glyphs[c] for c in text]
+        drawn = [g for g in glyphs if g["d"]]
+        # 1行の文字は共通のベースライン（フォールバックのフォントを含めて最も低いもの）に揃える
+        baseline = max((g["y"] for g in drawn), default=0.0)
+        x = origin[0]
+        paths = []
+        for glyph, color in zip(glyphs, colors):
+            if glyph["d"]:
+                paths.append(
+                    f'<path style="fill:{escape(str(color))};stroke:none;" '
+                    f'transform="translate({x + glyph["x"]:.4f},{origin[1] + baseline:.4f})" '
+                    f'd="{glyph["d"]}"/>'
+                )
+            x += glyph["advance"]
+        return (
+            f'<?xml version="1.0" encoding="UTF-8"?>\n'
+            f'<svg xmlns="{SVG_NS}" xmlns:xlink="{XLINK_NS}" width="{width}pt" height="{height}pt" '
+            f'viewBox="0 0 {width} {height}" version="1.1">\n'
+            f'<g>\n' + "\n".join(paths) + "\n</g>\n</svg>\n"
+        )
+
+
+def glyph_face(root, font, slant, weight, size):
+    """書体ごとにキャッシュした GlyphFace"""
+    key = (str(root), font, slant, weight, round(float(size), 6))
+    if key not in _faces:
+        _faces[key] = GlyphFace(root, font, slant, weight, size)
+    return _faces[key]
+
+
+def cache_dir_from_env():
+    """キャッシュのディレクトリ（MANIM_GLYPH_CACHE が未設定・off なら None = 無効）"""
+    root = os.environ.get(CACHE_ENV, "")
+    if root.lower() in ("", "off", "0", "false", "no"):
+        return None
+    if root.lower() in ("on", "1", "true", "yes"):
+        return DEFAULT_CACHE_DIR
+    return Path(root)
+
+
+def _single_face(settings, text):
+    """1行・1書体のテキストなら (フォント, 傾き, 太さ, 文字ごとの色)、それ以外は None"""
+    if "\n" in text or not settings:
+        return None
+    faces = {(s.font, str(s.slant), str(s.weight)) for s in settings}
+    if len(faces) != 1:
+        return None
+    colors = [None] * len(text)
+    for setting in settings:
+        for i in range(setting.start, min(setting.end, len(text))):
+            colors[i] = getattr(setting, "color", None)
+    if any(color is None for color in colors):
+        return None
+    return (*faces.pop(), colors)
+
+
+def install(root=None):
+    """Text._text2svg を文字ごとの輪郭から組み立てるものに差し替える（何度呼んでもよい）
+
+    Returns:
+        キャッシュのディレクトリ（環境変数で有効にしていない場合は None）
+    """
+    if "root" in _installed:
+        return _installed["root"]
+    root = root or cache_dir_from_env()
+    _installed["root"] = root
+    if root is None:
+        return None
+
+    from manim import config
+    import manim.mobject.text.text_mobject as text_mobject
+
+    Text = text_mobject.Text
+    original = Text._text2svg
+    adjustment = getattr(text_mobject, "TEXT2SVG_ADJUSTMENT_FACTOR", 4.8)
+    start = (getattr(text_mobject, "START_X", 30), getattr(text_mobject, "START_Y", 20))
+
+    def _text2svg(self, color, *args, **kwargs):
+        face_spec = _single_face(self._text2settings(color), self.text)
+        if face_spec is None:
+            return original(self, color, *args, **kwargs)
+        font, slant, weight, colors = face_spec
+
+        dir_name = config.get_dir("text_dir")
+        dir_name.mkdir(parents=True, exist_ok=True)
+        # Pango で描いたもの（同じハッシュ）と混ざらないよう別の名前にする
+        file_name = dir_name / f"glyphs-{self._text2hash(color)}.svg"
+        if file_name.exists():
+            return str(file_name.resolve())
+
+        face = glyph_face(root, font, slant, weight, self._font_size / adjustment)
+        missing = face.missing(self.text)
+        if missing:
+            line_spacing = self.line_spacing / adjustment
+            for char in missing:
+                face.measure(char, line_spacing)
+            face.save()
+        svg = face.compose(self.text, colors, config["pixel_width"], config["pixel_height"], start)
+        tmp = file_name.with_name(f"{file_name.name}.{os.getpid()}.tmp")
+        tmp.write_text(svg, encoding="utf-8")
+        os.replace(tmp, file_name)
+        return str(file_name.resolve())
+
+    Text._text2svg = _text2svg
+    return root
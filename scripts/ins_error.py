@@ -0,0 +1,354 @@
+"""
+慣性航法（ストラップダウン INS）の位置誤差のモンテカルロシミュレーション
+
+加速度計の誤差モデル
+    a_err(t) = b + b_run + b_rw(t) + w(t)
+        b:     固定バイアス [m/s²]
+        b_run: 試行ごとにばらつくバイアス（標準偏差 bias_sigma）[m/s²]
+        b_rw:  バイアスのランダムウォーク（K [m/s²/√s]）
+        w:     ホワイトノイズ（ノイズ密度 N [m/s²/√Hz]）
+を、(試行数 × サンプル数) の配列に対する累積和で2回積分して位置誤差を求める。
+長時間（10時間以上、100 Hz）でもメモリに収まるよう、時間方向をチャンクに分けて
+速度・位置・バイアスの状態を引き継ぎながら積分し、出力間隔ごとに間引いた値だけを残す
+
+10時間 × 1 kHz × 数千試行のように間引いた結果すら大きい場合は stream_position_error() で
+試行もバッチに分け、メモリマップした .npy に直接書き出す（メモリ使用量は
+run_batch × rate × chunk_duration で決まり、試行数・時間によらない）。
+cached_position_error() はパラメータ（と呼び出し側が渡すコードのバージョン）の
+ハッシュをファイル名にして指定のディレクトリに保存し、
+2回目以降はファイルをメモリマップで開くだけなので、シーンは必要な列だけを遅延読み込みする
+
+使用例:
+    rng = np.random.default_rng(0)
+    runs = simulate_position_error(MEMS_SPEC, rng, duration=10 * 3600, runs=64)
+    envelope = error_envelope(runs.positions)
+    envelope["rms"]      # (出力点数,) RMS 位置誤差 [m]
+    envelope["p95"]      # |δx| の95パーセンタイル
+
+    # 長時間・大規模な計算（ファイルに書き出して遅延読み込み）
+    runs = cached_position_error(MEMS_SPEC, "MEMS/42", 10 * 3600, "media/sim_cache",
+                                 rate=1000, runs=2000)
+    runs.positions       # (2000, 出力点数) の np.memmap
+
+    # コマンドラインから事前計算する場合
+    python ins_error.py MEMS --rate 1000 --runs 2000 -o mems.npy
+"""
+
+import argparse
+import hashlib
+import json
+import os
+from dataclasses import asdict, dataclass
+from pathlib import Path
+
+import numpy as np
+
+
+# error_envelope() で1回に読み込む要素数（float64 で 32 MB）
+MAX_ELEMENTS = 1 << 22
+
+
+@dataclass(frozen=True)
+class AccelerometerSpec:
+    """加速度計の誤差仕様（SI単位）"""
+
+    name: str
+    bias: float = 0.0  # 固定バイアス [m/s²]
+    bias_sigma: float = 0.0  # 試行ごとのバイアスのばらつき [m/s²]
+    noise_density: float = 0.0  # ホワイトノイズ密度 [m/s²/√Hz]
+    bias_random_walk: float = 0.0  # バイアスのランダムウォーク [m/s²/√s]
+
+
+# 10時間で約 6.5 km（MEMS）と約 65 cm（原子干渉計）になる仕様（バイアスが支配的）
+MEMS_SPEC = AccelerometerSpec(
+    "MEMS", bias=1e-5, noise_density=1e-4, bias_random_walk=1e-9
+)
+ATOM_SPEC = AccelerometerSpec(
+    "原子干渉計", bias=1e-9, noise_density=1e-8, bias_random_walk=1e-13
+)
+SPECS = {"MEMS": MEMS_SPEC, "ATOM": ATOM_SPEC}
+
+
+class ErrorRuns:
+    """間引いた出力時刻ごとの位置・速度誤差
+
+    Attributes:
+        times: (出力点数,) [s]
+        positions: (試行数, 出力点数) 位置誤差 [m]（ファイルから開いた場合は np.memmap）
+        velocities: (試行数, 出力点数) 速度誤差 [m/s]（ストリーミングでは保存しないので None）
+    """
+
+    def __init__(self, times, positions, velocities=None):
+        self.times = times
+        self.positions = positions
+        self.velocities = velocities
+
+
+def analytic_rms(spec, t):
+    """位置誤差の RMS の解析解 [m]
+
+    √((b t²/2)² + (σ_b t²/2)² + N² t³/3 + K² t⁵/20)
+    """
+    t = np.asarray(t, dtype=float)
+    return np.sqrt(
+        (0.5 * spec.bias * t**2) ** 2
+        + (0.5 * spec.bias_sigma * t**2) ** 2
+        + spec.noise_density**2 * t**3 / 3
+        + spec.bias_random_walk**2 * t**5 / 20
+    )
+
+
+class ErrorIntegrator:
+    """チャンクごとに加速度誤差を2回積分する（状態はチャンク間で引き継ぐ）
+
+    Args:
+        spec: AccelerometerSpec
+        rng: np.random.Generator
+        runs: モンテカルロ試行数
+        rate: サンプリング周波数 [Hz]
+        decimate: 何サンプルごとに出力するか（チャンクの長さは decimate の倍数でなくてよい）
+    """
+
+    def __init__(self, spec, rng, runs, rate, decimate):
+        self.spec = spec
+        self.rng = rng
+        self.runs = runs
+        self.dt = 1.0 / rate
+        self.decimate = decimate
+        self.samples = 0
+
+        # 引き継ぐ状態（試行ごと）
+        self.bias = spec.bias + spec.bias_sigma * rng.standard_normal(runs)
+        self.velocity = np.zeros(runs)
+        self.position = np.zeros(runs)
+
+    def acceleration(self, n_samples):
+        """次の n_samples の加速度誤差 (試行数, n_samples) [m/s²]（バイアスの状態を進める）"""
+        spec = self.spec
+        shape = (self.runs, n_samples)
+        dt = self.dt
+
+        # 加速度誤差 = バイアス（ランダムウォーク込み）+ ホワイトノイズ
+        accel = np.empty(shape)
+        if spec.bias_random_walk:
+            self.rng.standard_normal(shape, out=accel)
+            accel *= spec.bias_random_walk * np.sqrt(dt)
+            np.cumsum(accel, axis=1, out=accel)
+            accel += self.bias[:, None]
+            self.bias = accel[:, -1].copy()
+        else:
+            accel[:] = self.bias[:, None]
+        if spec.noise_density:
+            accel += spec.noise_density / np.sqrt(dt) * self.rng.standard_normal(shape)
+        return accel
+
+    def step(self, n_samples):
+        """n_samples だけ進め、間引いた (位置, 速度) を返す"""
+        dt = self.dt
+        accel = self.acceleration(n_samples)
+
+        # 1回目の積分: 速度、2回目の積分: 位置（その場で累積和を取る）
+        velocity = np.cumsum(accel, axis=1, out=accel)
+        velocity *= dt
+        velocity += self.velocity[:, None]
+        self.velocity = velocity[:, -1].copy()
+
+        position = np.cumsum(velocity * dt, axis=1)
+        position += self.position[:, None]
+        self.position = position[:, -1].copy()
+
+        # 通算サンプル番号が decimate の倍数になる点を出力する
+        first = (self.decimate - 1 - self.samples) % self.decimate
+        picks = slice(first, None, self.decimate)
+        self.samples += n_samples
+        return position[:, picks], velocity[:, picks]
+
+
+def simulate_acceleration(spec, rng, duration, rate=100.0):
+    """1回の試行の加速度誤差の時系列 (サンプル数,) [m/s²]（アラン分散の解析用）"""
+    integrator = ErrorIntegrator(spec, rng, 1, rate, 1)
+    return integrator.acceleration(int(round(duration * rate)))[0]
+
+
+def _output_grid(duration, rate, output_interval):
+    """(間引き間隔 [サンプル], 総サンプル数, t = 0 を含む出力時刻 [s])"""
+    decimate = max(1, int(round(output_interval * rate)))
+    total = int(round(duration * rate / decimate)) * decimate
+    times = np.arange(total // decimate + 1) * decimate / rate
+    return decimate, total, times
+
+
+def simulate_position_error(
+    spec,
+    rng,
+    duration,
+    rate=100.0,
+    runs=64,
+    output_interval=60.0,
+    chunk_duration=600.0,
+):
+    """duration 秒の位置誤差をモンテカルロで計算し、ErrorRuns を返す
+
+    Args:
+        rate: サンプリング周波数 [Hz]
+        output_interval: 出力（間引き）間隔 [s]
+        chunk_duration: 1回に積分する時間 [s]（メモリ使用量は runs × rate × chunk_duration に比例）
+    """
+    decimate, total, times = _output_grid(duration, rate, output_interval)
+    chunk = max(1, int(round(chunk_duration * rate)))
+
+    integrator = ErrorIntegrator(spec, rng, runs, rate, decimate)
+    positions = []
+    velocities = []
+    while integrator.samples < total:
+        position, velocity = integrator.step(min(chunk, total - integrator.samples))
+        positions.append(position)
+        velocities.append(velocity)
+
+    # t = 0（誤差 0）を先頭に加える
+    zeros = np.zeros((runs, 1))
+    return ErrorRuns(
+        times,
+        np.concatenate([zeros, *positions], axis=1),
+        np.concatenate([zeros, *velocities], axis=1),
+    )
+
+
+def _times_path(path):
+    return Path(path).with_suffix(".times.npy")
+
+
+def stream_position_error(
+    spec,
+    rng,
+    path,
+    duration,
+    rate=1000.0,
+    runs=1000,
+    output_interval=60.0,
+    chunk_duration=30.0,
+    run_batch=64,
+    dtype=np.float32,
+):
+    """位置誤差をメモリマップした .npy に書き出し、ファイルを開いた ErrorRuns を返す
+
+    試行を run_batch ずつ、時間を chunk_duration ずつに分けて積分し、間引いた位置誤差
+    (試行数, 出力点数) を path に、出力時刻を path の拡張子を .times.npy にしたファイルに保存する。
+    書き込みは一時ファイルに行い、完了してから置き換えるので、中断しても壊れたファイルは残らない
+    """
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    decimate, total, times = _output_grid(duration, rate, output_interval)
+    chunk = max(1, int(round(chunk_duration * rate)))
+
+    tmp = path.with_name(path.name + f".{os.getpid()}.tmp")
+    out = np.lib.format.open_memmap(tmp, mode="w+", dtype=dtype, shape=(runs, len(times)))
+    out[:, 0] = 0.0
+    for start in range(0, runs, run_batch):
+        rows = slice(start, min(start + run_batch, runs))
+        integrator = ErrorIntegrator(spec, rng, rows.stop - rows.start, rate, decimate)
+        column = 1
+        while integrator.samples < total:
+            position, _ = integrator.step(min(chunk, total - integrator.samples))
+            out[rows, column:column + position.shape[1]] = position
+            column += position.shape[1]
+    out.flush()
+    del out
+    np.save(_times_path(tmp), times)
+    os.replace(_times_path(tmp), _times_path(path))
+    os.replace(tmp, path)
+    return load_position_error(path)
+
+
+def load_position_error(path):
+    """stream_position_error() で書き出したファイルをメモリマップで開く"""
+    path = Path(path)
+    return ErrorRuns(np.load(_times_path(path)), np.load(path, mmap_mode="r"))
+
+
+def cached_position_error(spec, key, duration, cache_dir, code="", rng=None, **params):
+    """パラメータが同じ計算結果がキャッシュにあれば開き、なければ計算して保存する
+
+    Args:
+        key: 乱数系列を区別する文字列（シーン名・シード値など。ファイル名のハッシュに含める）
+        cache_dir: 保存先のディレクトリ
+        code: 計算のコードのバージョン（ハッシュに含める。積分や誤差モデルを変更したら
+            古い結果を使わないよう、呼び出し側がこのモジュールのダイジェストなどを渡す）
+        rng: np.random.Generator（既定: key から作る）
+        **params: stream_position_error() のキーワード引数
+    """
+    settings = {
+        "spec": asdict(spec),
+        "key": key,
+        "duration": duration,
+        "code": code,
+        **params,
+    }
+    if "dtype" in settings:
+        settings["dtype"] = np.dtype(settings["dtype"]).name
+    digest = hashlib.sha256(
+        json.dumps(settings, sort_keys=True, ensure_ascii=False).encode("utf-8")
+    ).hexdigest()[:16]
+    path = Path(cache_dir) / f"ins_error_{digest}.npy"
+    if path.exists() and _times_path(path).exists():
+        return load_position_error(path)
+    if rng is None:
+        seed = int.from_bytes(hashlib.sha256(key.encode("utf-8")).digest()[:8], "little")
+        rng = np.random.default_rng(seed)
+    return stream_position_error(spec, rng, path, duration, **params)
+
+
+def error_envelope(positions, percentiles=(5, 50, 95), absolute=True, max_elements=MAX_ELEMENTS):
+    """試行方向に集計した誤差の包絡線
+
+    positions が np.memmap でも、出力時刻の列をまとめて max_elements 要素ずつ読むので
+    メモリ使用量は一定
+
+    Args:
+        absolute: True なら |δx|、False なら符号付きの δx のパーセンタイルを取る
+    Returns:
+        {"mean": 平均, "rms": RMS, "p5": 5パーセンタイル, ...}（各 (出力点数,)）
+    """
+    n_runs, n_points = np.shape(positions)
+    keys = ["mean", "rms", *[f"p{p}" for p in percentiles]]
+    envelope = {key: np.empty(n_points) for key in keys}
+    step = max(1, max_elements // max(n_runs, 1))
+    for start in range(0, n_points, step):
+        cols = slice(start, start + step)
+        block = np.asarray(positions[:, cols], dtype=float)
+        envelope["mean"][cols] = block.mean(axis=0)
+        envelope["rms"][cols] = np.sqrt(np.mean(block**2, axis=0))
+        samples = np.abs(block) if absolute else block
+        for p, values in zip(percentiles, np.percentile(samples, percentiles, axis=0)):
+            envelope[f"p{p}"][cols] = values
+    return envelope
+
+
+def main():
+    parser = argparse.ArgumentParser(description="INS の位置誤差を計算して .npy に書き出す")
+    parser.add_argument("spec", choices=sorted(SPECS), help="加速度計の仕様")
+    parser.add_argument("-o", "--output", type=Path, required=True, help="出力ファイル (.npy)")
+    parser.add_argument("--hours", type=float, default=10.0, help="飛行時間 [時間]")
+    parser.add_argument("--rate", type=float, default=1000.0, help="サンプリング周波数 [Hz]")
+    parser.add_argument("--runs", type=int, default=1000, help="モンテカルロ試行数")
+    parser.add_argument("--interval", type=float, default=60.0, help="出力間隔 [s]")
+    parser.add_argument("--seed", type=int, default=0, help="乱数のシード値")
+    args = parser.parse_args()
+
+    spec = SPECS[args.spec]
+    runs = stream_position_error(
+        spec,
+        np.random.default_rng(args.seed),
+        args.output,
+        duration=args.hours * 3600,
+        rate=args.rate,
+        runs=args.runs,
+        output_interval=args.interval,
+    )
+    envelope = error_envelope(runs.positions)
+    print(f"{spec.name}: {args.hours:g} 時間後の RMS 誤差 {envelope['rms'][-1]:.4g} m "
+          f"(解析解 {analytic_rms(spec, runs.times[-1]):.4g} m)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,130 @@
+"""
+マッハ-ツェンダー型原子干渉計（π/2 - π - π/2）の軌道と位相の計算
+
+座標は k_eff の向き（下向き = 重力の向き）に沿った位置 z で表す。
+t = 0, T, 2T のパルスで |e⟩ になった経路が反跳速度 v_r = ħk_eff/m を受け取る:
+    経路A（上側）: 0〜T で +v_r、T〜2T で 0（t = 0 で |e⟩、t = T で |g⟩）
+    経路B（下側）: 0〜T で 0、T〜2T で +v_r（t = 0 で |g⟩、t = T で |e⟩）
+2経路の距離は t = T で最大 v_r·T になり、t = 2T で再び重なる
+
+干渉計の位相（加速度に対する感度関数 f(t) = t（t < T）、2T - t（t > T）の積分）:
+    加速度項:   φ_a = k_eff·g·T²
+    重力勾配項: φ_Γ = k_eff·Γ·T²·(z₀ + v̄·T + 7/12·g·T²)    （v̄ = v₀ + v_r/2）
+    回転項:     φ_Ω = -2·k_eff·T²·k̂·(Ω × v)               （サニャック/コリオリ）
+
+すべての関数は T・g・速度などに配列を渡すとブロードキャストして
+まとめて評価するので、T や g のスイープが1回の呼び出しで計算できる
+
+使用例:
+    T = np.linspace(1e-3, 0.2, 500)
+    phi = total_phase(T)                            # T スイープ
+    phi = total_phase(0.1, g=G + np.linspace(-1e-6, 1e-6, 100))
+    z_a, z_b = arm_positions(t, T=0.1)              # 時空間ダイアグラム用の軌道
+"""
+
+import numpy as np
+
+from rb87_constants import G, K_EFF, OMEGA_EARTH, V_RECOIL_EFF
+
+# 下向きの k_eff（鉛直軸）
+K_HAT_DOWN = np.array([0.0, 0.0, -1.0])
+
+
+def _kick_displacement(t, start, end, v_recoil):
+    """時刻 start〜end の間だけ速度 v_recoil を持つことによる変位"""
+    return v_recoil * (np.clip(t, start, end) - start)
+
+
+def arm_positions(t, T, z0=0.0, v0=0.0, g=G, v_recoil=V_RECOIL_EFF, free_fall=False):
+    """2経路の位置 z_A(t), z_B(t) [m]（k_eff 方向、下向き正）
+
+    Args:
+        t: 時刻 [s]（配列可）。t < 0 はパルス前、t > 2T は出力経路
+        T: パルス間隔 [s]
+        z0, v0: t = 0 での位置・速度
+        free_fall: True なら重力による落下 ½gt² と初速度を除いた
+            自由落下系での位置（時空間ダイアグラム用）を返す
+    Returns:
+        (z_A, z_B): 経路A（t = 0 で |e⟩）と経路B（t = 0 で |g⟩）。
+            t > 2T では経路Aは |g⟩ 出力、経路Bは |e⟩ 出力（+v_r）を続ける
+    """
+    t = np.asarray(t, dtype=float)
+    T = np.asarray(T, dtype=float)
+    inf = np.inf
+    z_a = _kick_displacement(t, 0.0, T, v_recoil)
+    z_b = _kick_displacement(t, T, inf, v_recoil)
+    if not free_fall:
+        base = z0 + v0 * t + 0.5 * g * t**2
+        z_a = z_a + base
+        z_b = z_b + base
+    return z_a, z_b
+
+
+def arm_separation(t, T, v_recoil=V_RECOIL_EFF):
+    """2経路の距離 |z_A - z_B| [m]（t = T で最大 v_r·T）"""
+    t = np.asarray(t, dtype=float)
+    return v_recoil * np.clip(np.minimum(t, 2 * T - t), 0, None)
+
+
+def acceleration_phase(T, g=G, k_eff=K_EFF):
+    """加速度による位相 k_eff·g·T² [rad]"""
+    return k_eff * np.asarray(g, dtype=float) * np.asarray(T, dtype=float) ** 2
+
+
+def gradient_phase(T, gradient, z0=0.0, v0=0.0, g=G, k_eff=K_EFF, v_recoil=V_RECOIL_EFF):
+    """重力勾配 Γ = ∂g/∂z による位相 [rad]
+
+    g(z) = g + Γ·z（下向き正）のとき、2経路の平均軌道 z̄(t) を感度関数で重み付けした
+    k_eff·Γ·T²·(z₀ + v̄·T + 7/12·g·T²)
+    """
+    T = np.asarray(T, dtype=float)
+    v_mean = np.asarray(v0, dtype=float) + v_recoil / 2
+    return k_eff * gradient * T**2 * (z0 + v_mean * T + 7 / 12 * g * T**2)
+
+
+def rotation_phase(T, velocity, omega, k_hat=K_HAT_DOWN, k_eff=K_EFF):
+    """回転（コリオリ加速度 -2Ω × v）による位相 -2·k_eff·T²·k̂·(Ω × v) [rad]
+
+    Args:
+        velocity: 原子の速度 (..., 3) [m/s]（k_eff に垂直な成分だけが効く）
+        omega: 回転角速度ベクトル (3,) [rad/s]
+    """
+    T = np.asarray(T, dtype=float)
+    coriolis = np.cross(omega, velocity) @ np.asarray(k_hat, dtype=float)
+    return -2 * k_eff * T**2 * coriolis
+
+
+def total_phase(
+    T,
+    g=G,
+    gradient=0.0,
+    z0=0.0,
+    v0=0.0,
+    velocity=None,
+    omega=None,
+    k_eff=K_EFF,
+    v_recoil=V_RECOIL_EFF,
+):
+    """加速度・重力勾配・回転の位相の合計 [rad]
+
+    velocity と omega を両方与えたときだけ回転項を加える。
+    """
+    phase = acceleration_phase(T, g, k_eff)
+    if np.any(gradient):
+        phase = phase + gradient_phase(T, gradient, z0, v0, g, k_eff, v_recoil)
+    if velocity is not None and omega is not None:
+        phase = phase + rotation_phase(T, velocity, omega, k_eff=k_eff)
+    return phase
+
+
+def earth_rotation(latitude):
+    """緯度 latitude [rad] での地球の自転角速度ベクトル（x: 東、y: 北、z: 上）"""
+    return OMEGA_EARTH * np.array([0.0, np.cos(latitude), np.sin(latitude)])
+
+
+def fringe_probability(phase, contrast=1.0, offset=0.0):
+    """出力ポート |g⟩ の検出確率 P_g = (1 + C cos(φ + φ₀)) / 2
+
+    C = 1 のとき cos²(φ/2) に一致する。
+    """
+    return 0.5 * (1 + contrast * np.cos(np.asarray(phase, dtype=float) + offset))
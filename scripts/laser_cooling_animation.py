@@ -8,11 +8,26 @@
     manim -pqh laser_cooling_animation.py LaserCoolingPrinciple  # 高画質
     manim -pql laser_cooling_animation.py DopplerCooling
     manim -pql laser_cooling_animation.py LaserCoolingComplete
+    manim -pql laser_cooling_animation.py DopplerFrequencyShift
 """
 
 from manim import *
 import numpy as np
 
+from doppler_force import absorption_spectrum, force_table, scattering_rate
+from frame_archive import cached_archive
+from laser_cooling_mc import LaserCoolingMC, sample_emission_directions
+from live_graph import LiveFunctionGraph
+from mot_simulation import MOTSimulation
+from numeric_readout import NumericReadout
+from point_cloud import PointCloud
+from rb87_constants import GAMMA_D2, HBAR, K_D2
+from scene_rng import base_seed, scene_rng
+
+# ドップラー冷却の説明に使うレーザーの離調（Γ 単位）と1本あたりの飽和パラメータ
+LASER_DETUNING = -1.0
+SATURATION = 0.5
+
 
 class LaserCoolingPrinciple(Scene):
     """レーザー冷却の基本原理：光子の運動量移行"""
@@ -288,9 +303,27 @@ class DopplerCooling(Scene):
 
 
 class LaserCoolingComplete(Scene):
-    """レーザー冷却の完全なアニメーション：複数回の吸収・放出サイクル"""
+    """レーザー冷却の完全なアニメーション：複数回の吸収・放出サイクル
+
+    速度の変化と速度分布は ⁸⁷Rb 原子集団のモンテカルロシミュレーションの結果を再生する
+    """
+
+    NUM_CYCLES = 5
+    SIM_ATOMS = 20000
+    SIM_DURATION = 0.4e-3  # [s]（減衰時間の約4倍）
+    V_MAX = 3.0  # 速度分布の表示範囲 [m/s]
 
     def construct(self):
+        # 光糖蜜のシミュレーション（5 mK から冷却）
+        rng = scene_rng(self)
+        history = LaserCoolingMC(rng, n_atoms=self.SIM_ATOMS, temperature=5e-3).run(
+            self.SIM_DURATION, v_max=self.V_MAX
+        )
+        # 各サイクルで再生する記録のインデックス
+        snapshots = np.linspace(0, len(history) - 1, self.NUM_CYCLES + 1)
+        v_rms = history.v_rms[:, 0]
+        emission_dirs = sample_emission_directions(rng, self.NUM_CYCLES)
+
         # タイトル
         title = Text("レーザー冷却サイクル", font_size=32).to_edge(UP)
         self.play(Write(title))
@@ -299,8 +332,9 @@ class LaserCoolingComplete(Scene):
         atom = Circle(radius=0.35, color=BLUE, fill_opacity=0.8)
         atom.shift(RIGHT * 2)
 
-        # 初期速度（速い）
+        # 初期速度（速い）: 表示上の速度は RMS 速度の初期値を 2.0 とした相対値
         velocity = 2.0
+        velocity_scale = velocity / v_rms[0]
         velocity_tracker = ValueTracker(velocity)
 
         # 速度ベクトル（動的に更新）
@@ -314,13 +348,18 @@ class LaserCoolingComplete(Scene):
             )
         )
 
-        # 速度表示
-        velocity_label = always_redraw(
-            lambda: Text(
-                f"v = {velocity_tracker.get_value():.1f}",
-                font_size=24,
-                color=self.velocity_color(velocity_tracker.get_value()),
-            ).to_corner(UR)
+        # 速度表示（グリフをキャッシュして数値だけ差し替える）
+        velocity_label = NumericReadout(
+            velocity,
+            prefix="v = ",
+            num_decimal_places=1,
+            font_size=24,
+            color=self.velocity_color(velocity),
+            align_edge=RIGHT,
+        ).to_corner(UR)
+        velocity_label.track(
+            velocity_tracker.get_value,
+            color=lambda: self.velocity_color(velocity_tracker.get_value()),
         )
 
         # レーザー光源（右側 = 原子の進行方向の前方から逆向きに照射）
@@ -343,16 +382,47 @@ class LaserCoolingComplete(Scene):
             RIGHT * 4.5, LEFT * 4, color=RED, stroke_width=2, dash_length=0.15
         ).shift(DOWN * 0.1)
 
+        # 集団の速度分布（記録の間を線形補間して再生する）
+        frame_tracker = ValueTracker(0)
+        bin_centers = history.bin_centers
+        histograms = history.histograms
+        peak = histograms.max()
+
+        def velocity_distribution(v, frame):
+            i = min(int(frame), len(histograms) - 2)
+            frac = frame - i
+            density = (1 - frac) * histograms[i] + frac * histograms[i + 1]
+            return np.interp(v, bin_centers, density) / peak
+
+        dist_axes = Axes(
+            x_range=[-self.V_MAX, self.V_MAX, 1],
+            y_range=[0, 1.1, 0.5],
+            x_length=3.5,
+            y_length=1.6,
+            axis_config={"include_tip": False, "stroke_width": 2},
+        ).to_corner(DL, buff=0.6)
+        dist_label = Text("原子集団の速度分布", font_size=16).next_to(dist_axes, UP, buff=0.1)
+        dist_graph = LiveFunctionGraph(
+            dist_axes, velocity_distribution, frame_tracker,
+            x_range=[-self.V_MAX, self.V_MAX], color=BLUE, stroke_width=2,
+        )
+        dist_area = dist_graph.get_area(opacity=0.3)
+
         self.play(FadeIn(atom), Create(velocity_arrow), Write(velocity_label))
         self.play(FadeIn(laser_right), Write(laser_label), Create(laser_beam))
+        self.play(
+            Create(dist_axes), Write(dist_label), Create(dist_graph), FadeIn(dist_area)
+        )
         self.wait(1)
 
-        # サイクルカウンター
-        cycle_counter = Text("サイクル: 0", font_size=24).to_corner(UL)
-        self.play(Write(cycle_counter))
+        # 散乱光子数のカウンター（1原子あたりの平均）
+        photon_counter = NumericReadout(
+            0, prefix="散乱光子数: ", num_decimal_places=0, font_size=24
+        ).to_corner(UL)
+        self.play(Write(photon_counter))
 
         # 5サイクルの冷却アニメーション
-        for cycle in range(5):
+        for cycle in range(self.NUM_CYCLES):
             # 光子が右側から飛んでくる（原子の進行方向と逆向き）
             photon = Dot(color=RED, radius=0.1)
             photon.move_to(RIGHT * 4)
@@ -369,15 +439,17 @@ class LaserCoolingComplete(Scene):
                 FadeOut(photon),
             )
 
-            # 減速（速度ベクトルが短くなる）
-            new_velocity = velocity_tracker.get_value() * 0.75
+            # 減速（速度ベクトルが短くなり、速度分布が狭くなる）
+            frame = snapshots[cycle + 1]
+            new_velocity = velocity_scale * np.interp(frame, np.arange(len(v_rms)), v_rms)
             self.play(
                 velocity_tracker.animate.set_value(new_velocity),
+                frame_tracker.animate.set_value(frame),
                 run_time=0.3,
             )
 
-            # 自然放出（ランダム方向）
-            emission_angle = np.random.uniform(0, 2 * np.pi)
+            # 自然放出（ランダム方向、画面内に射影）
+            emission_angle = np.arctan2(emission_dirs[cycle, 1], emission_dirs[cycle, 0])
             emission_dir = np.array(
                 [np.cos(emission_angle), np.sin(emission_angle), 0]
             )
@@ -392,20 +464,30 @@ class LaserCoolingComplete(Scene):
             self.remove(emitted_photon)
 
             # カウンター更新
-            new_counter = Text(f"サイクル: {cycle + 1}", font_size=24).to_corner(UL)
+            start_photons = photon_counter.get_value()
+            end_photons = np.interp(frame, np.arange(len(history)), history.photons)
             self.play(
-                ReplacementTransform(cycle_counter, new_counter),
+                UpdateFromAlphaFunc(
+                    photon_counter,
+                    lambda m, a: m.set_value(start_photons + a * (end_photons - start_photons)),
+                ),
                 run_time=0.2,
             )
-            cycle_counter = new_counter
 
         self.wait(1)
 
         # 結果の説明
+        final_velocity = velocity_tracker.get_value()
+        reduction = (1 - final_velocity / velocity) * 100
         result = VGroup(
             Text("結果:", font_size=28, color=YELLOW),
-            Text(f"初期速度: 2.0 → 最終速度: {velocity_tracker.get_value():.2f}", font_size=24),
-            Text("5サイクルで約75%減速", font_size=24, color=BLUE),
+            Text(f"初期速度: 2.0 → 最終速度: {final_velocity:.2f}", font_size=24),
+            Text(
+                f"約{photon_counter.get_value():.0f}回の散乱で約{reduction:.0f}%減速"
+                f"（{history.temperature[-1] * 1e6:.0f} μK）",
+                font_size=24,
+                color=BLUE,
+            ),
         ).arrange(DOWN, buff=0.2)
         result.to_edge(DOWN, buff=0.8)
 
@@ -419,7 +501,15 @@ class LaserCoolingComplete(Scene):
 
 
 class MOTAnimation(Scene):
-    """磁気光学トラップ（MOT）の概念図"""
+    """磁気光学トラップ（MOT）の概念図
+
+    原子雲の収縮は MOTSimulation（6本のビーム + 四重極磁場 + 反跳加熱）の結果を再生する
+    （結果は sim_cache にアーカイブし、画質を変えたレンダリングでも再計算しない）
+    """
+
+    MOT_RADIUS = 1e-3  # 初期の雲の半径 [m]（画面上の 0.5 に対応）
+    MOT_TEMPERATURE = 1e-3  # 初期温度 [K]
+    MOT_DURATION = 10e-3  # シミュレーション時間 [s]
 
     def construct(self):
         # タイトル
@@ -429,16 +519,50 @@ class MOTAnimation(Scene):
         )
         self.play(Write(title), Write(subtitle))
 
-        # 中央の原子雲
-        atom_cloud = VGroup()
-        np.random.seed(42)
-        for _ in range(30):
-            atom = Dot(
-                point=np.random.randn(3) * 0.5,
-                color=BLUE,
-                radius=0.05,
+        # 中央の原子雲（1万個の原子を1つの点群で描く）
+        # シミュレーションは1度だけ行ってアーカイブに保存し、どの画質でも再利用する
+        num_atoms = 10000
+        params = {
+            "seed": base_seed(),
+            "num_atoms": num_atoms,
+            "temperature": self.MOT_TEMPERATURE,
+            "cloud_radius": self.MOT_RADIUS,
+            "duration": self.MOT_DURATION,
+            "record_every": 25,
+        }
+
+        def simulate():
+            sim = MOTSimulation(
+                scene_rng(self),
+                n_atoms=num_atoms,
+                temperature=self.MOT_TEMPERATURE,
+                cloud_radius=self.MOT_RADIUS,
             )
-            atom_cloud.add(atom)
+            history = sim.run(duration=self.MOT_DURATION, record_every=params["record_every"])
+            return {
+                "times": history.times,
+                "positions": history.frames,
+                "radius": history.radius,
+                "temperature": history.temperature,
+            }
+
+        archive = cached_archive(type(self).__name__, params, simulate)
+        start_time, end_time = archive["times"][[0, -1]]
+        scale = 0.5 / self.MOT_RADIUS  # [m] → 画面座標
+        atom_positions = archive.frame(0, "positions") * scale
+
+        # 奥行き（z）に応じて手前の原子を明るく大きく見せる
+        depth = np.clip(atom_positions[:, 2] / 1.5 + 0.5, 0, 1)
+        atom_colors = (
+            (1 - depth)[:, None] * BLUE_E.to_rgb()
+            + depth[:, None] * BLUE_A.to_rgb()
+        )
+        atom_cloud = PointCloud(
+            atom_positions,
+            radius=0.012 * (0.7 + 0.6 * depth),
+            colors=atom_colors,
+            color_levels=8,
+        )
 
         self.play(FadeIn(atom_cloud))
 
@@ -479,25 +603,41 @@ class MOTAnimation(Scene):
         )
         self.wait(1)
 
-        # 原子が中央に集まる効果
-        for _ in range(3):
-            self.play(
-                *[atom.animate.move_to(atom.get_center() * 0.7) for atom in atom_cloud],
-                run_time=0.5,
-            )
+        # シミュレーションした雲の半径と温度
+        radius_mm = archive["radius"].mean(axis=1) * 1e3
+        temperature_uk = archive["temperature"] * 1e6
+        progress = ValueTracker(0)
 
-        # 冷却される原子雲（縮小）
-        self.play(
-            atom_cloud.animate.scale(0.5),
-            run_time=1,
+        def current(values):
+            return np.interp(progress.get_value(), np.linspace(0, 1, len(values)), values)
+
+        radius_label = NumericReadout(
+            radius_mm[0], prefix="雲の半径: ", suffix=" mm", num_decimal_places=2, font_size=22
         )
+        temperature_label = NumericReadout(
+            temperature_uk[0], prefix="温度: ", suffix=" μK", num_decimal_places=0, font_size=22
+        )
+        readouts = VGroup(radius_label, temperature_label).arrange(DOWN, aligned_edge=LEFT)
+        readouts.to_corner(UR).shift(DOWN * 0.8)
+        radius_label.track(lambda: current(radius_mm))
+        temperature_label.track(lambda: current(temperature_uk))
+        self.play(FadeIn(readouts))
+
+        # 原子が中央に集まり、冷却される（記録したフレームを補間して再生）
+        def replay(cloud, alpha):
+            progress.set_value(alpha)
+            cloud.set_positions(archive.frame_at(start_time + alpha * (end_time - start_time), "positions") * scale)
+
+        self.play(UpdateFromAlphaFunc(atom_cloud, replay), run_time=4, rate_func=linear)
 
         # 説明
         explanation = VGroup(
             Text("• 各方向から赤方偏移レーザーを照射", font_size=22),
             Text("• どの方向に動いても減速される", font_size=22),
             Text("• 磁場勾配で中央に閉じ込め", font_size=22),
-            Text("• 到達温度: 数μK〜数十μK", font_size=22, color=BLUE),
+            Text(
+                f"• ドップラー冷却の到達温度: 約{temperature_uk[-1]:.0f} μK", font_size=22, color=BLUE
+            ),
         ).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
         explanation.to_edge(DOWN, buff=0.5)
 
@@ -634,9 +774,9 @@ class DopplerSelectiveCooling(Scene):
         freq_title = Text("レーザー周波数の設定", font_size=24, color=YELLOW).shift(UP * 2.2)
         self.play(Write(freq_title))
 
-        # 周波数軸
+        # 周波数軸（共鳴からのずれを自然幅 Γ 単位で取る）
         freq_axis = NumberLine(
-            x_range=[0, 10, 2],
+            x_range=[-3, 2, 1],
             length=8,
             include_numbers=False,
             include_tip=True,
@@ -646,7 +786,7 @@ class DopplerSelectiveCooling(Scene):
         self.play(Create(freq_axis), Write(freq_label))
 
         # 共鳴周波数
-        resonance_pos = freq_axis.n2p(6)
+        resonance_pos = freq_axis.n2p(0)
         resonance_line = DashedLine(
             resonance_pos + UP * 0.5,
             resonance_pos + DOWN * 0.5,
@@ -657,7 +797,7 @@ class DopplerSelectiveCooling(Scene):
         resonance_text = Text("共鳴周波数", font_size=16, color=WHITE).next_to(resonance_label, UP, buff=0.1)
 
         # レーザー周波数（共鳴より低い = 赤方偏移）
-        laser_pos = freq_axis.n2p(4)
+        laser_pos = freq_axis.n2p(LASER_DETUNING)
         laser_line = Line(
             laser_pos + UP * 0.4,
             laser_pos + DOWN * 0.4,
@@ -688,6 +828,12 @@ class DopplerSelectiveCooling(Scene):
         )
         self.play(freq_group.animate.scale(0.7).to_edge(UP, buff=0.5))
 
+        # 共鳴する速さ |v| = |δ|/k で動く原子の、各向きのビームからの散乱率
+        detuning = LASER_DETUNING * GAMMA_D2
+        resonant_speed = abs(detuning) / K_D2
+        approaching_rate = scattering_rate(detuning, -resonant_speed, SATURATION)
+        receding_rate = scattering_rate(detuning, resonant_speed, SATURATION)
+
         # ===== パート2: 近づく原子 =====
         # ボックスタイトル
         approaching_title = Text("① 近づく原子", font_size=22, color=BLUE).shift(LEFT * 3.5 + UP * 0.5)
@@ -733,7 +879,11 @@ class DopplerSelectiveCooling(Scene):
             FadeOut(photon),
         )
 
-        result_left = Text("→ 光を吸収して減速!", font_size=18, color=GREEN)
+        result_left = Text(
+            f"→ 光を吸収して減速!（{approaching_rate / 1e6:.1f}×10⁶ 回/s）",
+            font_size=18,
+            color=GREEN,
+        )
         result_left.next_to(doppler_up, DOWN, buff=0.3)
         self.play(Write(result_left))
         self.wait(1)
@@ -779,7 +929,11 @@ class DopplerSelectiveCooling(Scene):
         self.play(photon2.animate.move_to(RIGHT * 5.5), run_time=0.5)
         self.remove(photon2)
 
-        result_right = Text("→ 光を吸収しない", font_size=18, color=GRAY)
+        result_right = Text(
+            f"→ ほとんど吸収しない（{receding_rate / 1e6:.1f}×10⁶ 回/s）",
+            font_size=18,
+            color=GRAY,
+        )
         result_right.next_to(doppler_down, DOWN, buff=0.3)
         self.play(Write(result_right))
         self.wait(1)
@@ -808,9 +962,9 @@ class DopplerFrequencyShift(Scene):
         title = Text("ドップラー効果と共鳴条件", font_size=32, color=WHITE).to_edge(UP)
         self.play(Write(title))
 
-        # 周波数スペクトル軸
+        # 周波数スペクトル軸（共鳴からのずれ (ν - ν₀) を自然幅 Γ 単位で取る）
         axes = Axes(
-            x_range=[0, 10, 2],
+            x_range=[-4, 4, 1],
             y_range=[0, 1.2, 0.5],
             x_length=10,
             y_length=3,
@@ -822,32 +976,38 @@ class DopplerFrequencyShift(Scene):
 
         self.play(Create(axes), Write(x_label), Write(y_label))
 
-        # 共鳴線（ローレンツ型）
-        def lorentzian(x, x0, gamma=0.3):
-            return gamma**2 / ((x - x0)**2 + gamma**2)
+        # ⁸⁷Rb D2線の吸収スペクトル（飽和で広がったローレンツ型）
+        def absorption(x):
+            return absorption_spectrum(x * GAMMA_D2, saturation=2 * SATURATION)
 
         resonance_curve = axes.plot(
-            lambda x: lorentzian(x, 6),
-            x_range=[3, 9],
+            absorption,
+            x_range=[-4, 4],
+            use_vectorized=True,
             color=WHITE,
             stroke_width=3,
         )
 
         resonance_label = MathTex(r"\nu_0", font_size=24, color=WHITE)
-        resonance_label.next_to(axes.c2p(6, 1), UP)
+        resonance_label.next_to(axes.c2p(0, 1), UP)
 
         self.play(Create(resonance_curve), Write(resonance_label))
         self.wait(0.5)
 
         # レーザー周波数（赤方偏移）
         laser_line = DashedLine(
-            axes.c2p(4, 0),
-            axes.c2p(4, 1.1),
+            axes.c2p(LASER_DETUNING, 0),
+            axes.c2p(LASER_DETUNING, 1.1),
             color=RED,
             stroke_width=2,
         )
         laser_label = MathTex(r"\nu_L", font_size=24, color=RED)
-        laser_label.next_to(axes.c2p(4, 1.1), UP)
+        laser_label.next_to(axes.c2p(LASER_DETUNING, 1.1), UP)
+
+        # 原子から見たレーザー周波数が共鳴に一致する速さ |v| = |δ| / k
+        resonant_speed = abs(LASER_DETUNING) * GAMMA_D2 / K_D2
+        seen_approaching = LASER_DETUNING + K_D2 * resonant_speed / GAMMA_D2
+        seen_receding = LASER_DETUNING - K_D2 * resonant_speed / GAMMA_D2
 
         self.play(Create(laser_line), Write(laser_label))
 
@@ -860,7 +1020,7 @@ class DopplerFrequencyShift(Scene):
         self.wait(1)
 
         # 近づく原子：青方偏移で共鳴位置へ
-        approaching_dot = Dot(axes.c2p(4, 0.1), color=BLUE, radius=0.15)
+        approaching_dot = Dot(axes.c2p(LASER_DETUNING, 0.1), color=BLUE, radius=0.15)
         approaching_label = Text("近づく原子", font_size=16, color=BLUE)
         approaching_label.next_to(approaching_dot, DOWN)
 
@@ -868,15 +1028,19 @@ class DopplerFrequencyShift(Scene):
 
         # 青方偏移のアニメーション
         shift_arrow = Arrow(
-            axes.c2p(4, 0.5),
-            axes.c2p(6, 0.5),
+            axes.c2p(LASER_DETUNING, 0.5),
+            axes.c2p(seen_approaching, 0.5),
             color=BLUE,
             stroke_width=3,
         )
-        shift_label = Text("青方偏移", font_size=16, color=BLUE).next_to(shift_arrow, UP)
+        shift_label = Text(
+            f"青方偏移（v = {resonant_speed:.1f} m/s）", font_size=16, color=BLUE
+        ).next_to(shift_arrow, UP)
 
         self.play(
-            approaching_dot.animate.move_to(axes.c2p(6, 1)),
+            approaching_dot.animate.move_to(
+                axes.c2p(seen_approaching, absorption(seen_approaching))
+            ),
             GrowArrow(shift_arrow),
             Write(shift_label),
             run_time=1.5,
@@ -892,7 +1056,7 @@ class DopplerFrequencyShift(Scene):
         self.wait(1)
 
         # 遠ざかる原子：さらに赤方偏移
-        receding_dot = Dot(axes.c2p(4, 0.1), color=GRAY, radius=0.15)
+        receding_dot = Dot(axes.c2p(LASER_DETUNING, 0.1), color=GRAY, radius=0.15)
         receding_label = Text("遠ざかる原子", font_size=16, color=GRAY)
         receding_label.next_to(receding_dot, DOWN)
 
@@ -909,15 +1073,15 @@ class DopplerFrequencyShift(Scene):
 
         # 赤方偏移
         shift_arrow2 = Arrow(
-            axes.c2p(4, 0.3),
-            axes.c2p(2, 0.3),
+            axes.c2p(LASER_DETUNING, 0.3),
+            axes.c2p(seen_receding, 0.3),
             color=GRAY,
             stroke_width=3,
         )
         shift_label2 = Text("赤方偏移", font_size=16, color=GRAY).next_to(shift_arrow2, UP)
 
         self.play(
-            receding_dot.animate.move_to(axes.c2p(2, 0.05)),
+            receding_dot.animate.move_to(axes.c2p(seen_receding, absorption(seen_receding))),
             GrowArrow(shift_arrow2),
             Write(shift_label2),
             run_time=1.5,
@@ -929,5 +1093,58 @@ class DopplerFrequencyShift(Scene):
         self.play(Write(no_resonance))
         self.wait(2)
 
+        # ===== 対向2ビームの正味の力 F(v) と離調のスイープ =====
+        self.play(*[FadeOut(mob) for mob in self.mobjects if mob is not title])
+
+        # (離調, 速度) の格子はパラメータごとにキャッシュされ、各フレームでは行を補間するだけ
+        table = force_table(v_max=12.0, detuning_range=(-3.0, -0.2), saturation=SATURATION)
+        force_unit = HBAR * K_D2 * GAMMA_D2 / 2  # 最大の散乱力 ħkΓ/2
+
+        force_axes = Axes(
+            x_range=[-12, 12, 4],
+            y_range=[-0.25, 0.25, 0.1],
+            x_length=10,
+            y_length=3.5,
+            axis_config={"include_tip": False},
+            x_axis_config={"numbers_to_include": [-8, -4, 4, 8]},
+        ).shift(DOWN * 0.5)
+        force_x_label = Text("速度 v (m/s)", font_size=18).next_to(force_axes.x_axis, DOWN, buff=0.4)
+        force_y_label = MathTex(r"F / (\hbar k \Gamma / 2)", font_size=24)
+        force_y_label.next_to(force_axes.y_axis, UP, buff=0.1)
+
+        detuning = ValueTracker(-0.5)
+
+        def force_curve(v, value):
+            row = table.force_at(value * GAMMA_D2) / force_unit
+            return np.interp(v, table.velocities, row)
+
+        # 離調が変わったフレームだけ点列をその場で書き換える
+        curve = LiveFunctionGraph(
+            force_axes, force_curve, detuning,
+            x_range=[-12, 12], color=YELLOW, stroke_width=3,
+        )
+        detuning_readout = NumericReadout(
+            detuning.get_value(),
+            prefix=r"\delta = ",
+            suffix=r"\,\Gamma",
+            num_decimal_places=2,
+            font_size=28,
+            tex=True,
+            align_edge=RIGHT,
+        ).to_corner(UR, buff=0.8).shift(DOWN * 0.6)
+        detuning_readout.track(detuning.get_value)
+
+        damping_note = Text(
+            "遅い原子には速度に比例したブレーキ F ≈ -βv", font_size=18, color=YELLOW
+        ).to_edge(DOWN, buff=0.4)
+
+        self.play(Create(force_axes), Write(force_x_label), Write(force_y_label))
+        self.play(FadeIn(curve), Write(detuning_readout), Write(damping_note))
+        self.wait(0.5)
+
+        # 離調を大きくすると、力は弱くなるが速い原子まで捕まえられる
+        self.play(detuning.animate.set_value(-2.5), run_time=4, rate_func=there_and_back)
+        self.wait(1)
+
         # フェードアウト
-        self.play(*[FadeOut(mob) for mob in self.mobjects])
\ No newline at end of file
+        self.play(*[FadeOut(mob) for mob in self.mobjects])
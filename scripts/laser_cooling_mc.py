@@ -0,0 +1,208 @@
+"""
+⁸⁷Rb のレーザー冷却（光糖蜜）のモンテカルロシミュレーション
+
+原子の集団を (N, 3) の速度配列で持ち、時間刻み dt ごとに
+    1. 各ビームの散乱率 R = (Γ/2) s₀ / (1 + s_tot + 4(δ - k·v)²/Γ²) を計算
+       （ドップラーシフトした離調のローレンツ型）
+    2. 吸収した光子の数だけビーム方向に ħk ずつ反跳
+    3. 自然放出は等方的なランダム方向の反跳（n 個の和の各成分は分散 n/3）
+をすべて配列演算で進める。記録間隔ごとに速度分布のヒストグラム・RMS速度・温度を保存し、
+シーンはこの時系列を再生する
+
+吸収数のサンプリング方法:
+    "langevin": 1ステップの散乱数 λ = RΔt が数個以上あることを利用し、反跳の合計を
+        平均・分散が厳密に一致する正規分布で近似する（既定、10⁵ 原子 × 10⁴ 散乱イベントが
+        数秒）。ビームは座標軸に沿っている前提（軸間の相関を無視する）
+    "poisson": ビームごとの吸収数をポアソン分布からサンプリングする（数倍遅い）
+
+使用例:
+    rng = np.random.default_rng(0)
+    sim = LaserCoolingMC(rng, n_atoms=100_000, temperature=5e-3)
+    history = sim.run(duration=2e-3, dt=4e-6, record_every=10)
+    history.temperature   # (記録数,) [K]
+    history.histograms    # (記録数, ビン数) 冷却軸方向の速度分布
+"""
+
+import numpy as np
+
+import doppler_force
+from mb_distribution import sample_velocities
+from rb87_constants import GAMMA_D2, K_B, M_RB87, V_RECOIL
+
+# 冷却軸（x）に沿って対向する2本のビーム（1次元光糖蜜）
+MOLASSES_1D = np.array([[1.0, 0.0, 0.0], [-1.0, 0.0, 0.0]])
+# 3軸6本のビーム（3次元光糖蜜）
+MOLASSES_3D = np.concatenate([np.eye(3), -np.eye(3)])
+
+
+def scattering_rate(velocities, beam, detuning, saturation, total_saturation=None):
+    """1本のビームによる光子散乱率 [1/s]
+
+    Args:
+        velocities: (N, 3) の速度 [m/s]
+        beam: ビームの進行方向の単位ベクトル (3,)
+        detuning: レーザーの離調 δ [rad/s]（赤方偏移なら負）
+        saturation: このビームの飽和パラメータ s₀ = I / I_sat
+        total_saturation: 分母の飽和項（既定: saturation）
+    """
+    # ビーム方向の速度成分で決まるドップラーシフト（ビームに向かって動くと青方偏移）
+    return doppler_force.scattering_rate(detuning, velocities @ beam, saturation, total_saturation)
+
+
+def sample_emission_directions(rng, n):
+    """等方的な自然放出の方向（単位ベクトル (n, 3)）"""
+    cos_theta = rng.uniform(-1, 1, size=n)
+    phi = rng.uniform(0, 2 * np.pi, size=n)
+    sin_theta = np.sqrt(1 - cos_theta**2)
+    return np.stack([sin_theta * np.cos(phi), sin_theta * np.sin(phi), cos_theta], axis=1)
+
+
+class CoolingHistory:
+    """シミュレーションの記録（シーンでの再生用）
+
+    Attributes:
+        times: (K,) 記録時刻 [s]
+        photons: (K,) 1原子あたりの平均散乱光子数
+        v_rms: (K, 3) 軸ごとの RMS 速度 [m/s]
+        temperature: (K,) 冷却軸方向の温度 m<v²>/k_B [K]
+        bin_edges: (B + 1,) ヒストグラムのビン境界 [m/s]
+        histograms: (K, B) 冷却軸方向の速度分布（確率密度）
+    """
+
+    def __init__(self, bin_edges):
+        self.bin_edges = bin_edges
+        self._records = []
+
+    def record(self, time, photons, velocities, axis):
+        v_axis = velocities @ axis
+        density, _ = np.histogram(v_axis, bins=self.bin_edges, density=True)
+        v_rms = np.sqrt(np.mean(velocities**2, axis=0))
+        temperature = M_RB87 * np.mean(v_axis**2) / K_B
+        self._records.append((time, photons, v_rms, temperature, density))
+
+    def _column(self, i):
+        return np.array([record[i] for record in self._records])
+
+    @property
+    def times(self):
+        return self._column(0)
+
+    @property
+    def photons(self):
+        return self._column(1)
+
+    @property
+    def v_rms(self):
+        return self._column(2)
+
+    @property
+    def temperature(self):
+        return self._column(3)
+
+    @property
+    def histograms(self):
+        return self._column(4)
+
+    @property
+    def bin_centers(self):
+        return (self.bin_edges[:-1] + self.bin_edges[1:]) / 2
+
+    def __len__(self):
+        return len(self._records)
+
+
+class LaserCoolingMC:
+    """⁸⁷Rb 原子集団のレーザー冷却シミュレーション
+
+    Args:
+        rng: np.random.Generator
+        n_atoms: 原子数
+        temperature: 初期温度 [K]（速度は熱平衡分布からサンプリング）
+        detuning: 離調 δ/Γ（既定: -1/2、1次元ドップラー冷却が最も効く値）
+        saturation: 1本あたりの飽和パラメータ s₀
+        beams: ビームの進行方向 (M, 3)（既定: x 軸の対向ビーム）
+        axis: 温度・ヒストグラムを測る冷却軸
+        velocities: 初期速度 (N, 3) を直接与える場合（temperature より優先）
+        method: 吸収数のサンプリング方法（"langevin" または "poisson"）
+    """
+
+    def __init__(
+        self,
+        rng,
+        n_atoms=100_000,
+        temperature=5e-3,
+        detuning=-0.5,
+        saturation=0.5,
+        beams=MOLASSES_1D,
+        axis=(1.0, 0.0, 0.0),
+        velocities=None,
+        method="langevin",
+    ):
+        if method not in ("langevin", "poisson"):
+            raise ValueError(f"unknown method: {method}")
+        self.rng = rng
+        self.method = method
+        self.detuning = detuning * GAMMA_D2
+        self.saturation = saturation
+        self.beams = np.asarray(beams, dtype=float)
+        self.axis = np.asarray(axis, dtype=float)
+        if velocities is None:
+            velocities = sample_velocities(rng, temperature, n_atoms)
+        self.velocities = np.array(velocities, dtype=float)
+        self.time = 0.0
+        self.photons = np.zeros(len(self.velocities))
+        self._kicks = np.empty_like(self.velocities)
+
+    def rates(self):
+        """(M, N) ビームごと・原子ごとの散乱率 [1/s]"""
+        total = self.saturation * len(self.beams)
+        return np.stack([
+            scattering_rate(self.velocities, beam, self.detuning, self.saturation, total)
+            for beam in self.beams
+        ])
+
+    def step(self, dt):
+        """dt 秒だけ進める（吸収・反跳・自然放出）"""
+        expected = self.rates() * dt  # (M, N) 1ステップの平均散乱数
+
+        if self.method == "poisson":
+            counts = self.rng.poisson(expected)
+            n_emitted = counts.sum(axis=0)
+            # 吸収: ビーム方向に ħk/m ずつ
+            kicks = counts.T @ self.beams
+            # 自然放出: n 個のランダム方向の和（各成分の分散 n/3）
+            kicks += self.rng.standard_normal(kicks.shape) * np.sqrt(n_emitted / 3)[:, None]
+        else:
+            n_emitted = expected.sum(axis=0)
+            # 平均は吸収の向きの和、分散は吸収（λ ê²）と自然放出（λ/3）の和
+            mean = expected.T @ self.beams
+            variance = expected.T @ self.beams**2
+            variance += (n_emitted / 3)[:, None]
+            kicks = self.rng.standard_normal(out=self._kicks)
+            kicks *= np.sqrt(variance)
+            kicks += mean
+
+        self.velocities += V_RECOIL * kicks
+        self.photons += n_emitted
+        self.time += dt
+        return self
+
+    def run(self, duration, dt=4e-6, record_every=10, v_max=None, bins=80):
+        """duration 秒のシミュレーションを行い、CoolingHistory を返す
+
+        Args:
+            dt: 時間刻み [s]（減衰時間 約100 μs より十分短くする）
+            record_every: 何ステップごとに記録するか
+            v_max: ヒストグラムの範囲 ±v_max [m/s]（既定: 初期 RMS 速度の4倍）
+        """
+        if v_max is None:
+            v_max = 4 * np.sqrt(np.mean((self.velocities @ self.axis) ** 2))
+        history = CoolingHistory(np.linspace(-v_max, v_max, bins + 1))
+        history.record(self.time, self.photons.mean(), self.velocities, self.axis)
+
+        n_steps = int(round(duration / dt))
+        for i in range(1, n_steps + 1):
+            self.step(dt)
+            if i % record_every == 0 or i == n_steps:
+                history.record(self.time, self.photons.mean(), self.velocities, self.axis)
+        return history
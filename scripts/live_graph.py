@@ -0,0 +1,169 @@
+"""
+ValueTrackerに追従して点列をその場で書き換える関数グラフ
+
+always_redraw(lambda: axes.plot(...)) は毎フレーム新しい VMobject を作り、
+axes.get_area(axes.plot(...)) ではさらにもう1本グラフを作り直す。
+LiveFunctionGraph は x のサンプル点を固定し、トラッカーの値が変わったときだけ
+y をベクトル化して評価し、確保済みの点バッファを上書きする。
+面積（LiveArea）も同じアンカー点から塗りつぶし多角形を書き換える
+
+使用例:
+    graph = LiveFunctionGraph(
+        axes, lambda v, T: speed_pdf(v, T), T_tracker,
+        x_range=[0.01, 5], color=lambda T: get_color(T), stroke_width=3,
+    )
+    area = graph.get_area(opacity=0.3)
+    self.play(Create(graph), FadeIn(area))
+    self.play(T_tracker.animate.set_value(0.3))
+
+注意:
+    座標変換は軸が線形目盛であることを前提にしている（対数軸は非対応）。
+"""
+
+from manim import *
+import numpy as np
+
+
+def _write_corner_beziers(anchors, out):
+    """アンカー点列を直線セグメントの3次ベジェ制御点として out に書き込む
+
+    anchors: (N, 3)、out: (4 * (N - 1), 3)
+    """
+    start = anchors[:-1]
+    end = anchors[1:]
+    segments = out.reshape(-1, 4, 3)
+    segments[:, 0] = start
+    segments[:, 3] = end
+    # 制御点は線分の 1/3・2/3 の位置（add_points_as_corners と同じ）
+    np.multiply(start, 2 / 3, out=segments[:, 1])
+    segments[:, 1] += end / 3
+    np.multiply(start, 1 / 3, out=segments[:, 2])
+    segments[:, 2] += end * (2 / 3)
+
+
+class LiveFunctionGraph(VMobject):
+    """トラッカーの値に応じて形が変わる関数グラフ
+
+    Args:
+        axes: グラフを描く Axes（線形目盛）
+        function: f(x, value) -> y。x は固定のサンプル配列、value はトラッカーの値
+        tracker: ValueTracker（get_value() を持つもの）
+        x_range: [x_min, x_max]
+        num_samples: x のサンプル数
+        color: 線の色、または value を受け取って色を返す関数
+    """
+
+    def __init__(
+        self,
+        axes,
+        function,
+        tracker,
+        x_range,
+        num_samples=300,
+        color=YELLOW,
+        **kwargs,
+    ):
+        self.color_function = color if callable(color) else None
+        static_color = color if not callable(color) else color(tracker.get_value())
+        super().__init__(color=static_color, **kwargs)
+
+        self.axes = axes
+        self.function = function
+        self.tracker = tracker
+        self.x = np.linspace(x_range[0], x_range[1], num_samples)
+
+        # 毎フレーム使い回すバッファ
+        self.anchors = np.zeros((num_samples, 3))
+        self.offsets = np.zeros((num_samples, 3))
+        self.last_value = None
+        self.version = 0
+
+        self.update_graph(force=True)
+        self.add_updater(lambda m: m.update_graph())
+
+    def _axis_basis(self):
+        """軸座標 → シーン座標の線形変換（原点と単位ベクトル）"""
+        origin = self.axes.c2p(0, 0)
+        return origin, self.axes.c2p(1, 0) - origin, self.axes.c2p(0, 1) - origin
+
+    def update_graph(self, force=False):
+        """トラッカーの値が変わっていれば点列を書き換える"""
+        value = self.tracker.get_value()
+        if not force and value == self.last_value:
+            return self
+        self.last_value = value
+
+        y = np.asarray(self.function(self.x, value), dtype=float)
+        origin, x_unit, y_unit = self._axis_basis()
+        np.multiply.outer(self.x, x_unit, out=self.anchors)
+        np.multiply.outer(y, y_unit, out=self.offsets)
+        self.anchors += self.offsets
+        self.anchors += origin
+
+        n_points = 4 * (len(self.x) - 1)
+        if self.points.shape != (n_points, 3):
+            # Create などで点列が置き換えられた後は確保し直す
+            self.points = np.zeros((n_points, 3))
+        _write_corner_beziers(self.anchors, self.points)
+
+        if self.color_function is not None:
+            self.set_stroke(color=self.color_function(value))
+        self.version += 1
+        return self
+
+    def get_area(self, color=None, opacity=0.3, **kwargs):
+        """このグラフと x 軸の間を塗りつぶす LiveArea を返す"""
+        return LiveArea(self, color=color, opacity=opacity, **kwargs)
+
+
+class LiveArea(VMobject):
+    """LiveFunctionGraph の下側を塗りつぶす多角形（グラフのアンカー点を共有）
+
+    color を省略するとグラフの色（関数指定ならその値）に追従する。
+    """
+
+    def __init__(self, graph, color=None, opacity=0.3, **kwargs):
+        super().__init__(stroke_width=0, **kwargs)
+        self.graph = graph
+        self.color_function = color if callable(color) else None
+        self.static_color = None if callable(color) else color
+        self.opacity = opacity
+
+        n = len(graph.x)
+        # 底辺の左端 → グラフ → 底辺の右端 → 左端 の閉じた折れ線
+        self.outline = np.zeros((n + 3, 3))
+        self.seen_version = None
+
+        self.update_area(force=True)
+        self.add_updater(lambda m: m.update_area())
+
+    def _current_color(self, value):
+        if self.color_function is not None:
+            return self.color_function(value)
+        if self.static_color is not None:
+            return self.static_color
+        if self.graph.color_function is not None:
+            return self.graph.color_function(value)
+        return self.graph.get_stroke_color()
+
+    def update_area(self, force=False):
+        # グラフ側の updater より先に呼ばれても1フレーム遅れないようにする
+        self.graph.update_graph()
+        if not force and self.graph.version == self.seen_version:
+            return self
+        self.seen_version = self.graph.version
+
+        anchors = self.graph.anchors
+        origin, x_unit, _ = self.graph._axis_basis()
+        self.outline[0] = origin + self.graph.x[0] * x_unit
+        self.outline[1:-2] = anchors
+        self.outline[-2] = origin + self.graph.x[-1] * x_unit
+        self.outline[-1] = self.outline[0]
+
+        n_points = 4 * (len(self.outline) - 1)
+        if self.points.shape != (n_points, 3):
+            self.points = np.zeros((n_points, 3))
+        _write_corner_beziers(self.outline, self.points)
+
+        self.set_fill(self._current_color(self.graph.last_value), opacity=self.opacity)
+        return self
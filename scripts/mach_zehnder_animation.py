@@ -12,6 +12,18 @@
 from manim import *
 import numpy as np
 
+from interferometer_phase import acceleration_phase, arm_positions, arm_separation
+
+# 時空間ダイアグラムで表示する干渉計のパルス間隔 [s]
+PULSE_INTERVAL = 0.1
+
+
+def sci_tex(value, digits=2):
+    """数値を「仮数 × 10の累乗」形式の TeX 文字列にする"""
+    exponent = int(np.floor(np.log10(abs(value))))
+    mantissa = value / 10**exponent
+    return rf"{mantissa:.{digits}f} \times 10^{{{exponent}}}"
+
 
 class MachZehnderOptical(Scene):
     """光学的マッハ-ツェンダー干渉計（正方形配置）"""
@@ -356,21 +368,35 @@ class MachZehnderAtomic(Scene):
         #        /|
         #       / |              ← 干渉結果: |e⟩斜め、|g⟩真下
 
-        # 頂点位置
-        horizontal_spread = 1.2  # 横方向の広がり（運動量+ħkによる偏向）
+        # 頂点位置: 自由落下系での2経路の軌道を計算し、画面に写す
+        # （横方向は最大の経路間距離 v_r·T を horizontal_spread に対応させる）
+        T = PULSE_INTERVAL
+        horizontal_spread = 1.2
+        max_separation = arm_separation(T, T)
+
+        def spacetime_point(t, z):
+            return (
+                center
+                + UP * t_spacing * (1 - t / T)
+                + RIGHT * horizontal_spread * z / max_separation
+            )
+
+        lead_time = 0.8 / t_spacing * T  # パルス前・出力経路の表示時間
+        times = np.array([-lead_time, 0, T, 2 * T, 2 * T + lead_time])
+        z_a, z_b = arm_positions(times, T, free_fall=True)
 
         # パルス前の原子位置（t<0）
-        pre_pulse_point = center + UP * 2.3
+        pre_pulse_point = spacetime_point(times[0], z_b[0])
         # t=0 での分割点（π/2パルス位置）
-        t0_point = center + UP * t_spacing
+        t0_point = spacetime_point(0, z_b[1])
         # t=T での2つの位置（πパルス位置）
-        tT_g = center  # |g⟩経路: 真下に落ちた位置
-        tT_e = center + RIGHT * horizontal_spread  # |e⟩経路: 斜め右に移動した位置
+        tT_g = spacetime_point(T, z_b[2])  # |g⟩経路: 真下に落ちた位置
+        tT_e = spacetime_point(T, z_a[2])  # |e⟩経路: 斜め右に移動した位置
         # t=2T での再結合点（π/2パルス位置）
-        t2T_point = center + DOWN * t_spacing + RIGHT * horizontal_spread
+        t2T_point = spacetime_point(2 * T, z_a[3])
         # 出力位置
-        output_g = t2T_point + DOWN * 0.8  # |g⟩出力: 真下
-        output_e = t2T_point + DOWN * 0.8 + RIGHT * horizontal_spread  # |e⟩出力: 斜め右
+        output_g = spacetime_point(times[4], z_a[4])  # |g⟩出力: 真下
+        output_e = spacetime_point(times[4], z_b[4])  # |e⟩出力: 斜め右（+v_r）
 
         # パルス前の原子を表示
         atom_dot = Dot(pre_pulse_point, color=WHITE, radius=0.1)
@@ -522,9 +548,15 @@ class MachZehnderAtomic(Scene):
         self.wait(0.3)
 
         # 干渉の説明（中央に大きく表示）
+        phase = acceleration_phase(T)
         explanation = VGroup(
             Text("加速度 a により2経路間に位相差が蓄積", font_size=28),
             MathTex(r"\Delta\phi = k_{\text{eff}} \cdot a \cdot T^2", font_size=44, color=YELLOW),
+            MathTex(
+                rf"T = {T * 1e3:.0f}\,\text{{ms}},\ a = g"
+                rf"\ \Rightarrow\ \Delta\phi \approx {sci_tex(phase)}\,\text{{rad}}",
+                font_size=30,
+            ),
             MathTex(r"\Downarrow", font_size=36),
             Text("確率として観測", font_size=26),
             MathTex(r"P_g = \cos^2\left(\frac{\Delta\phi}{2}\right)", font_size=40, color=GREEN),
@@ -673,29 +705,32 @@ class AtomInterferometer(Scene):
         tT = Text("t=T", font_size=18).next_to(pulse_positions[1] + DOWN * 0.5, DOWN)
         t2T = Text("t=2T", font_size=18).next_to(pulse_positions[2] + DOWN * 0.5, DOWN)
 
-        # 原子の軌跡
-        # 初期状態（|g⟩）
-        start_point = LEFT * 4.5 + UP * 0.5
-
-        # 経路A（|e⟩状態、運動量+ħk）
-        path_a = VMobject(color=RED, stroke_width=3)
-        path_a.set_points_smoothly([
-            start_point,
-            pulse_positions[0] + UP * 0.5,
-            pulse_positions[1] + UP * 2,
-            pulse_positions[2] + UP * 0.5,
-            RIGHT * 4.5 + UP * 0.5,
-        ])
-
-        # 経路B（|g⟩状態、運動量0）
-        path_b = VMobject(color=BLUE, stroke_width=3)
-        path_b.set_points_smoothly([
-            start_point,
-            pulse_positions[0] + UP * 0.5,
-            pulse_positions[1] + DOWN * 0.5,
-            pulse_positions[2] + UP * 0.5,
-            RIGHT * 4.5 + UP * 0.5,
-        ])
+        # 原子の軌跡: 2経路の軌道を計算し、平均速度 v_r/2 で動く系で表示する
+        # （横軸: 時間、縦軸: 経路の位置。最大の経路間距離 v_r·T を path_spread に対応させる）
+        T = PULSE_INTERVAL
+        baseline = 1.1
+        path_spread = 1.8
+        max_separation = arm_separation(T, T)
+
+        def arm_path(t_start, t_end):
+            """時刻 t_start〜t_end の経路A・Bを折れ線で返す"""
+            times = np.array([t_start, 0, T, 2 * T])
+            times = times[(times >= t_start) & (times <= t_end)]
+            times = np.unique(np.append(times, [t_start, t_end]))
+            z_a, z_b = arm_positions(times, T, free_fall=True)
+            z_mean = (z_a + z_b) / 2
+            paths = []
+            for z in (z_a - z_mean, z_b - z_mean):
+                points = [
+                    pulse_positions[0] + RIGHT * 3 * t / T
+                    + UP * (baseline + path_spread * zi / max_separation)
+                    for t, zi in zip(times, z)
+                ]
+                paths.append(VMobject(stroke_width=3).set_points_as_corners(points))
+            return paths
+
+        # 初期状態（|g⟩）は t = -T/2 から表示
+        start_time = -0.5 * T
 
         # アニメーション
         # パルスを順番に表示
@@ -706,20 +741,10 @@ class AtomInterferometer(Scene):
         split_text = Text("分割", font_size=24, color=YELLOW).next_to(pulses[0], LEFT, buff=0.5)
         self.play(Write(split_text))
 
-        # 経路の分岐を表示
-        path_a_seg1 = VMobject(color=RED, stroke_width=3)
-        path_a_seg1.set_points_smoothly([
-            start_point,
-            pulse_positions[0] + UP * 0.5,
-            pulse_positions[1] + UP * 2,
-        ])
-
-        path_b_seg1 = VMobject(color=BLUE, stroke_width=3)
-        path_b_seg1.set_points_smoothly([
-            start_point,
-            pulse_positions[0] + UP * 0.5,
-            pulse_positions[1] + DOWN * 0.5,
-        ])
+        # 経路の分岐を表示（経路A: |e⟩、運動量+ħk / 経路B: |g⟩）
+        path_a_seg1, path_b_seg1 = arm_path(start_time, T)
+        path_a_seg1.set_color(RED)
+        path_b_seg1.set_color(BLUE)
 
         self.play(Create(path_a_seg1), Create(path_b_seg1), run_time=1.5)
 
@@ -729,17 +754,9 @@ class AtomInterferometer(Scene):
         self.play(ReplacementTransform(split_text, reflect_text))
 
         # 経路の続き
-        path_a_seg2 = VMobject(color=RED, stroke_width=3)
-        path_a_seg2.set_points_smoothly([
-            pulse_positions[1] + UP * 2,
-            pulse_positions[2] + UP * 0.5,
-        ])
-
-        path_b_seg2 = VMobject(color=BLUE, stroke_width=3)
-        path_b_seg2.set_points_smoothly([
-            pulse_positions[1] + DOWN * 0.5,
-            pulse_positions[2] + UP * 0.5,
-        ])
+        path_a_seg2, path_b_seg2 = arm_path(T, 2 * T)
+        path_a_seg2.set_color(RED)
+        path_b_seg2.set_color(BLUE)
 
         self.play(Create(path_a_seg2), Create(path_b_seg2), run_time=1.5)
 
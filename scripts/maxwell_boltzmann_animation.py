@@ -11,6 +11,11 @@ Maxwell-Boltzmann分布の温度依存性アニメーション
 from manim import *
 import numpy as np
 
+from frame_archive import cached_archive
+from live_graph import LiveFunctionGraph
+from mb_distribution import most_probable_speed, speed_pdf
+from numeric_readout import NumericReadout
+
 
 class MaxwellBoltzmannCooling(Scene):
     """温度低下に伴うMaxwell-Boltzmann分布の変化"""
@@ -44,14 +49,11 @@ class MaxwellBoltzmannCooling(Scene):
         # タイトル
         title = Text("Maxwell-Boltzmann 速度分布", font_size=32).to_edge(UP)
 
-        # Maxwell-Boltzmann分布関数（1次元簡略版）
+        # Maxwell-Boltzmann分布関数（任意単位、配列でまとめて評価）
         def maxwell_boltzmann(v, T):
-            if T <= 0:
-                return 0
             # f(v) ∝ v² exp(-mv²/(2k_B T))
-            # 正規化係数を調整して見やすくする
-            prefactor = (m / (k_B * T)) ** 1.5
-            return prefactor * v**2 * np.exp(-m * v**2 / (2 * k_B * T))
+            # 正規化係数を調整して見やすくする（(m/k_B T)^{3/2} v² exp(...) と同じ形）
+            return np.sqrt(np.pi / 2) * speed_pdf(v, T, m=m, k_B=k_B)
 
         # 初期温度
         T_start = 2.0
@@ -60,37 +62,33 @@ class MaxwellBoltzmannCooling(Scene):
         # 温度トラッカー
         T_tracker = ValueTracker(T_start)
 
-        # 温度表示
-        temp_label = always_redraw(
-            lambda: MathTex(
-                f"T = {T_tracker.get_value():.2f}",
-                font_size=42,
-                color=self.get_temp_color(T_tracker.get_value(), T_start, T_end),
-            ).to_corner(UR)
+        # 温度表示（グリフをキャッシュして数値だけ差し替える）
+        temp_label = NumericReadout(
+            T_start,
+            prefix="T = ",
+            num_decimal_places=2,
+            font_size=42,
+            tex=True,
+            color=self.get_temp_color(T_start, T_start, T_end),
+            align_edge=RIGHT,
+        ).to_corner(UR)
+        temp_label.track(
+            T_tracker.get_value,
+            color=lambda: self.get_temp_color(T_tracker.get_value(), T_start, T_end),
         )
 
-        # 分布曲線（動的に更新）
-        distribution = always_redraw(
-            lambda: axes.plot(
-                lambda v: maxwell_boltzmann(v, T_tracker.get_value()),
-                x_range=[0.01, 5],
-                color=self.get_temp_color(T_tracker.get_value(), T_start, T_end),
-                stroke_width=3,
-            )
+        # 分布曲線（温度が変わったら点列をその場で書き換える）
+        distribution = LiveFunctionGraph(
+            axes,
+            maxwell_boltzmann,
+            T_tracker,
+            x_range=[0.01, 5],
+            color=lambda T: self.get_temp_color(T, T_start, T_end),
+            stroke_width=3,
         )
 
-        # 面積（分布の下）
-        area = always_redraw(
-            lambda: axes.get_area(
-                axes.plot(
-                    lambda v: maxwell_boltzmann(v, T_tracker.get_value()),
-                    x_range=[0.01, 5],
-                ),
-                x_range=[0.01, 5],
-                color=self.get_temp_color(T_tracker.get_value(), T_start, T_end),
-                opacity=0.3,
-            )
-        )
+        # 面積（分布の下、曲線と同じ点列・色を共有）
+        area = distribution.get_area(opacity=0.3)
 
         # アニメーション開始
         self.play(Write(title))
@@ -156,10 +154,7 @@ class MaxwellBoltzmannComparison(Scene):
         title = Text("温度による速度分布の変化", font_size=32).to_edge(UP)
 
         def maxwell_boltzmann(v, T):
-            if T <= 0:
-                return 0
-            prefactor = (m / (k_B * T)) ** 1.5
-            return prefactor * v**2 * np.exp(-m * v**2 / (2 * k_B * T))
+            return np.sqrt(np.pi / 2) * speed_pdf(v, T, m=m, k_B=k_B)
 
         # 3つの温度
         temperatures = [2.0, 1.0, 0.4]
@@ -175,6 +170,7 @@ class MaxwellBoltzmannComparison(Scene):
             curve = axes.plot(
                 lambda v, T=T: maxwell_boltzmann(v, T),
                 x_range=[0.01, 5],
+                use_vectorized=True,
                 color=color,
                 stroke_width=3,
             )
@@ -215,29 +211,17 @@ class Rb87LaserCooling(Scene):
     """⁸⁷Rbの100μKから5μKまでの冷却アニメーション（絶対速度軸）"""
 
     def construct(self):
-        # 物理定数
-        m_Rb87 = 87 * 1.66054e-27  # ⁸⁷Rbの質量 [kg]
-        k_B = 1.38065e-23  # ボルツマン定数 [J/K]
-
         # 温度範囲
         T_start = 100e-6  # 100 μK
         T_end = 5e-6  # 5 μK
 
-        # 最確速度 v_p = sqrt(2 k_B T / m)
-        def most_probable_velocity(T):
-            return np.sqrt(2 * k_B * T / m_Rb87)
-
-        # Maxwell-Boltzmann分布（実速度、cm/s単位）
+        # Maxwell-Boltzmann分布（実速度、cm/s単位、配列でまとめて評価）
         def maxwell_boltzmann(v_cm, T):
             """v_cm: 速度 [cm/s], T: 温度 [K]"""
-            v = v_cm / 100  # m/s に変換
-            if T <= 0 or v <= 0:
-                return 0
-            prefactor = 4 * np.pi * (m_Rb87 / (2 * np.pi * k_B * T)) ** 1.5
-            return prefactor * v**2 * np.exp(-m_Rb87 * v**2 / (2 * k_B * T))
+            return speed_pdf(v_cm / 100, T)  # m/s に変換
 
         # 初期温度での最確速度 [cm/s]
-        v_p_start = most_probable_velocity(T_start) * 100  # cm/s
+        v_p_start = most_probable_speed(T_start) * 100  # cm/s
         v_max = v_p_start * 4  # 軸の最大値
 
         # タイトル
@@ -264,50 +248,63 @@ class Rb87LaserCooling(Scene):
         def get_current_T():
             return 10 ** log_T_tracker.get_value()
 
-        # 温度表示
-        temp_label = always_redraw(
-            lambda: Text(
-                f"T = {get_current_T()*1e6:.1f} μK",
-                font_size=36,
-                color=self.get_temp_color(get_current_T(), T_start, T_end),
-            ).to_corner(UR)
+        # 温度表示（グリフをキャッシュして数値だけ差し替える）
+        temp_label = NumericReadout(
+            T_start * 1e6,
+            prefix="T = ",
+            suffix=" μK",
+            num_decimal_places=1,
+            font_size=36,
+            color=self.get_temp_color(T_start, T_start, T_end),
+            align_edge=RIGHT,
+        ).to_corner(UR)
+        temp_label.track(
+            lambda: get_current_T() * 1e6,
+            color=lambda: self.get_temp_color(get_current_T(), T_start, T_end),
         )
 
         # 最確速度の表示
-        velocity_label = always_redraw(
-            lambda: Text(
-                f"v_p = {most_probable_velocity(get_current_T())*100:.2f} cm/s",
-                font_size=28,
-                color=GRAY,
-            ).next_to(temp_label, DOWN, aligned_edge=RIGHT)
-        )
+        velocity_label = NumericReadout(
+            v_p_start,
+            prefix="v_p = ",
+            suffix=" cm/s",
+            num_decimal_places=2,
+            font_size=28,
+            color=GRAY,
+            align_edge=RIGHT,
+        ).next_to(temp_label, DOWN, aligned_edge=RIGHT)
+        velocity_label.track(lambda: most_probable_speed(get_current_T()) * 100)
 
         # 正規化用のピーク値（初期温度で計算、固定）
         peak_at_start = maxwell_boltzmann(v_p_start, T_start)
 
-        # 分布曲線（動的に更新）
-        distribution = always_redraw(
-            lambda: axes.plot(
-                lambda v: maxwell_boltzmann(v, get_current_T()) / peak_at_start,
-                x_range=[0.1, v_max],
-                color=self.get_temp_color(get_current_T(), T_start, T_end),
-                stroke_width=3,
-            )
-        )
+        # 温度ごとの分布をアーカイブに1度だけ計算しておき、フレームでは log T で行を補間する
+        # （フレーム軸は np.interp のために昇順で保存する）
+        params = {"T_start": T_start, "T_end": T_end, "v_max": v_max,
+                  "num_temperatures": 241, "num_samples": 300}
 
-        # 面積
-        area = always_redraw(
-            lambda: axes.get_area(
-                axes.plot(
-                    lambda v: maxwell_boltzmann(v, get_current_T()) / peak_at_start,
-                    x_range=[0.1, v_max],
-                ),
-                x_range=[0.1, v_max],
-                color=self.get_temp_color(get_current_T(), T_start, T_end),
-                opacity=0.3,
-            )
+        v_grid = np.linspace(0.1, v_max, params["num_samples"])
+
+        def tabulate():
+            log_T = np.linspace(np.log10(T_end), np.log10(T_start), params["num_temperatures"])
+            pdf = maxwell_boltzmann(v_grid[None, :], 10 ** log_T[:, None]) / peak_at_start
+            return {"log_T": log_T, "pdf": pdf}
+
+        archive = cached_archive(type(self).__name__, params, tabulate, frame_axis="log_T")
+
+        # 分布曲線（温度が変わったら点列をその場で書き換える）
+        distribution = LiveFunctionGraph(
+            axes,
+            lambda v, log_T: np.interp(v, v_grid, archive.frame_at(log_T, "pdf")),
+            log_T_tracker,
+            x_range=[0.1, v_max],
+            color=lambda log_T: self.get_temp_color(10**log_T, T_start, T_end),
+            stroke_width=3,
         )
 
+        # 面積（曲線と同じ点列・色を共有）
+        area = distribution.get_area(opacity=0.3)
+
         # アニメーション
         self.play(Write(title))
         self.play(Create(axes), Write(x_label), Write(y_label))
@@ -350,21 +347,9 @@ class Rb87ThreeTemperatures(Scene):
     """⁸⁷Rbの100μK, 50μK, 5μKでの分布を重ね合わせ表示"""
 
     def construct(self):
-        # 物理定数
-        m_Rb87 = 87 * 1.66054e-27  # ⁸⁷Rbの質量 [kg]
-        k_B = 1.38065e-23  # ボルツマン定数 [J/K]
-
-        # 最確速度 v_p = sqrt(2 k_B T / m)
-        def most_probable_velocity(T):
-            return np.sqrt(2 * k_B * T / m_Rb87)
-
-        # Maxwell-Boltzmann分布（cm/s単位）
+        # Maxwell-Boltzmann分布（cm/s単位、配列でまとめて評価）
         def maxwell_boltzmann(v_cm, T):
-            v = v_cm / 100  # m/s に変換
-            if T <= 0 or v <= 0:
-                return 0
-            prefactor = 4 * np.pi * (m_Rb87 / (2 * np.pi * k_B * T)) ** 1.5
-            return prefactor * v**2 * np.exp(-m_Rb87 * v**2 / (2 * k_B * T))
+            return speed_pdf(v_cm / 100, T)  # m/s に変換
 
         # 3つの温度設定
         temperatures = [
@@ -375,7 +360,7 @@ class Rb87ThreeTemperatures(Scene):
 
         # 軸の範囲は100μKに合わせる
         T_max = 100e-6
-        v_p_max = most_probable_velocity(T_max) * 100  # cm/s
+        v_p_max = most_probable_speed(T_max) * 100  # cm/s
         v_max = v_p_max * 4
 
         # 正規化用のピーク値（100μKで計算）
@@ -412,6 +397,7 @@ class Rb87ThreeTemperatures(Scene):
             curve = axes.plot(
                 lambda v, T=T: maxwell_boltzmann(v, T) / peak_100uK,
                 x_range=[0.1, v_max],
+                use_vectorized=True,
                 color=color,
                 stroke_width=3,
             )
@@ -459,16 +445,8 @@ class Rb87AbsoluteScale(Scene):
     """⁸⁷Rbの実際の速度スケールでの分布変化"""
 
     def construct(self):
-        # 物理定数
-        m_Rb87 = 87 * 1.66054e-27
-        k_B = 1.38065e-23
-
-        # Maxwell-Boltzmann分布（実速度）
-        def maxwell_boltzmann_real(v, T):
-            if T <= 0 or v <= 0:
-                return 0
-            prefactor = 4 * np.pi * (m_Rb87 / (2 * np.pi * k_B * T)) ** 1.5
-            return prefactor * v**2 * np.exp(-m_Rb87 * v**2 / (2 * k_B * T))
+        # Maxwell-Boltzmann分布（実速度、配列でまとめて評価）
+        maxwell_boltzmann_real = speed_pdf
 
         # 3つの温度での比較
         temperatures = [
@@ -484,7 +462,7 @@ class Rb87AbsoluteScale(Scene):
         info_text = None
 
         for i, (T, label, color) in enumerate(temperatures):
-            v_p = np.sqrt(2 * k_B * T / m_Rb87)
+            v_p = most_probable_speed(T)
             v_max = v_p * 4
 
             # 軸を温度に応じて作成
@@ -519,6 +497,7 @@ class Rb87AbsoluteScale(Scene):
             curve = axes.plot(
                 mb_normalized,
                 x_range=[0.01, v_max * v_scale],
+                use_vectorized=True,
                 color=color,
                 stroke_width=3,
             )
@@ -0,0 +1,115 @@
+"""
+Maxwell-Boltzmann分布の計算（NumPyベクトル化版）
+
+速度・温度に配列を渡すとブロードキャストしてまとめて評価する。
+温度スイープは v[np.newaxis, :] と T[:, np.newaxis] を渡せば
+(温度数 × 速度点数) の配列が1回の呼び出しで得られる
+
+単位:
+    既定は ⁸⁷Rb の SI 単位（速度 [m/s]、温度 [K]）。
+    m=1, k_B=1 を渡すと任意単位の分布になる。
+
+使用例:
+    v = np.linspace(0, 0.4, 2000)            # [m/s]
+    f = speed_pdf(v, 100e-6)                 # 100 μK の3次元速さ分布
+    F = speed_pdf(v[None, :], T[:, None])    # 温度スイープ
+"""
+
+import numpy as np
+
+from rb87_constants import K_B, M_RB87
+
+# erf の有理近似係数（Abramowitz & Stegun 7.1.26、絶対誤差 < 1.5e-7）
+_ERF_P = 0.3275911
+_ERF_A = (0.254829592, -0.284496736, 1.421413741, -1.453152027, 1.061405429)
+
+
+def erf(x):
+    """誤差関数（ベクトル化、scipy 不要）"""
+    x = np.asarray(x, dtype=float)
+    sign = np.sign(x)
+    x = np.abs(x)
+    t = 1.0 / (1.0 + _ERF_P * x)
+    a1, a2, a3, a4, a5 = _ERF_A
+    poly = t * (a1 + t * (a2 + t * (a3 + t * (a4 + t * a5))))
+    return sign * (1.0 - poly * np.exp(-x * x))
+
+
+def _thermal(T, m, k_B):
+    """k_B T / m と T > 0 のマスク（T <= 0 でも警告を出さない）"""
+    T = np.asarray(T, dtype=float)
+    valid = T > 0
+    kT_m = k_B * np.where(valid, T, 1.0) / m
+    return kT_m, valid
+
+
+def most_probable_speed(T, m=M_RB87, k_B=K_B):
+    """3次元速さ分布の最確速度 v_p = sqrt(2 k_B T / m)"""
+    kT_m, valid = _thermal(T, m, k_B)
+    return np.where(valid, np.sqrt(2 * kT_m), 0.0)[()]
+
+
+def mean_speed(T, m=M_RB87, k_B=K_B):
+    """3次元速さ分布の平均速度 <v> = sqrt(8 k_B T / (π m))"""
+    kT_m, valid = _thermal(T, m, k_B)
+    return np.where(valid, np.sqrt(8 * kT_m / np.pi), 0.0)[()]
+
+
+def rms_speed(T, m=M_RB87, k_B=K_B):
+    """3次元速さ分布の二乗平均速度 sqrt(<v²>) = sqrt(3 k_B T / m)"""
+    kT_m, valid = _thermal(T, m, k_B)
+    return np.where(valid, np.sqrt(3 * kT_m), 0.0)[()]
+
+
+def velocity_sigma(T, m=M_RB87, k_B=K_B):
+    """1次元速度成分の標準偏差 σ_v = sqrt(k_B T / m)"""
+    kT_m, valid = _thermal(T, m, k_B)
+    return np.where(valid, np.sqrt(kT_m), 0.0)[()]
+
+
+def speed_pdf(v, T, m=M_RB87, k_B=K_B):
+    """3次元の速さ分布 f(v) = 4π (m / 2πk_BT)^{3/2} v² exp(-mv² / 2k_BT)
+
+    v <= 0 または T <= 0 の点は 0 を返す。
+    """
+    v = np.asarray(v, dtype=float)
+    kT_m, valid = _thermal(T, m, k_B)
+    prefactor = 4 * np.pi * (2 * np.pi * kT_m) ** -1.5
+    f = prefactor * v**2 * np.exp(-(v**2) / (2 * kT_m))
+    return np.where(valid & (v > 0), f, 0.0)[()]
+
+
+def speed_cdf(v, T, m=M_RB87, k_B=K_B):
+    """3次元の速さ分布の累積分布 F(v) = erf(x) - (2/√π) x exp(-x²)、x = v / v_p"""
+    v = np.asarray(v, dtype=float)
+    kT_m, valid = _thermal(T, m, k_B)
+    x = np.maximum(v, 0.0) / np.sqrt(2 * kT_m)
+    F = erf(x) - 2 / np.sqrt(np.pi) * x * np.exp(-(x**2))
+    # T <= 0 は v = 0 に集中した分布とみなす
+    return np.where(valid, F, (v >= 0).astype(float))[()]
+
+
+def velocity_pdf_1d(v, T, m=M_RB87, k_B=K_B):
+    """1次元の速度成分分布 g(v) = sqrt(m / 2πk_BT) exp(-mv² / 2k_BT)"""
+    v = np.asarray(v, dtype=float)
+    kT_m, valid = _thermal(T, m, k_B)
+    g = np.exp(-(v**2) / (2 * kT_m)) / np.sqrt(2 * np.pi * kT_m)
+    return np.where(valid, g, 0.0)[()]
+
+
+def velocity_cdf_1d(v, T, m=M_RB87, k_B=K_B):
+    """1次元の速度成分分布の累積分布 G(v) = (1 + erf(v / sqrt(2) σ_v)) / 2"""
+    v = np.asarray(v, dtype=float)
+    kT_m, valid = _thermal(T, m, k_B)
+    G = 0.5 * (1 + erf(v / np.sqrt(2 * kT_m)))
+    return np.where(valid, G, (v >= 0).astype(float))[()]
+
+
+def peak_speed_pdf(T, m=M_RB87, k_B=K_B):
+    """3次元の速さ分布のピーク値 f(v_p)（グラフの正規化用）"""
+    return speed_pdf(most_probable_speed(T, m, k_B), T, m, k_B)
+
+
+def sample_velocities(rng, T, n, dims=3, m=M_RB87, k_B=K_B):
+    """温度 T の熱平衡分布から速度ベクトルを n 個サンプリングする（形状 (n, dims)）"""
+    return rng.normal(0.0, float(velocity_sigma(T, m, k_B)), size=(n, dims))
@@ -9,28 +9,17 @@ Maxwell-Boltzmann分布の温度比較アニメーション
 """
 
 from manim import *
-import numpy as np
+
+from mb_distribution import most_probable_speed, speed_pdf
 
 
 class TemperatureComparison(Scene):
     """⁸⁷Rbの100μK, 50μK, 5μKでの分布を重ね合わせ表示"""
 
     def construct(self):
-        # 物理定数
-        m_Rb87 = 87 * 1.66054e-27  # ⁸⁷Rbの質量 [kg]
-        k_B = 1.38065e-23  # ボルツマン定数 [J/K]
-
-        # 最確速度 v_p = sqrt(2 k_B T / m)
-        def most_probable_velocity(T):
-            return np.sqrt(2 * k_B * T / m_Rb87)
-
-        # Maxwell-Boltzmann分布（cm/s単位）
+        # Maxwell-Boltzmann分布（cm/s単位、配列でまとめて評価）
         def maxwell_boltzmann(v_cm, T):
-            v = v_cm / 100  # m/s に変換
-            if T <= 0 or v <= 0:
-                return 0
-            prefactor = 4 * np.pi * (m_Rb87 / (2 * np.pi * k_B * T)) ** 1.5
-            return prefactor * v**2 * np.exp(-m_Rb87 * v**2 / (2 * k_B * T))
+            return speed_pdf(v_cm / 100, T)  # m/s に変換
 
         # 3つの温度設定
         temperatures = [
@@ -41,7 +30,7 @@ class TemperatureComparison(Scene):
 
         # 軸の範囲は100μKに合わせる
         T_max = 100e-6
-        v_p_max = most_probable_velocity(T_max) * 100  # cm/s
+        v_p_max = most_probable_speed(T_max) * 100  # cm/s
         v_max = v_p_max * 4
 
         # 正規化用のピーク値（100μKで計算）
@@ -78,6 +67,7 @@ class TemperatureComparison(Scene):
             curve = axes.plot(
                 lambda v, T=T: maxwell_boltzmann(v, T) / peak_100uK,
                 x_range=[0.1, v_max],
+                use_vectorized=True,
                 color=color,
                 stroke_width=3,
             )
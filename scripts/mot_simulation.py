@@ -0,0 +1,162 @@
+"""
+⁸⁷Rb の3次元磁気光学トラップ（MOT）のシミュレーション
+
+LaserCoolingMC（3軸6本の光糖蜜）に原子の位置と四重極磁場を加えたもの。
+ビーム i（進行方向 k̂ᵢ）から見た原子の離調は
+    δᵢ = δ - k k̂ᵢ·v - (μ'/ħ) Gᵢ (k̂ᵢ·r)
+で、第3項が位置に比例するゼーマンシフト（Gᵢ は軸ごとの磁場勾配、z 軸は x, y の2倍）。
+偏光の組み合わせにより、中心から離れた原子ほど中心に向かうビームと共鳴しやすくなる。
+散乱による反跳（吸収と自然放出のランダムな向き）は LaserCoolingMC と同じく
+ランジュバン近似で加えるので、ドップラー限界程度の温度で釣り合う。
+速度を更新してから位置を進める（半陰的オイラー法）ことを、全原子の配列に対してまとめて行う
+
+記録間隔ごとに雲の半径（軸ごとの RMS）と温度、シーン用に一部の原子の位置のフレームを保存する
+
+使用例:
+    rng = np.random.default_rng(0)
+    sim = MOTSimulation(rng, n_atoms=10_000, temperature=1e-3, cloud_radius=2e-3)
+    history = sim.run(duration=20e-3, record_every=50, frame_atoms=5000)
+    history.radius          # (記録数, 3) [m]
+    history.temperature     # (記録数,) [K]
+    history.frame_at(0.5)   # 記録の途中を補間した位置 (5000, 3) [m]
+"""
+
+import numpy as np
+
+from laser_cooling_mc import MOLASSES_3D, LaserCoolingMC, scattering_rate
+from rb87_constants import HBAR, K_B, M_RB87, MU_B
+
+# 四重極磁場の軸ごとの勾配の比（∇·B = 0 より z 軸は x, y の2倍）
+QUADRUPOLE_AXES = np.array([1.0, 1.0, 2.0])
+
+
+class MOTHistory:
+    """MOT シミュレーションの記録
+
+    Attributes:
+        times: (K,) 記録時刻 [s]
+        radius: (K, 3) 軸ごとの RMS 半径 [m]
+        temperature: (K,) 温度 m<|v - v̄|²>/(3k_B) [K]
+        frames: (K, M, 3) 記録した原子の位置 [m]（M は frame_atoms）
+    """
+
+    def __init__(self, frame_indices):
+        self.frame_indices = frame_indices
+        self._records = []
+
+    def record(self, time, positions, velocities):
+        radius = positions.std(axis=0)
+        thermal = velocities - velocities.mean(axis=0)
+        temperature = M_RB87 * np.mean(np.sum(thermal**2, axis=1)) / (3 * K_B)
+        self._records.append((time, radius, temperature, positions[self.frame_indices].copy()))
+
+    def _column(self, i):
+        return np.array([record[i] for record in self._records])
+
+    @property
+    def times(self):
+        return self._column(0)
+
+    @property
+    def radius(self):
+        return self._column(1)
+
+    @property
+    def temperature(self):
+        return self._column(2)
+
+    @property
+    def frames(self):
+        return self._column(3)
+
+    def frame_at(self, alpha):
+        """記録全体を 0〜1 とした alpha での位置（前後のフレームを線形補間）"""
+        position = np.clip(alpha, 0, 1) * (len(self._records) - 1)
+        i = min(int(position), len(self._records) - 2)
+        weight = position - i
+        return (1 - weight) * self._records[i][3] + weight * self._records[i + 1][3]
+
+    def __len__(self):
+        return len(self._records)
+
+
+class MOTSimulation(LaserCoolingMC):
+    """6本のビームと四重極磁場による ⁸⁷Rb の MOT
+
+    Args:
+        rng: np.random.Generator
+        n_atoms: 原子数
+        temperature: 初期温度 [K]
+        cloud_radius: 初期位置の各軸の標準偏差 [m]
+        detuning: 離調 δ/Γ
+        saturation: 1本あたりの飽和パラメータ s₀
+        gradient: x, y 軸の磁場勾配 [T/m]（z 軸はその2倍、既定 0.1 T/m = 10 G/cm）
+        magnetic_moment: 実効磁気モーメント μ' [J/T]（既定: ボーア磁子）
+        positions, velocities: 初期状態 (N, 3) を直接与える場合
+        method: 吸収数のサンプリング方法（LaserCoolingMC と同じ）
+    """
+
+    def __init__(
+        self,
+        rng,
+        n_atoms=10_000,
+        temperature=1e-3,
+        cloud_radius=2e-3,
+        detuning=-1.0,
+        saturation=0.5,
+        gradient=0.1,
+        magnetic_moment=MU_B,
+        positions=None,
+        velocities=None,
+        method="langevin",
+    ):
+        super().__init__(
+            rng,
+            n_atoms=n_atoms,
+            temperature=temperature,
+            detuning=detuning,
+            saturation=saturation,
+            beams=MOLASSES_3D,
+            velocities=velocities,
+            method=method,
+        )
+        if positions is None:
+            positions = cloud_radius * rng.standard_normal((len(self.velocities), 3))
+        self.positions = np.array(positions, dtype=float)
+        # 位置 1 m あたりのゼーマンシフト [rad/s/m]（軸ごと）
+        self.zeeman = magnetic_moment * gradient / HBAR * QUADRUPOLE_AXES
+
+    def rates(self):
+        """(6, N) ビームごと・原子ごとの散乱率 [1/s]（ドップラー + ゼーマンシフト）"""
+        total = self.saturation * len(self.beams)
+        scaled = self.positions * self.zeeman
+        return np.stack([
+            scattering_rate(self.velocities, beam, self.detuning - scaled @ beam,
+                            self.saturation, total)
+            for beam in self.beams
+        ])
+
+    def step(self, dt):
+        """dt 秒だけ進める（散乱による速度変化のあとで位置を更新）"""
+        super().step(dt)
+        self.positions += self.velocities * dt
+        return self
+
+    def run(self, duration, dt=4e-6, record_every=50, frame_atoms=None):
+        """duration 秒のシミュレーションを行い、MOTHistory を返す
+
+        Args:
+            record_every: 何ステップごとに記録するか
+            frame_atoms: フレームに保存する原子数（既定: 全原子）
+        """
+        n = len(self.positions)
+        frame_indices = np.arange(n if frame_atoms is None else min(frame_atoms, n))
+        history = MOTHistory(frame_indices)
+        history.record(self.time, self.positions, self.velocities)
+
+        n_steps = int(round(duration / dt))
+        for i in range(1, n_steps + 1):
+            self.step(dt)
+            if i % record_every == 0 or i == n_steps:
+                history.record(self.time, self.positions, self.velocities)
+        return history
@@ -0,0 +1,190 @@
+"""
+1回のタイムライン評価から複数の画質の動画を書き出す（シングルパス・マルチ画質）
+
+レビュー用の -ql と最終版の -qh を別々にレンダリングすると、construct（Mobject の生成、
+updater、アニメーションの補間）を2回実行することになる。FanOut は最も高い画質で
+1回だけレンダリングしながら、manim がフレームを書き出すたび（CairoRenderer.add_frame）に、
+同じ時点のシーンの Mobject を追加の画質ごとのカメラでラスタライズして別の動画に書き込む。
+ジオメトリの計算はすべての出力で共有し、ラスタライズと書き込みだけを画質ごとに行う。
+
+フレームレートの低い出力は間引きで作る。主出力のフレーム i（時刻 i / fps_主）までに、
+時刻 k / fps_出力 が含まれる出力フレーム k をすべて書き出すので、60 fps から 15 fps なら
+4フレームに1回になる（割り切れないフレームレートでも時刻はずれない）。
+静止フレーム（wait）は1回だけラスタライズして必要な数だけ書き込む
+
+追加の出力は manim と同じ場所（media/videos/<モジュール>/<高さ>p<fps>/<シーン>.mp4）に
+1本の動画として書く（部分動画には分けない）。主出力の部分動画キャッシュがあると
+その区間のフレームが届かないので、使っているあいだは manim のキャッシュを無効にする。
+既定の Camera を使うシーン（scripts/ のすべてのシーン）が対象
+
+使用方法:
+    python scripts/render_all.py -q h --also l              # 1080p60 と 480p15 を1回のレンダリングで
+    python scripts/render_all.py -q h --also l m --only MOTAnimation
+
+使用例:
+    with tempconfig({"quality": "high_quality", "disable_caching": True}):
+        with FanOut(["l"]) as fanout:
+            MOTAnimation().render()
+    fanout.paths    # {"l": PosixPath(".../480p15/MOTAnimation.mp4")}
+"""
+
+import math
+from pathlib import Path
+
+from render_all import QUALITY_NAMES
+
+# manim の -q フラグ（低い順、フレームレートも単調に増える）
+QUALITY_ORDER = ("l", "m", "h", "p", "k")
+
+
+def primary_quality(flags):
+    """まとめてレンダリングするときに実際に描く（最も高い）画質"""
+    return max(flags, key=QUALITY_ORDER.index)
+
+
+def quality_settings(flag):
+    """(幅, 高さ, フレームレート)"""
+    from manim.constants import QUALITIES
+
+    quality = QUALITIES[QUALITY_NAMES[flag]]
+    return quality["pixel_width"], quality["pixel_height"], quality["frame_rate"]
+
+
+class FrameOutput:
+    """1つの画質の出力（専用のカメラと動画ファイル）
+
+    Args:
+        path: 書き出す動画のパス
+        width, height: 解像度
+        frame_rate: フレームレート
+    """
+
+    def __init__(self, path, width, height, frame_rate):
+        self.path = Path(path)
+        self.width = width
+        self.height = height
+        self.frame_rate = frame_rate
+        self.frames = 0
+        self.camera = None
+        self._container = None
+        self._stream = None
+
+    def open(self):
+        try:
+            import av
+        except ImportError as exc:
+            raise RuntimeError("マルチ画質の出力には PyAV（manim の依存パッケージ）が必要です") from exc
+        from manim.camera.camera import Camera
+
+        self.camera = Camera(pixel_width=self.width, pixel_height=self.height,
+                             frame_rate=self.frame_rate)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._container = av.open(str(self.path), mode="w")
+        self._stream = self._container.add_stream("libx264", rate=self.frame_rate)
+        self._stream.width = self.width
+        self._stream.height = self.height
+        self._stream.pix_fmt = "yuv420p"
+        return self
+
+    def write(self, mobjects, count=1):
+        """mobjects をこの解像度でラスタライズし、count フレーム分書き込む"""
+        import av
+
+        self.camera.reset()
+        self.camera.capture_mobjects(mobjects)
+        frame = av.VideoFrame.from_ndarray(self.camera.pixel_array, format="rgba")
+        for _ in range(count):
+            for packet in self._stream.encode(frame):
+                self._container.mux(packet)
+        self.frames += count
+
+    def close(self):
+        if self._container is None:
+            return
+        for packet in self._stream.encode():
+            self._container.mux(packet)
+        self._container.close()
+        self._container = None
+
+    def due(self, primary_frames, primary_rate):
+        """主出力が primary_frames フレーム進んだ時点で書き出しているべきフレーム数"""
+        return math.ceil(primary_frames * self.frame_rate / primary_rate - 1e-9)
+
+
+class FanOut:
+    """レンダリング中のフレームを追加の画質に配る（with 文のあいだだけ有効）
+
+    tempconfig で主出力の画質を設定した内側で使う
+
+    Args:
+        flags: 追加する画質の -q フラグ（主出力よりフレームレートが高いものは不可）
+    """
+
+    def __init__(self, flags):
+        self.flags = list(flags)
+        self.outputs = {}
+        self.primary_frames = 0
+        self._scene = None
+        self._patches = []
+
+    @property
+    def paths(self):
+        return {flag: output.path for flag, output in self.outputs.items()}
+
+    def _open_outputs(self, renderer):
+        primary = Path(renderer.file_writer.movie_file_path)
+        primary_rate = renderer.camera.frame_rate
+        for flag in self.flags:
+            width, height, rate = quality_settings(flag)
+            if rate > primary_rate:
+                raise ValueError(f"-q{flag} ({rate} fps) は主出力 ({primary_rate} fps) より高いフレームレートです")
+            path = primary.parent.parent / f"{height}p{rate}" / primary.name
+            self.outputs[flag] = FrameOutput(path, width, height, rate).open()
+
+    def _mobjects(self):
+        from manim.utils.iterables import list_update
+
+        scene = self._scene
+        return list_update(scene.mobjects, scene.foreground_mobjects)
+
+    def __enter__(self):
+        from manim.renderer.cairo_renderer import CairoRenderer
+
+        fanout = self
+        original_update_frame = CairoRenderer.update_frame
+        original_add_frame = CairoRenderer.add_frame
+
+        def update_frame(renderer, scene, *args, **kwargs):
+            fanout._scene = scene
+            return original_update_frame(renderer, scene, *args, **kwargs)
+
+        def add_frame(renderer, frame, num_frames=1):
+            original_add_frame(renderer, frame, num_frames)
+            # 飛ばしている区間（-n やセクションの省略）は主出力にも書かれない
+            if fanout._scene is None or renderer.skip_animations:
+                return
+            if not fanout.outputs:
+                fanout._open_outputs(renderer)
+            fanout.primary_frames += num_frames
+            mobjects = None
+            for output in fanout.outputs.values():
+                count = output.due(fanout.primary_frames, renderer.camera.frame_rate) - output.frames
+                if count > 0:
+                    mobjects = mobjects if mobjects is not None else fanout._mobjects()
+                    output.write(mobjects, count)
+
+        self._patches = [
+            (CairoRenderer, "update_frame", original_update_frame),
+            (CairoRenderer, "add_frame", original_add_frame),
+        ]
+        CairoRenderer.update_frame = update_frame
+        CairoRenderer.add_frame = add_frame
+        return self
+
+    def __exit__(self, *exc_info):
+        for owner, attr, original in reversed(self._patches):
+            setattr(owner, attr, original)
+        self._patches.clear()
+        for output in self.outputs.values():
+            output.close()
+        return False
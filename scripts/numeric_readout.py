@@ -0,0 +1,195 @@
+"""
+グリフをキャッシュした数値ラベル部品
+
+always_redraw で毎フレーム Text / MathTex を作り直すと、そのたびに
+Pango（または LaTeX）と SVG の解析が走る。NumericReadout は数字・符号・小数点と
+前後の文字列（"T = " や " μK" など）を最初に1度だけ生成してキャッシュし、
+値が変わったときはキャッシュしたグリフのコピーを並べ直すだけで表示を更新する
+
+使用例:
+    T_label = NumericReadout(
+        get_current_T() * 1e6, prefix="T = ", suffix=" μK",
+        num_decimal_places=1, font_size=36, align_edge=RIGHT,
+    ).to_corner(UR)
+    T_label.track(lambda: get_current_T() * 1e6, color=lambda: get_color())
+"""
+
+from manim import *
+import numpy as np
+
+# 数値部分に使う文字
+GLYPH_CHARS = "0123456789.-+"
+
+# 拡大率を測るための基準点の間隔（境界ボックスにほぼ影響しない長さ）
+UNIT_LENGTH = 0.01
+
+# (tex, font_size, font) -> {文字: (グリフ, 中心のベースラインからの高さ, 幅)}
+_glyph_cache = {}
+# (tex, font_size, font) -> (数字セルの幅, 文字間隔)
+_metrics_cache = {}
+# (tex, font_size, font, 文字列, 前置/後置) -> 基準点を原点に置いた VGroup
+_affix_cache = {}
+
+
+def _render(string, tex, font_size, font):
+    """文字列をグリフ単位のサブモブジェクトを持つ VGroup として生成する"""
+    if tex:
+        return VGroup(*MathTex(string, font_size=font_size)[0])
+    return VGroup(*Text(string, font_size=font_size, font=font))
+
+
+def _glyph_set(tex, font_size, font):
+    """数字・符号・小数点のグリフと寸法（初回のみ生成）"""
+    key = (tex, font_size, font)
+    if key not in _glyph_cache:
+        glyphs = _render(GLYPH_CHARS, tex, font_size, font)
+        baseline = glyphs[0].get_bottom()[1]
+        _glyph_cache[key] = {
+            char: (glyph, glyph.get_center()[1] - baseline, glyph.width)
+            for char, glyph in zip(GLYPH_CHARS, glyphs)
+        }
+
+        # 数字は等幅セルに並べる（桁が変わっても表示が揺れないように）
+        digits = glyphs[:10]
+        gaps = [digits[i + 1].get_left()[0] - digits[i].get_right()[0] for i in range(9)]
+        digit_width = max(d.width for d in digits)
+        _metrics_cache[key] = (digit_width, float(np.median(gaps)))
+    return _glyph_cache[key], _metrics_cache[key]
+
+
+def _affix(string, tex, font_size, font, is_prefix):
+    """前置・後置の文字列を数字 "0" と一緒に生成し、数字との相対位置ごと保持する
+
+    前置は "0" の左端・ベースライン、後置は "0" の右端・ベースラインを原点にする。
+    空白を含む文字列でも、元の f-string と同じ間隔とベースラインで並ぶ。
+    """
+    key = (tex, font_size, font, string, is_prefix)
+    if key not in _affix_cache:
+        if is_prefix:
+            parts = _render(string + "0", tex, font_size, font)
+            zero, body = parts[-1], parts[:-1]
+            origin = np.array([zero.get_left()[0], zero.get_bottom()[1], 0])
+        else:
+            parts = _render("0" + string, tex, font_size, font)
+            zero, body = parts[0], parts[1:]
+            origin = np.array([zero.get_right()[0], zero.get_bottom()[1], 0])
+        _affix_cache[key] = VGroup(*body).shift(-origin)
+    return _affix_cache[key]
+
+
+class NumericReadout(VGroup):
+    """キャッシュしたグリフを並べて作る数値ラベル
+
+    Args:
+        value: 初期値
+        prefix: 数値の前に付ける文字列（例: "T = "）
+        suffix: 数値の後に付ける文字列（例: " μK"）
+        num_decimal_places: 小数点以下の桁数
+        font_size: フォントサイズ
+        color: 文字色
+        tex: True なら MathTex、False なら Text でグリフを作る
+        font: Text のフォント名
+        align_edge: 値が変わって幅が変化したときに固定する端（LEFT / RIGHT / ORIGIN）
+    """
+
+    def __init__(
+        self,
+        value=0.0,
+        prefix="",
+        suffix="",
+        num_decimal_places=1,
+        font_size=DEFAULT_FONT_SIZE,
+        color=WHITE,
+        tex=False,
+        font="",
+        align_edge=LEFT,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.prefix = prefix
+        self.suffix = suffix
+        self.num_decimal_places = num_decimal_places
+        self.font_size_key = font_size
+        self.tex = tex
+        self.font = font
+        self.align_edge = align_edge
+        self.readout_color = color
+        self.value = value
+        self.displayed = None
+
+        # 位置と拡大率を追跡するための不可視の基準点（グループと一緒に移動・拡大される）
+        self.anchor = VectorizedPoint(ORIGIN)
+        self.unit = VectorizedPoint(RIGHT * UNIT_LENGTH)
+        self.glyphs = VGroup()
+        self.add(self.glyphs, self.anchor, self.unit)
+
+        self.set_value(value)
+
+    def format_value(self, value):
+        return f"{value:.{self.num_decimal_places}f}"
+
+    def set_value(self, value):
+        """値を更新する（表示文字列が変わらなければ何もしない）"""
+        self.value = value
+        text = self.format_value(value)
+        if text == self.displayed:
+            return self
+        self.displayed = text
+        self._layout(text)
+        return self
+
+    def get_value(self):
+        return self.value
+
+    def set_readout_color(self, color):
+        """文字色を変更する（グリフの作り直しはしない）"""
+        self.readout_color = color
+        self.glyphs.set_color(color)
+        return self
+
+    def track(self, get_value, color=None):
+        """毎フレーム get_value() の値を表示する updater を追加する
+
+        color に関数を渡すと、文字色も毎フレーム更新する。
+        """
+
+        def updater(mob):
+            mob.set_value(get_value())
+            if color is not None:
+                mob.set_readout_color(color())
+
+        self.add_updater(updater)
+        return self
+
+    def _layout(self, text):
+        glyph_set, (digit_width, gap) = _glyph_set(self.tex, self.font_size_key, self.font)
+
+        # ローカル座標（数値の左端・ベースラインが原点）でグリフを並べる
+        pieces = []
+        x = 0.0
+        for char in text:
+            glyph, dy, width = glyph_set[char]
+            cell = digit_width if char.isdigit() else width
+            pieces.append(glyph.copy().move_to([x + cell / 2, dy, 0]))
+            x += cell + gap
+        number_end = x - gap
+
+        prefix = _affix(self.prefix, self.tex, self.font_size_key, self.font, True)
+        suffix = _affix(self.suffix, self.tex, self.font_size_key, self.font, False)
+        if len(prefix):
+            pieces.insert(0, prefix.copy())
+        if len(suffix):
+            pieces.append(suffix.copy().shift(number_end * RIGHT))
+
+        new_glyphs = VGroup(*pieces)
+        left = new_glyphs.get_left()[0]
+        right = new_glyphs.get_right()[0]
+        reference_x = {-1: left, 0: (left + right) / 2, 1: right}[int(np.sign(self.align_edge[0]))]
+
+        # 基準点に合わせて配置（グループが拡大縮小されていればそれも反映）
+        anchor = self.anchor.get_center()
+        scale = np.linalg.norm(self.unit.get_center() - anchor) / UNIT_LENGTH
+        new_glyphs.shift(-reference_x * RIGHT)
+        new_glyphs.scale(scale, about_point=ORIGIN).shift(anchor)
+        new_glyphs.set_color(self.readout_color)
+        self.glyphs.submobjects = list(new_glyphs.submobjects)
@@ -12,6 +12,12 @@
 from manim import *
 import numpy as np
 
+from fringe_contrast import superpose
+from frame_archive import cached_archive
+from particle_box import ParticleBox
+from point_cloud import PointCloud
+from scene_rng import base_seed, scene_rng
+
 
 class ParticleWaveInterference(Scene):
     """熱い原子のバラバラな運動と波動の重ね合わせ"""
@@ -39,17 +45,17 @@ class ParticleWaveInterference(Scene):
         particles = []
         velocities = []
 
-        np.random.seed(42)
+        rng = scene_rng(self)
         for i in range(num_particles):
             # ランダムな位置
             pos = box_left.get_center() + np.array([
-                np.random.uniform(-1.2, 1.2),
-                np.random.uniform(-1.2, 1.2),
+                rng.uniform(-1.2, 1.2),
+                rng.uniform(-1.2, 1.2),
                 0
             ])
             # ランダムな速度（方向と大きさ）
-            speed = np.random.uniform(0.3, 1.5)
-            angle = np.random.uniform(0, 2 * np.pi)
+            speed = rng.uniform(0.3, 1.5)
+            angle = rng.uniform(0, 2 * np.pi)
             vel = np.array([speed * np.cos(angle), speed * np.sin(angle), 0])
 
             particle = Dot(pos, radius=0.08, color=PARTICLE_COLORS[i % len(PARTICLE_COLORS)])
@@ -122,18 +128,15 @@ class ParticleWaveInterference(Scene):
         # 波を重ね合わせた結果（ぼやけた波形）
         self.play(FadeOut(waves))
 
-        # 重ね合わせ結果（複雑で不規則な波形）
-        def superposed_wave(x):
-            result = 0
-            for i in range(num_particles):
-                speed = np.linalg.norm(velocities[i])
-                wavelength = 0.8 / speed
-                result += 0.1 * np.sin(2 * np.pi * x / wavelength + i * 0.5)
-            return result
-
-        superposed = FunctionGraph(
-            superposed_wave,
-            x_range=wave_x_range,
+        # 重ね合わせ結果（複雑で不規則な波形）: 全粒子の波を (粒子数 × x) で一括評価
+        speeds = np.linalg.norm(velocities, axis=1)
+        wavenumbers = 2 * np.pi * speeds / 0.8  # λ = 0.8 / v
+        wave_phases = 0.5 * np.arange(num_particles)
+
+        superposed = ParametricFunction(
+            lambda x: (x, superpose(x, wavenumbers, wave_phases, amplitudes=0.1), 0),
+            t_range=wave_x_range,
+            use_vectorized=True,
             color=GRAY,
             stroke_width=3,
         )
@@ -168,29 +171,14 @@ class ParticleMotionAnimation(Scene):
 
         self.play(Create(box))
 
-        # 粒子を生成
-        num_particles = 8
-        particles = []
-        velocities = []
-        positions = []
-
-        np.random.seed(42)
-        for i in range(num_particles):
-            pos = np.array([
-                np.random.uniform(-2, 2),
-                np.random.uniform(-2, 2),
-                0
-            ])
-            speed = np.random.uniform(1, 4)
-            angle = np.random.uniform(0, 2 * np.pi)
-            vel = np.array([speed * np.cos(angle), speed * np.sin(angle), 0])
-
-            particle = Dot(pos, radius=0.12, color=PARTICLE_COLORS[i % len(PARTICLE_COLORS)])
-            particles.append(particle)
-            velocities.append(vel)
-            positions.append(pos)
-
-        particles_group = VGroup(*particles)
+        # 粒子を生成（位置・速度は (N, 3) 配列でまとめて管理）
+        num_particles = 400
+        rng = scene_rng(self)
+        gas = ParticleBox.random(
+            rng, num_particles, center=ORIGIN, half_size=2.3,
+            speed_range=(1, 4), start_half_size=2,
+        )
+        particles_group = PointCloud(gas.positions, radius=0.05, colors=PARTICLE_COLORS)
         self.play(FadeIn(particles_group))
 
         # 説明
@@ -202,26 +190,9 @@ class ParticleMotionAnimation(Scene):
         self.play(Write(explanation))
 
         # 粒子を動かす（壁で反射）
-        dt = 1 / 15  # フレームレート
         duration = 4  # 秒
 
-        def update_particles(mob, dt_frame):
-            nonlocal positions, velocities
-            for i, particle in enumerate(particles):
-                # 位置更新
-                positions[i] = positions[i] + velocities[i] * dt
-
-                # 壁との衝突判定
-                if abs(positions[i][0]) > 2.3:
-                    velocities[i][0] *= -1
-                    positions[i][0] = np.clip(positions[i][0], -2.3, 2.3)
-                if abs(positions[i][1]) > 2.3:
-                    velocities[i][1] *= -1
-                    positions[i][1] = np.clip(positions[i][1], -2.3, 2.3)
-
-                particle.move_to(positions[i])
-
-        particles_group.add_updater(update_particles)
+        update_particles = gas.drive(particles_group)
         self.wait(duration)
         particles_group.remove_updater(update_particles)
 
@@ -262,50 +233,40 @@ class HotVsColdParticles(Scene):
             Create(cold_box), Write(cold_label),
         )
 
-        # 高温の粒子（速い、バラバラ）
-        np.random.seed(42)
-        hot_particles = []
-        hot_velocities = []
-        hot_positions = []
-
-        for i in range(6):
-            pos = hot_box.get_center() + np.array([
-                np.random.uniform(-1.2, 1.2),
-                np.random.uniform(-1.2, 1.2),
-                0
-            ])
-            speed = np.random.uniform(2, 5)
-            angle = np.random.uniform(0, 2 * np.pi)
-            vel = np.array([speed * np.cos(angle), speed * np.sin(angle), 0])
-
-            particle = Dot(pos, radius=0.1, color=HOT_COLOR)
-            hot_particles.append(particle)
-            hot_velocities.append(vel)
-            hot_positions.append(pos.copy())
-
-        hot_group = VGroup(*hot_particles)
-
-        # 低温の粒子（遅い、揃っている）
-        cold_particles = []
-        cold_velocities = []
-        cold_positions = []
-
-        for i in range(6):
-            pos = cold_box.get_center() + np.array([
-                np.random.uniform(-1.2, 1.2),
-                np.random.uniform(-1.2, 1.2),
-                0
-            ])
-            speed = np.random.uniform(0.3, 0.8)
-            angle = np.random.uniform(0, 2 * np.pi)
-            vel = np.array([speed * np.cos(angle), speed * np.sin(angle), 0])
-
-            particle = Dot(pos, radius=0.1, color=COLD_COLOR)
-            cold_particles.append(particle)
-            cold_velocities.append(vel)
-            cold_positions.append(pos.copy())
+        num_particles = 150
+        box_half = 1.3
+        motion_time = 3.0
+
+        # 粒子の軌道は固定の刻みで1度だけ計算してアーカイブに保存し、どの画質でも再利用する
+        params = {
+            "seed": base_seed(),
+            "num_particles": num_particles,
+            "box_half": box_half,
+            "hot_center": hot_box.get_center().tolist(),
+            "cold_center": cold_box.get_center().tolist(),
+            "duration": motion_time,
+            "frame_rate": 120,
+        }
+
+        def simulate():
+            rng = scene_rng(self)
+            # 高温の粒子（速い、バラバラ）
+            hot_gas = ParticleBox.random(
+                rng, num_particles, center=hot_box.get_center(), half_size=box_half,
+                speed_range=(2, 5), start_half_size=1.2,
+            )
+            # 低温の粒子（遅い、揃っている）
+            cold_gas = ParticleBox.random(
+                rng, num_particles, center=cold_box.get_center(), half_size=box_half,
+                speed_range=(0.3, 0.8), start_half_size=1.2,
+            )
+            times, hot_frames = hot_gas.simulate(motion_time, params["frame_rate"])
+            _, cold_frames = cold_gas.simulate(motion_time, params["frame_rate"])
+            return {"times": times, "hot": hot_frames, "cold": cold_frames}
 
-        cold_group = VGroup(*cold_particles)
+        archive = cached_archive(type(self).__name__, params, simulate)
+        hot_group = PointCloud(archive.frame(0, "hot"), radius=0.05, colors=HOT_COLOR)
+        cold_group = PointCloud(archive.frame(0, "cold"), radius=0.05, colors=COLD_COLOR)
 
         self.play(FadeIn(hot_group), FadeIn(cold_group))
 
@@ -318,42 +279,11 @@ class HotVsColdParticles(Scene):
 
         self.play(Write(hot_desc), Write(cold_desc))
 
-        # 粒子を動かす
-        dt = 1 / 15
-        box_half = 1.3
-
-        def update_hot(mob, dt_frame):
-            for i, particle in enumerate(hot_particles):
-                hot_positions[i] = hot_positions[i] + hot_velocities[i] * dt
-                center = hot_box.get_center()
-
-                if abs(hot_positions[i][0] - center[0]) > box_half:
-                    hot_velocities[i][0] *= -1
-                if abs(hot_positions[i][1] - center[1]) > box_half:
-                    hot_velocities[i][1] *= -1
-
-                hot_positions[i][0] = np.clip(hot_positions[i][0], center[0] - box_half, center[0] + box_half)
-                hot_positions[i][1] = np.clip(hot_positions[i][1], center[1] - box_half, center[1] + box_half)
-                particle.move_to(hot_positions[i])
+        # 粒子を動かす（アーカイブしたフレームを経過時間で再生）
+        update_hot = archive.drive(hot_group, "hot")
+        update_cold = archive.drive(cold_group, "cold")
 
-        def update_cold(mob, dt_frame):
-            for i, particle in enumerate(cold_particles):
-                cold_positions[i] = cold_positions[i] + cold_velocities[i] * dt
-                center = cold_box.get_center()
-
-                if abs(cold_positions[i][0] - center[0]) > box_half:
-                    cold_velocities[i][0] *= -1
-                if abs(cold_positions[i][1] - center[1]) > box_half:
-                    cold_velocities[i][1] *= -1
-
-                cold_positions[i][0] = np.clip(cold_positions[i][0], center[0] - box_half, center[0] + box_half)
-                cold_positions[i][1] = np.clip(cold_positions[i][1], center[1] - box_half, center[1] + box_half)
-                particle.move_to(cold_positions[i])
-
-        hot_group.add_updater(update_hot)
-        cold_group.add_updater(update_cold)
-
-        self.wait(3)
+        self.wait(motion_time)
 
         hot_group.remove_updater(update_hot)
         cold_group.remove_updater(update_cold)
@@ -444,13 +374,13 @@ class WaveSuperposition(Scene):
         self.play(Create(incoherent_waves))
 
         # 重ね合わせ結果（打ち消し合って不規則）
-        def messy_wave(x):
-            return sum(0.2 * np.sin(2 * np.pi * x / wl + i * 0.5)
-                       for i, wl in enumerate(wavelengths))
+        wavenumbers = 2 * np.pi / np.array(wavelengths)
+        wave_phases = 0.5 * np.arange(len(wavelengths))
 
-        incoherent_sum = FunctionGraph(
-            messy_wave,
-            x_range=[-2.5, 2.5],
+        incoherent_sum = ParametricFunction(
+            lambda x: (x, superpose(x, wavenumbers, wave_phases, amplitudes=0.2), 0),
+            t_range=[-2.5, 2.5],
+            use_vectorized=True,
             color=GRAY,
             stroke_width=4,
         )
@@ -0,0 +1,151 @@
+"""
+配列で位置・色・半径を管理する点群モブジェクト
+
+原子1個ごとに Dot を作ると、モブジェクト数に比例して updater・描画・
+アニメーションのコストが増える。PointCloud は (N, 3) の位置配列と
+点ごとの色 (N, 3)・半径 (N,) の配列を持ち、同じ色の点の円を1つの VMobject の
+サブパスとしてまとめて書き込む。描画は色の数だけの塗りつぶしで済むので、
+10⁴〜10⁵ 個の原子でも -qh でレンダリングできる
+
+使用例:
+    cloud = PointCloud(positions, radius=0.05, colors=[RED, BLUE])
+    cloud.set_positions(new_positions)      # (N, 3) をその場で書き込む
+    self.play(cloud.interpolate_to(positions * 0.5))  # 点の大きさを変えずに移動
+
+    # 連続的な色は color_levels 段階に量子化して層にまとめる
+    cloud = PointCloud(positions, radius=radii, colors=rgb_array, color_levels=16)
+
+注意:
+    set_colors() は層を作り直すので、このモブジェクト自身のアニメーション中ではなく
+    updater かアニメーションの合間に呼ぶこと。
+"""
+
+from manim import *
+import numpy as np
+
+# 4本の3次ベジェで近似した単位円（1/4円弧の制御点の係数）
+_KAPPA = 4 / 3 * (np.sqrt(2) - 1)
+
+
+def _unit_circle_points():
+    """単位円を4本の3次ベジェで表した制御点 (16, 3)"""
+    corners = [RIGHT, UP, LEFT, DOWN, RIGHT]
+    points = []
+    for start, end in zip(corners[:-1], corners[1:]):
+        points.extend([start, start + _KAPPA * end, end + _KAPPA * start, end])
+    return np.array(points, dtype=float)
+
+
+UNIT_CIRCLE = _unit_circle_points()
+
+
+def color_array(colors, n):
+    """色指定を (n, 3) の RGB 配列に変換する
+
+    colors: 1色、色のリスト（n より短ければ繰り返す）、または (n, 3) / (n, 4) の配列
+    """
+    if isinstance(colors, np.ndarray) and colors.ndim == 2:
+        if len(colors) != n:
+            raise ValueError(f"colors has {len(colors)} rows, expected {n}")
+        return colors[:, :3].astype(float)
+    palette = colors if isinstance(colors, (list, tuple)) else [colors]
+    rgbs = np.array([ManimColor(color).to_rgb() for color in palette])
+    return rgbs[np.arange(n) % len(palette)]
+
+
+class _DotLayer(VMobject):
+    """同じ色の点をまとめて1つのパスとして描く層"""
+
+    def __init__(self, indices, color, opacity=1.0, **kwargs):
+        super().__init__(fill_color=color, fill_opacity=opacity, stroke_width=0, **kwargs)
+        self.indices = indices
+
+    def write_points(self, positions, radii):
+        n_curve_points = len(UNIT_CIRCLE)
+        n_points = len(self.indices) * n_curve_points
+        if self.points.shape != (n_points, 3):
+            # FadeIn などで点列が置き換えられた後は確保し直す
+            self.points = np.zeros((n_points, 3))
+        circles = self.points.reshape(len(self.indices), n_curve_points, 3)
+        np.multiply(radii[self.indices, None, None], UNIT_CIRCLE, out=circles)
+        circles += positions[self.indices, None, :]
+
+
+class PointCloud(VGroup):
+    """(N, 3) の位置配列で表す点の集まり
+
+    Args:
+        positions: (N, 3) の位置配列（シーン座標）
+        radius: 全点共通の半径、または点ごとの半径 (N,)
+        colors: 1色、色のリスト（N より短ければ繰り返して割り当てる）、
+            または点ごとの RGB 配列 (N, 3)
+        color_levels: 色を各チャンネル何段階に量子化して層にまとめるか
+            （None なら 8bit の色が同じ点だけをまとめる）
+    """
+
+    def __init__(self, positions, radius=0.05, colors=WHITE, color_levels=None, **kwargs):
+        super().__init__(**kwargs)
+        self.positions = np.array(positions, dtype=float)
+        n = len(self.positions)
+        self.radii = np.broadcast_to(np.asarray(radius, dtype=float), (n,)).copy()
+        self.color_levels = color_levels
+        self.rgbs = color_array(colors, n)
+
+        self._build_layers()
+        self.set_positions(self.positions)
+
+    @property
+    def num_points(self):
+        return len(self.positions)
+
+    def _build_layers(self):
+        """色ごとに点を振り分けて層を作り直す（描画は層の数だけ）"""
+        levels = (self.color_levels or 256) - 1
+        keys = np.round(self.rgbs * levels).astype(int)
+        unique, inverse = np.unique(keys, axis=0, return_inverse=True)
+        inverse = inverse.ravel()
+
+        opacity = self.submobjects[0].get_fill_opacity() if self.submobjects else 1.0
+        order = np.argsort(inverse, kind="stable")
+        bounds = np.cumsum(np.bincount(inverse, minlength=len(unique)))[:-1]
+        layers = [
+            _DotLayer(indices, ManimColor.from_rgb(rgb / levels), opacity)
+            for rgb, indices in zip(unique, np.split(order, bounds))
+        ]
+        self.remove(*self.submobjects)
+        self.add(*layers)
+
+    def set_positions(self, positions):
+        """全点の位置を書き換える（配列はコピーして保持する）"""
+        self.positions[:] = positions
+        for layer in self.submobjects:
+            layer.write_points(self.positions, self.radii)
+        return self
+
+    def get_positions(self):
+        return self.positions
+
+    def set_radii(self, radii):
+        """点ごとの半径 (N,)（またはスカラー）を変更する"""
+        self.radii[:] = radii
+        return self.set_positions(self.positions)
+
+    def set_colors(self, colors):
+        """点ごとの色を変更し、色ごとの層を作り直す"""
+        self.rgbs = color_array(colors, self.num_points)
+        self._build_layers()
+        return self.set_positions(self.positions)
+
+    def interpolate_to(self, target_positions, **kwargs):
+        """点の大きさを保ったまま target_positions へ移動するアニメーション
+
+        animate.scale() などと違い、点の半径は変わらない。
+        """
+        start = self.positions.copy()
+        target = np.array(target_positions, dtype=float)
+        delta = target - start
+
+        def update(mob, alpha):
+            mob.set_positions(start + alpha * delta)
+
+        return UpdateFromAlphaFunc(self, update, **kwargs)
@@ -8,11 +8,138 @@ MEMSと原子干渉計の精度比較アニメーション
 使用方法:
     manim -pql precision_comparison_animation.py PrecisionComparison
     manim -pqh precision_comparison_animation.py PrecisionComparison  # 高画質
+    manim -pql precision_comparison_animation.py AllanDeviationComparison
 """
 
+from dataclasses import asdict
+
 from manim import *
 import numpy as np
 
+import ins_error
+from allan_deviation import model_adev, overlapping_adev
+from frame_archive import cache_dir_from_env, cached_archive
+from ins_error import (
+    ATOM_SPEC,
+    MEMS_SPEC,
+    cached_position_error,
+    error_envelope,
+    simulate_acceleration,
+)
+from render_manifest import module_digest
+from scene_rng import base_seed, scene_rng
+
+FLIGHT_HOURS = 10
+ERROR_RATE = 100.0
+ERROR_RUNS = 64
+# アラン偏差の計算に使う時系列（100 Hz × 3時間 ≈ 10⁶ サンプル）
+ADEV_HOURS = 3
+
+
+def simulate_flight_error(scene, spec, hours=FLIGHT_HOURS, rate=ERROR_RATE, runs=ERROR_RUNS):
+    """hours 時間の飛行での位置誤差をモンテカルロで計算する
+
+    結果は frame_archive と同じ sim_cache にメモリマップ可能な .npy として保存され、
+    2回目以降のレンダリングではファイルを開くだけになる（ins_error のコードを変えたら再計算）
+
+    Returns:
+        (時刻 [時間], 符号付き δx の包絡線 [m]（error_envelope の辞書）)
+    """
+    runs = cached_position_error(
+        spec,
+        f"{type(scene).__name__}/{spec.name}/{base_seed()}",
+        duration=hours * 3600,
+        cache_dir=cache_dir_from_env(),
+        code=module_digest(ins_error.__file__),
+        rng=scene_rng(scene, spec.name),
+        rate=rate,
+        runs=runs,
+    )
+    return runs.times / 3600, error_envelope(runs.positions, absolute=False)
+
+
+def power_of_ten_tex(value):
+    """値を最も近い10のべき乗の LaTeX（例: 1e-5 → 10^{-5}）にする"""
+    return rf"10^{{{int(np.round(np.log10(value)))}}}"
+
+
+def simulate_adev(scene, spec, hours=ADEV_HOURS, rate=ERROR_RATE):
+    """加速度誤差の時系列をシミュレートし、(taus, adev) を返す
+
+    結果は sim_cache にアーカイブし、2回目以降（別の画質を含む）は読み込むだけになる
+    """
+    params = {"spec": asdict(spec), "seed": base_seed(), "hours": hours, "rate": rate}
+
+    def compute():
+        accel = simulate_acceleration(spec, scene_rng(scene, f"adev/{spec.name}"), hours * 3600, rate)
+        taus, adev = overlapping_adev(accel, rate)
+        return {"taus": taus, "adev": adev}
+
+    archive = cached_archive(f"{type(scene).__name__}-{spec.name}", params, compute,
+                             frame_axis="taus")
+    return np.asarray(archive["taus"]), np.asarray(archive["adev"])
+
+
+class AllanDeviationGraph(VGroup):
+    """両対数軸のアラン偏差グラフ
+
+    軸は log10 の値で線形に取り、目盛りに 10^k のラベルを付ける。
+    曲線は事前に計算した (taus, adev) の配列から折れ線で描く
+
+    使用例:
+        graph = AllanDeviationGraph(x_range=(-2, 4), y_range=(-11, -2))
+        line = graph.add_curve(taus, adev, color=RED)
+        model = graph.add_curve(taus, model_adev(spec, taus), color=RED, dashed=True)
+        self.play(Create(graph.axes), Create(line))
+    """
+
+    def __init__(self, x_range=(-2, 4), y_range=(-11, -2), x_length=8, y_length=4.5, **kwargs):
+        super().__init__(**kwargs)
+        self.axes = Axes(
+            x_range=[*x_range, 1],
+            y_range=[*y_range, 1],
+            x_length=x_length,
+            y_length=y_length,
+            axis_config={"include_tip": False},
+        )
+        self.axes.x_axis.add_labels({
+            k: MathTex(f"10^{{{k}}}", font_size=22) for k in range(x_range[0], x_range[1] + 1)
+        })
+        self.axes.y_axis.add_labels({
+            k: MathTex(f"10^{{{k}}}", font_size=22)
+            for k in range(y_range[0], y_range[1] + 1, 2)
+        })
+        self.curves = VGroup()
+        self.add(self.axes, self.curves)
+
+    def point(self, tau, adev):
+        return self.axes.c2p(np.log10(tau), np.log10(adev))
+
+    def add_curve(self, taus, adev, color=WHITE, dashed=False, stroke_width=3):
+        """(taus, adev) の折れ線を追加して返す（軸の範囲外の点は除く）"""
+        x_min, x_max = self.axes.x_range[:2]
+        y_min, y_max = self.axes.y_range[:2]
+        log_tau = np.log10(taus)
+        log_adev = np.log10(adev)
+        inside = (log_tau >= x_min) & (log_tau <= x_max) & (log_adev >= y_min) & (log_adev <= y_max)
+        curve = VMobject(color=color, stroke_width=stroke_width)
+        curve.set_points_as_corners([
+            self.axes.c2p(x, y) for x, y in zip(log_tau[inside], log_adev[inside])
+        ])
+        if dashed:
+            curve = DashedVMobject(curve, num_dashes=40)
+        self.curves.add(curve)
+        return curve
+
+
+def format_distance(meters):
+    """距離を km / m / cm の読みやすい単位の文字列にする"""
+    if meters >= 1e3:
+        return f"{meters / 1e3:.1f} km"
+    if meters >= 1:
+        return f"{meters:.1f} m"
+    return f"{meters * 100:.0f} cm"
+
 
 class PrecisionComparison(Scene):
     """MEMSと原子干渉計の精度差を視覚的に比較"""
@@ -220,7 +347,7 @@ class PrecisionErrorGrowth(Scene):
         # 軸の設定
         axes = Axes(
             x_range=[0, 10.5, 2],
-            y_range=[0, 7, 1],
+            y_range=[0, 8, 1],
             x_length=8,
             y_length=4,
             axis_config={"include_tip": True, "tip_length": 0.2},
@@ -233,44 +360,59 @@ class PrecisionErrorGrowth(Scene):
 
         self.play(Create(axes), Write(x_label), Write(y_label))
 
-        # MEMSの誤差曲線 (t²に比例、10時間で6.5km)
-        # δx = k * t² where k = 6.5 / 100 = 0.065
-        mems_curve = axes.plot(
-            lambda t: 0.065 * t ** 2,
-            x_range=[0, 10],
-            color=MEMS_COLOR,
-            stroke_width=3,
-        )
+        # バイアス・ホワイトノイズ・バイアスのランダムウォークを含む
+        # モンテカルロ計算（km 単位の平均曲線と 5〜95% の帯）
+        hours, mems_envelope = simulate_flight_error(self, MEMS_SPEC)
+        _, atomic_envelope = simulate_flight_error(self, ATOM_SPEC)
+
+        def envelope_curve(values, color):
+            km = values / 1e3
+            return axes.plot(
+                lambda t: np.interp(t, hours, km),
+                x_range=[0, FLIGHT_HOURS],
+                use_vectorized=True,
+                color=color,
+                stroke_width=3,
+            )
+
+        def envelope_band(envelope, color, step=10):
+            upper = [axes.c2p(t, v / 1e3) for t, v in zip(hours[::step], envelope["p95"][::step])]
+            lower = [axes.c2p(t, v / 1e3) for t, v in zip(hours[::step], envelope["p5"][::step])]
+            return Polygon(
+                *upper, *reversed(lower),
+                stroke_width=0, fill_color=color, fill_opacity=0.25,
+            )
+
+        # MEMSの誤差曲線 (t²に比例、10時間で約6.5km)
+        mems_band = envelope_band(mems_envelope, MEMS_COLOR)
+        mems_curve = envelope_curve(mems_envelope["mean"], MEMS_COLOR)
 
         mems_label = Text("MEMS", font_size=20, color=MEMS_COLOR)
         mems_label.next_to(mems_curve.get_end(), RIGHT, buff=0.2)
 
         # 原子干渉計の誤差曲線 (10時間で0.00065km = 65cm)
         # ほぼ0に見えるので、誇張して表示
-        atomic_curve = axes.plot(
-            lambda t: 0.0000065 * t ** 2,  # 実際の値
-            x_range=[0, 10],
-            color=ATOMIC_COLOR,
-            stroke_width=3,
-        )
+        atomic_curve = envelope_curve(atomic_envelope["mean"], ATOMIC_COLOR)
 
         atomic_label = Text("原子干渉計", font_size=20, color=ATOMIC_COLOR)
         atomic_label.next_to(axes.c2p(10, 0.5), RIGHT, buff=0.2)
 
         # アニメーション
-        self.play(Create(mems_curve), Write(mems_label), run_time=2)
+        self.play(FadeIn(mems_band), Create(mems_curve), Write(mems_label), run_time=2)
         self.wait(0.5)
 
         self.play(Create(atomic_curve), Write(atomic_label), run_time=2)
         self.wait(0.5)
 
         # 10時間地点にマーカー
-        mems_point = Dot(axes.c2p(10, 6.5), color=MEMS_COLOR)
-        mems_value = Text("6.5 km", font_size=18, color=MEMS_COLOR)
+        mems_final = mems_envelope["rms"][-1]
+        atomic_final = atomic_envelope["rms"][-1]
+        mems_point = Dot(axes.c2p(FLIGHT_HOURS, mems_final / 1e3), color=MEMS_COLOR)
+        mems_value = Text(format_distance(mems_final), font_size=18, color=MEMS_COLOR)
         mems_value.next_to(mems_point, UP, buff=0.1)
 
-        atomic_point = Dot(axes.c2p(10, 0), color=ATOMIC_COLOR)
-        atomic_value = Text("65 cm", font_size=18, color=ATOMIC_COLOR)
+        atomic_point = Dot(axes.c2p(FLIGHT_HOURS, atomic_final / 1e3), color=ATOMIC_COLOR)
+        atomic_value = Text(format_distance(atomic_final), font_size=18, color=ATOMIC_COLOR)
         atomic_value.next_to(atomic_point, DOWN, buff=0.1)
 
         self.play(
@@ -281,12 +423,16 @@ class PrecisionErrorGrowth(Scene):
 
         # 精度の説明
         mems_prec_label = Text("MEMS: ", font_size=20, color=MEMS_COLOR)
-        mems_prec_value = MathTex(r"\delta a \approx 10^{-5}", font_size=24, color=MEMS_COLOR)
+        mems_prec_value = MathTex(
+            rf"\delta a \approx {power_of_ten_tex(MEMS_SPEC.bias)}", font_size=24, color=MEMS_COLOR
+        )
         mems_prec_unit = Text(" m/s²", font_size=20, color=MEMS_COLOR)
         mems_prec_line = VGroup(mems_prec_label, mems_prec_value, mems_prec_unit).arrange(RIGHT, buff=0.1)
 
         atomic_prec_label = Text("原子干渉計: ", font_size=20, color=ATOMIC_COLOR)
-        atomic_prec_value = MathTex(r"\delta a \approx 10^{-9}", font_size=24, color=ATOMIC_COLOR)
+        atomic_prec_value = MathTex(
+            rf"\delta a \approx {power_of_ten_tex(ATOM_SPEC.bias)}", font_size=24, color=ATOMIC_COLOR
+        )
         atomic_prec_unit = Text(" m/s²", font_size=20, color=ATOMIC_COLOR)
         atomic_prec_line = VGroup(atomic_prec_label, atomic_prec_value, atomic_prec_unit).arrange(RIGHT, buff=0.1)
 
@@ -300,6 +446,77 @@ class PrecisionErrorGrowth(Scene):
         self.play(*[FadeOut(mob) for mob in self.mobjects])
 
 
+class AllanDeviationComparison(Scene):
+    """加速度計ノイズのアラン偏差（両対数グラフ）の比較"""
+
+    def construct(self):
+        MEMS_COLOR = RED
+        ATOMIC_COLOR = BLUE
+
+        # タイトル
+        title = Text("アラン偏差による精度の比較", font_size=36, color=WHITE).to_edge(UP)
+        self.play(Write(title))
+
+        # 約10⁶ サンプルの時系列からオーバーラッピング・アラン偏差を事前に計算
+        mems_taus, mems_adev = simulate_adev(self, MEMS_SPEC)
+        atomic_taus, atomic_adev = simulate_adev(self, ATOM_SPEC)
+
+        graph = AllanDeviationGraph(x_range=(-2, 4), y_range=(-11, -2), x_length=8, y_length=4.5)
+        graph.shift(DOWN * 0.4 + LEFT * 1)
+        x_label = MathTex(r"\tau\ \mathrm{[s]}", font_size=28).next_to(graph.axes.x_axis, DOWN, buff=0.5)
+        y_label = MathTex(r"\sigma_a(\tau)\ \mathrm{[m/s^2]}", font_size=28)
+        y_label.rotate(90 * DEGREES).next_to(graph.axes.y_axis, LEFT, buff=0.6)
+
+        self.play(Create(graph.axes), Write(x_label), Write(y_label))
+
+        # シミュレーション（実線）と誤差モデルの解析解（破線）
+        mems_curve = graph.add_curve(mems_taus, mems_adev, color=MEMS_COLOR)
+        mems_model = graph.add_curve(
+            mems_taus, model_adev(MEMS_SPEC, mems_taus), color=MEMS_COLOR, dashed=True, stroke_width=2
+        )
+        atomic_curve = graph.add_curve(atomic_taus, atomic_adev, color=ATOMIC_COLOR)
+        atomic_model = graph.add_curve(
+            atomic_taus, model_adev(ATOM_SPEC, atomic_taus), color=ATOMIC_COLOR, dashed=True, stroke_width=2
+        )
+
+        mems_label = Text("MEMS", font_size=20, color=MEMS_COLOR)
+        mems_label.next_to(graph.point(mems_taus[0], mems_adev[0]), UR, buff=0.1)
+        atomic_label = Text("原子干渉計", font_size=20, color=ATOMIC_COLOR)
+        atomic_label.next_to(graph.point(atomic_taus[0], atomic_adev[0]), UR, buff=0.1)
+
+        self.play(Create(mems_curve), Write(mems_label), run_time=2)
+        self.play(Create(mems_model))
+        self.wait(0.5)
+        self.play(Create(atomic_curve), Write(atomic_label), run_time=2)
+        self.play(Create(atomic_model))
+        self.wait(0.5)
+
+        # τ = 1 s での値と傾きの説明
+        i_mems = np.argmin(np.abs(mems_taus - 1.0))
+        i_atomic = np.argmin(np.abs(atomic_taus - 1.0))
+        legend = VGroup(
+            MathTex(
+                rf"\text{{MEMS: }} \sigma_a(1\,\mathrm{{s}}) \approx {power_of_ten_tex(mems_adev[i_mems])}",
+                font_size=26,
+                color=MEMS_COLOR,
+            ),
+            MathTex(
+                rf"\text{{Atom: }} \sigma_a(1\,\mathrm{{s}}) \approx {power_of_ten_tex(atomic_adev[i_atomic])}",
+                font_size=26,
+                color=ATOMIC_COLOR,
+            ),
+            MathTex(r"\propto \tau^{-1/2}:\ \text{white noise}", font_size=24, color=GRAY),
+            MathTex(r"\propto \tau^{+1/2}:\ \text{bias random walk}", font_size=24, color=GRAY),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.2)
+        legend.to_edge(RIGHT, buff=0.3).shift(UP * 1)
+
+        self.play(Write(legend))
+        self.wait(2)
+
+        # フェードアウト
+        self.play(*[FadeOut(mob) for mob in self.mobjects])
+
+
 class PrecisionComparisonCombined(Scene):
     """統合版: 精度比較の全体像"""
 
@@ -319,7 +536,7 @@ class PrecisionComparisonCombined(Scene):
         precision_title.next_to(title, DOWN, buff=0.4)
 
         mems_precision_formula = VGroup(
-            MathTex(r"\delta a \approx 10^{-5}", font_size=28, color=MEMS_COLOR),
+            MathTex(rf"\delta a \approx {power_of_ten_tex(MEMS_SPEC.bias)}", font_size=28, color=MEMS_COLOR),
             Text(" m/s²", font_size=22, color=MEMS_COLOR),
         ).arrange(RIGHT, buff=0.1)
         mems_precision = VGroup(
@@ -328,7 +545,7 @@ class PrecisionComparisonCombined(Scene):
         ).arrange(DOWN, buff=0.1)
 
         atomic_precision_formula = VGroup(
-            MathTex(r"\delta a \approx 10^{-9}", font_size=28, color=ATOMIC_COLOR),
+            MathTex(rf"\delta a \approx {power_of_ten_tex(ATOM_SPEC.bias)}", font_size=28, color=ATOMIC_COLOR),
             Text(" m/s²", font_size=22, color=ATOMIC_COLOR),
         ).arrange(RIGHT, buff=0.1)
         atomic_precision = VGroup(
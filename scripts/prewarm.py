@@ -0,0 +1,252 @@
+"""
+レンダリング前に TeX・Text のリテラルをまとめて並列にコンパイルする事前処理
+
+scripts/*.py を import せずに AST で走査し、MathTex(...)・Tex(...)・Text(...) の呼び出しのうち
+引数がリテラル（文字列、数値、モジュールの定数、manim の BOLD などの名前）のものを重複なく集めて、
+プロセスプールで生成する。生成の途中で
+    MathTex・Tex   tex_cache の共有キャッシュに SVG が入る（latex・dvisvgm を呼ぶのはここだけ）
+    Text           media の text の SVG（MANIM_GLYPH_CACHE を有効にしていれば glyph_cache に
+                   未知の文字の輪郭）が入る（Pango を呼ぶのはここだけ）
+ので、そのあとのレンダリングのワーカーは latex・Pango のサブプロセスや呼び出しを待たない。
+f-string や変数を渡している呼び出しは対象外（レンダリング時にコンパイルされる）
+
+Text は同じ書体（フォント・太さ・傾き・サイズ）のものを同じワーカーにまとめるので、
+同じ文字を複数のワーカーが重複して描くことはない
+
+使用方法:
+    python scripts/prewarm.py                              # scripts/*.py を CPU コア数の並列で
+    python scripts/prewarm.py -j 4 scripts/mach_zehnder_animation.py
+    python scripts/prewarm.py --list                       # 見つかったリテラルの一覧のみ
+    python scripts/render_all.py --prewarm                 # レンダリング対象のスクリプトを事前処理してから実行
+"""
+
+import argparse
+import ast
+import os
+import sys
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from pathlib import Path
+
+import glyph_cache
+import tex_cache
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+
+TEX_CLASSES = ("MathTex", "Tex")
+TEXT_CLASSES = ("Text",)
+
+# manim の太さ・傾きの定数（値は名前と同じ文字列）
+MANIM_CONSTANTS = {
+    name: name
+    for name in (
+        "THIN", "ULTRALIGHT", "LIGHT", "SEMILIGHT", "BOOK", "NORMAL", "MEDIUM",
+        "SEMIBOLD", "BOLD", "ULTRABOLD", "HEAVY", "ULTRAHEAVY", "ITALIC", "OBLIQUE",
+    )
+}
+
+
+def module_constants(tree):
+    """モジュール直下の NAME = <リテラル> の代入"""
+    constants = {}
+    for node in tree.body:
+        if (isinstance(node, ast.Assign) and len(node.targets) == 1
+                and isinstance(node.targets[0], ast.Name)):
+            try:
+                constants[node.targets[0].id] = ast.literal_eval(node.value)
+            except ValueError:
+                pass
+    return constants
+
+
+def _literal_value(node, constants):
+    try:
+        return ast.literal_eval(node)
+    except ValueError:
+        if isinstance(node, ast.Name) and node.id in constants:
+            return constants[node.id]
+        raise
+
+
+def _literal_call(node, constants):
+    """位置引数がすべて文字列に決まる呼び出しなら (引数, 値の決まるキーワード引数)
+
+    色など値の決まらないキーワード引数は SVG の形に影響しないので落とす
+    """
+    args = []
+    for arg in node.args:
+        try:
+            value = _literal_value(arg, constants)
+        except ValueError:
+            return None
+        if not isinstance(value, str):
+            return None
+        args.append(value)
+    kwargs = {}
+    for keyword in node.keywords:
+        if keyword.arg is None:
+            return None
+        try:
+            kwargs[keyword.arg] = _literal_value(keyword.value, constants)
+        except ValueError:
+            continue
+    return tuple(args), kwargs
+
+
+def scan_literals(paths, classes=TEX_CLASSES + TEXT_CLASSES):
+    """スクリプトの AST から classes の呼び出しで引数がリテラルのものを重複なく集める
+
+    Returns:
+        [(クラス名, 引数のタプル, キーワード引数の dict)]（見つかった順）
+    """
+    found = {}
+    for path in paths:
+        tree = ast.parse(Path(path).read_text(encoding="utf-8"), filename=str(path))
+        constants = {**MANIM_CONSTANTS, **module_constants(tree)}
+        for node in ast.walk(tree):
+            if not isinstance(node, ast.Call):
+                continue
+            func = node.func
+            name = func.id if isinstance(func, ast.Name) else getattr(func, "attr", None)
+            if name not in classes or not node.args:
+                continue
+            literal = _literal_call(node, constants)
+            if literal is None:
+                continue
+            args, kwargs = literal
+            key = (name, args, repr(sorted(kwargs.items())))
+            found.setdefault(key, (name, args, kwargs))
+    return list(found.values())
+
+
+def compile_literals(literals, on_error=None):
+    """リテラルの Mobject を順に生成する（キャッシュが入っていればそこに書き込まれる）
+
+    Returns:
+        失敗した数
+    """
+    import manim
+
+    failed = 0
+    for name, args, kwargs in literals:
+        try:
+            getattr(manim, name)(*args, **kwargs)
+        except Exception as exc:
+            failed += 1
+            if on_error:
+                on_error(name, args, exc)
+    return failed
+
+
+def _text_face(kwargs):
+    return (
+        kwargs.get("font", ""),
+        str(kwargs.get("weight", "NORMAL")),
+        str(kwargs.get("slant", "NORMAL")),
+        float(kwargs.get("font_size", 48)),
+    )
+
+
+def partition(literals, workers):
+    """ワーカーに渡すまとまりに分ける
+
+    TeX は workers × 4 個に順番に配り、Text は書体ごとに1つのまとまりにする。
+    大きいまとまりから投入するよう、長さの降順で返す
+    """
+    tex = [literal for literal in literals if literal[0] not in TEXT_CLASSES]
+    n_chunks = max(1, min(len(tex), workers * 4))
+    chunks = [tex[i::n_chunks] for i in range(n_chunks)] if tex else []
+
+    faces = {}
+    for literal in literals:
+        if literal[0] in TEXT_CLASSES:
+            faces.setdefault(_text_face(literal[2]), []).append(literal)
+    chunks.extend(faces.values())
+    return sorted(chunks, key=len, reverse=True)
+
+
+def _warm_chunk(literals, media_dir):
+    """ワーカープロセス内でまとまり1つ分を生成し、(数, エラーの一覧) を返す"""
+    from manim import tempconfig
+
+    tex_cache.install()
+    glyph_cache.install()
+    errors = []
+
+    def collect(name, args, exc):
+        errors.append(f"{name}{args}: {type(exc).__name__}: {exc}")
+
+    with tempconfig({"media_dir": str(media_dir), "progress_bar": "none"}):
+        compile_literals(literals, on_error=collect)
+    return len(literals), errors
+
+
+def prewarm(paths, workers=None, media_dir=None, classes=TEX_CLASSES + TEXT_CLASSES,
+            on_chunk=None):
+    """paths のリテラルをプロセスプールで生成する
+
+    Returns:
+        (リテラルの数, エラーの一覧)
+    """
+    literals = scan_literals(paths, classes)
+    if not literals:
+        return 0, []
+    workers = workers or os.cpu_count() or 1
+    media_dir = Path(media_dir or REPO_DIR / "media")
+    chunks = partition(literals, workers)
+
+    errors = []
+    with ProcessPoolExecutor(max_workers=min(workers, len(chunks))) as pool:
+        futures = [pool.submit(_warm_chunk, chunk, media_dir) for chunk in chunks]
+        for future in as_completed(futures):
+            count, chunk_errors = future.result()
+            errors.extend(chunk_errors)
+            if on_chunk:
+                on_chunk(count, chunk_errors)
+    return len(literals), errors
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="TeX・Text のリテラルを事前に並列コンパイルする")
+    parser.add_argument("scripts", nargs="*", type=Path,
+                        help="対象のスクリプト（既定: scripts/*.py）")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="並列ワーカー数（既定: CPUコア数）")
+    parser.add_argument("--media-dir", type=Path, default=REPO_DIR / "media",
+                        help="manim の media_dir（既定: ./media）")
+    parser.add_argument("--tex-only", action="store_true", help="MathTex・Tex だけを対象にする")
+    parser.add_argument("--list", action="store_true", help="コンパイルせずにリテラルを表示する")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    paths = args.scripts or sorted(SCRIPTS_DIR.glob("*.py"))
+    classes = TEX_CLASSES if args.tex_only else TEX_CLASSES + TEXT_CLASSES
+
+    if args.list:
+        literals = scan_literals(paths, classes)
+        for name, tex_args, kwargs in literals:
+            options = "".join(f", {key}={value!r}" for key, value in kwargs.items())
+            print(f"{name}({', '.join(map(repr, tex_args))}{options})")
+        print(f"\n{len(literals)} literals")
+        return 0
+
+    start = time.perf_counter()
+    done = [0]
+
+    def report(count, chunk_errors):
+        done[0] += count
+        print(f"  {done[0]} literals done", flush=True)
+        for error in chunk_errors:
+            print(f"failed: {error}", file=sys.stderr)
+
+    count, errors = prewarm(paths, args.jobs, args.media_dir, classes, on_chunk=report)
+    print(f"{count} literals from {len(paths)} scripts ({len(errors)} failed) "
+          f"in {time.perf_counter() - start:.1f} s")
+    return 0 if not errors else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,186 @@
+"""
+ラマン遷移のラビ振動（2準位・3準位）のベクトル化ソルバー
+
+2準位（|g⟩, |e⟩、回転座標系、2光子離調 δ、実効ラビ周波数 Ω）:
+    H/ħ = ½ [[δ, Ω e^{-iφ}], [Ω e^{iφ}, -δ]]
+    U(τ) = cos(Ω_R τ/2) I - i sin(Ω_R τ/2) (H / (½ħΩ_R))      （Ω_R = √(Ω² + δ²)）
+    P_e(τ) = (Ω/Ω_R)² sin²(Ω_R τ/2)
+を閉じた式で計算するので、数千〜数百万の離調（= 原子の速度）をまとめて評価できる。
+
+3準位（|g⟩, |e⟩, 中間準位 |i⟩、1光子離調 Δ、1光子ラビ周波数 Ω₁, Ω₂）:
+    H/ħ = [[0, 0, Ω₁/2], [0, -δ, Ω₂/2], [Ω₁/2, Ω₂/2, -Δ]]
+をバッチの固有値分解（np.linalg.eigh）で厳密に時間発展させる（自然放出は無視）。
+|Δ| ≫ Ω₁, Ω₂ では実効的な2準位系
+    Ω_eff = Ω₁Ω₂ / (2Δ)、δ_eff = δ + (Ω₁² - Ω₂²) / (4Δ)（光シフト）
+に一致する
+
+速度 v の原子の2光子離調は δ = δ_L - k_eff·v（δ_L は反跳シフトを含めた静止原子の
+共鳴からのレーザーのずれ）なので、速度分布で平均した転送効率（π/2・π パルスの忠実度）と
+速度選択性（どの速度の原子が |e⟩ に移るか）が計算できる
+
+使用例:
+    rabi = 2 * np.pi * 25e3
+    t = np.linspace(0, 3 * pi_pulse_time(rabi), 300)
+    P = excited_population(rabi, detuning=0.0, t=t)              # ラビ振動
+    P = thermal_excited_population(rabi, 1e-6, t)                 # 1 μK の集団平均
+    F = pulse_fidelity(rabi, raman_detuning(velocities), "pi")    # 原子ごとの π パルス忠実度
+    U = three_level_propagator(omega1, omega2, Delta, delta, t)   # (..., 3, 3)
+"""
+
+import numpy as np
+
+from mb_distribution import velocity_sigma
+from rb87_constants import K_B, K_EFF, M_RB87
+
+# 基底 |g⟩ から始める状態ベクトル
+GROUND_2 = np.array([1.0, 0.0], dtype=complex)
+GROUND_3 = np.array([1.0, 0.0, 0.0], dtype=complex)
+
+
+def pi_pulse_time(rabi):
+    """共鳴での π パルスの長さ π/Ω [s]"""
+    return np.pi / np.asarray(rabi, dtype=float)
+
+
+def raman_detuning(velocity, laser_detuning=0.0, k_eff=K_EFF):
+    """速度 v の原子から見た2光子離調 δ = δ_L - k_eff·v [rad/s]
+
+    Args:
+        velocity: k_eff 方向の速度 [m/s]（配列可）
+        laser_detuning: 静止原子の共鳴（超微細分裂 + 反跳シフト）からのレーザーのずれ δ_L [rad/s]
+    """
+    return laser_detuning - k_eff * np.asarray(velocity, dtype=float)
+
+
+def two_level_propagator(rabi, detuning, duration, phase=0.0):
+    """2準位の時間発展演算子 U(τ)（閉じた式、形状 (..., 2, 2)）
+
+    rabi, detuning, duration, phase はブロードキャストする
+    """
+    rabi, detuning, duration, phase = np.broadcast_arrays(
+        *[np.asarray(a, dtype=float) for a in (rabi, detuning, duration, phase)]
+    )
+    generalized = np.hypot(rabi, detuning)
+    half_angle = generalized * duration / 2
+    cos = np.cos(half_angle)
+    # sin(x)/Ω_R（Ω_R = 0 のときは τ/2）
+    sin_over = np.where(
+        generalized > 0,
+        np.sin(half_angle) / np.where(generalized > 0, generalized, 1.0),
+        duration / 2,
+    )
+    coupling = -1j * rabi * sin_over
+    U = np.empty(rabi.shape + (2, 2), dtype=complex)
+    U[..., 0, 0] = cos - 1j * detuning * sin_over
+    U[..., 1, 1] = cos + 1j * detuning * sin_over
+    U[..., 0, 1] = coupling * np.exp(-1j * phase)
+    U[..., 1, 0] = coupling * np.exp(1j * phase)
+    return U
+
+
+def excited_population(rabi, detuning, t):
+    """|g⟩ から始めたときの |e⟩ の占有確率 (Ω/Ω_R)² sin²(Ω_R t/2)（ブロードキャスト）"""
+    rabi = np.asarray(rabi, dtype=float)
+    detuning = np.asarray(detuning, dtype=float)
+    generalized_sq = rabi**2 + detuning**2
+    ratio = np.divide(rabi**2, generalized_sq, out=np.zeros(np.broadcast(rabi, detuning).shape),
+                      where=generalized_sq > 0)
+    return ratio * np.sin(np.sqrt(generalized_sq) * np.asarray(t, dtype=float) / 2) ** 2
+
+
+def evolve(U, state=GROUND_2):
+    """状態ベクトルに U を作用させる（U: (..., n, n)、state: (n,) または (..., n)）"""
+    return np.einsum("...ij,...j->...i", U, state)
+
+
+def pulse_fidelity(rabi, detuning, pulse="pi", phase=0.0):
+    """共鳴用に設計した π/2 または π パルスの、離調 δ での忠実度 |⟨目標|U|g⟩|²
+
+    目標状態は共鳴でのパルス後の状態（π: -i e^{iφ}|e⟩、π/2: (|g⟩ - i e^{iφ}|e⟩)/√2）
+    """
+    if pulse not in ("pi", "pi/2"):
+        raise ValueError(f"unknown pulse: {pulse}")
+    area = np.pi if pulse == "pi" else np.pi / 2
+    duration = area / np.asarray(rabi, dtype=float)
+    final = evolve(two_level_propagator(rabi, detuning, duration, phase))
+    target = evolve(two_level_propagator(rabi, 0.0, duration, phase))
+    return np.abs(np.sum(np.conj(target) * final, axis=-1)) ** 2
+
+
+def doppler_detunings(T, n=2001, width=5.0, laser_detuning=0.0, m=M_RB87, k_B=K_B):
+    """温度 T の1次元速度分布を格子で表した (速度, 重み, 2光子離調)
+
+    ±width σ の範囲を n 点で区切り、重みはガウス分布（合計 1）
+    """
+    sigma = float(velocity_sigma(T, m, k_B))
+    velocities = np.linspace(-width * sigma, width * sigma, n)
+    weights = np.exp(-0.5 * (velocities / sigma) ** 2)
+    weights /= weights.sum()
+    return velocities, weights, raman_detuning(velocities, laser_detuning)
+
+
+def thermal_excited_population(rabi, T, t, laser_detuning=0.0, n=2001):
+    """温度 T の集団で平均した |e⟩ の占有確率（t と同じ形状）
+
+    (速度の格子点数 × 時刻) の配列を1回で評価する
+    """
+    t = np.asarray(t, dtype=float)
+    _, weights, detunings = doppler_detunings(T, n, laser_detuning=laser_detuning)
+    populations = excited_population(rabi, detunings[:, None], t.ravel()[None, :])
+    return (weights @ populations).reshape(t.shape)
+
+
+def thermal_pulse_fidelity(rabi, T, pulse="pi", laser_detuning=0.0, n=2001):
+    """温度 T の集団で平均した π/2・π パルスの忠実度"""
+    _, weights, detunings = doppler_detunings(T, n, laser_detuning=laser_detuning)
+    return weights @ pulse_fidelity(rabi, detunings, pulse)
+
+
+def velocity_selectivity(rabi, T, laser_detuning=0.0, n=2001, duration=None):
+    """速度選択: π パルス（既定）後に |e⟩ へ移った原子の速度分布
+
+    Returns:
+        (速度 [m/s], 元の分布の重み, |e⟩ に移った重み（合計が転送効率）)
+    """
+    if duration is None:
+        duration = pi_pulse_time(rabi)
+    velocities, weights, detunings = doppler_detunings(T, n, laser_detuning=laser_detuning)
+    return velocities, weights, weights * excited_population(rabi, detunings, duration)
+
+
+def three_level_hamiltonian(omega1, omega2, Delta, delta=0.0):
+    """3準位 Λ 系の H/ħ（基底 |g⟩, |e⟩, |i⟩、形状 (..., 3, 3)）"""
+    omega1, omega2, Delta, delta = np.broadcast_arrays(
+        *[np.asarray(a, dtype=float) for a in (omega1, omega2, Delta, delta)]
+    )
+    H = np.zeros(omega1.shape + (3, 3))
+    H[..., 1, 1] = -delta
+    H[..., 2, 2] = -Delta
+    H[..., 0, 2] = H[..., 2, 0] = omega1 / 2
+    H[..., 1, 2] = H[..., 2, 1] = omega2 / 2
+    return H
+
+
+def three_level_propagator(omega1, omega2, Delta, delta, t):
+    """3準位の時間発展演算子 U(t) = V e^{-iλt} V†（形状 (..., 3, 3)）
+
+    ハミルトニアンの固有値分解は (omega1, omega2, Delta, delta) の組ごとに1回だけ行い、
+    t の次元（最後の軸）にはブロードキャストする。t がスカラーなら時間の軸は付かない
+    """
+    eigenvalues, V = np.linalg.eigh(three_level_hamiltonian(omega1, omega2, Delta, delta))
+    t = np.asarray(t, dtype=float)
+    if t.ndim == 0:
+        phases = np.exp(-1j * eigenvalues * t)
+        return np.einsum("...ik,...k,...jk->...ij", V, phases, V.conj())
+    phases = np.exp(-1j * eigenvalues[..., None, :] * t[:, None])
+    return np.einsum("...ik,...tk,...jk->...tij", V, phases, V.conj())
+
+
+def effective_rabi(omega1, omega2, Delta):
+    """断熱消去した実効ラビ周波数 Ω₁Ω₂ / (2Δ)"""
+    return np.asarray(omega1) * np.asarray(omega2) / (2 * np.asarray(Delta, dtype=float))
+
+
+def differential_light_shift(omega1, omega2, Delta):
+    """2光子離調に加わる光シフト (Ω₁² - Ω₂²) / (4Δ)"""
+    return (np.asarray(omega1) ** 2 - np.asarray(omega2) ** 2) / (4 * np.asarray(Delta, dtype=float))
@@ -6,11 +6,55 @@
 使用方法:
     manim -pql raman_transition_animation.py RamanTransition
     manim -pqh raman_transition_animation.py RamanTransition  # 高画質
+    manim -pql raman_transition_animation.py RabiOscillation
 """
 
 from manim import *
 import numpy as np
 
+from raman_rabi import (
+    excited_population,
+    pi_pulse_time,
+    thermal_excited_population,
+    thermal_pulse_fidelity,
+    velocity_selectivity,
+)
+
+# 実効ラビ周波数 Ω = 2π × 25 kHz（π パルス 20 μs）と、速度選択後の原子集団の温度
+RABI = 2 * np.pi * 25e3
+ATOM_TEMPERATURE = 0.1e-6
+
+
+def rabi_population_plot(x_length, y_length, temperature=ATOM_TEMPERATURE, max_area=np.pi,
+                         ground_color=BLUE, excited_color=RED):
+    """パルス面積 θ = Ωt に対する |g⟩・|e⟩ の占有確率（集団平均）のグラフ
+
+    Returns:
+        VGroup(axes, |g⟩ の曲線, |e⟩ の曲線)
+    """
+    axes = Axes(
+        x_range=[0, max_area, np.pi / 2],
+        y_range=[0, 1, 0.5],
+        x_length=x_length,
+        y_length=y_length,
+        axis_config={"include_tip": False, "stroke_width": 2},
+    )
+
+    def excited(theta):
+        return thermal_excited_population(RABI, temperature, theta / RABI)
+
+    excited_curve = axes.plot(
+        excited, x_range=[0, max_area], use_vectorized=True, color=excited_color, stroke_width=3
+    )
+    ground_curve = axes.plot(
+        lambda theta: 1 - excited(theta),
+        x_range=[0, max_area],
+        use_vectorized=True,
+        color=ground_color,
+        stroke_width=3,
+    )
+    return VGroup(axes, ground_curve, excited_curve)
+
 
 class RamanTransition(Scene):
     """ラマン遷移の基本原理を示すアニメーション"""
@@ -109,6 +153,28 @@ class RamanTransition(Scene):
         atom_excited_label = MathTex("|e\\rangle", font_size=28, color=EXCITED_COLOR)
         atom_excited_label.next_to(atom_excited, DOWN, buff=0.2)
 
+        # π パルス中の |e⟩ の占有確率（集団平均）で原子の色を変えながら移動させる
+        pulse_alpha = np.linspace(0, 1, 200)
+        transfer = thermal_excited_population(
+            RABI, ATOM_TEMPERATURE, pulse_alpha * pi_pulse_time(RABI)
+        )
+        moving_atom = atom.copy()
+        start, end = atom.get_center(), atom_excited.get_center()
+
+        def transfer_atom(mob, alpha):
+            color = interpolate_color(
+                GROUND_COLOR, EXCITED_COLOR, np.interp(alpha, pulse_alpha, transfer)
+            )
+            mob.move_to(interpolate(start, end, alpha))
+            mob.set_fill(color).set_stroke(color)
+
+        efficiency = Text(
+            f"πパルスの転送効率: {transfer[-1]:.0%}", font_size=18, color=YELLOW
+        ).next_to(transition_arrow, DOWN, buff=0.2)
+
+        self.play(UpdateFromAlphaFunc(moving_atom, transfer_atom), run_time=2)
+        self.play(Write(efficiency))
+
         # 運動量変化の矢印
         momentum_arrow = Arrow(
             atom_excited.get_center(),
@@ -121,7 +187,7 @@ class RamanTransition(Scene):
         momentum_label.next_to(momentum_arrow, UP, buff=0.1)
 
         self.play(
-            FadeIn(atom_excited),
+            ReplacementTransform(moving_atom, atom_excited),
             Write(atom_excited_label),
             GrowArrow(momentum_arrow),
             Write(momentum_label),
@@ -355,6 +421,17 @@ class RamanStates(Scene):
         transition_label.next_to(transition, UP, buff=0.1)
 
         self.play(GrowArrow(transition), Write(transition_label))
+
+        # π パルス中の占有確率（速度分布で平均した実際の曲線）
+        populations = rabi_population_plot(
+            x_length=2.6, y_length=1.2, ground_color=GROUND_COLOR, excited_color=EXCITED_COLOR
+        )
+        populations.next_to(transition, DOWN, buff=0.4)
+        pulse_label = MathTex(r"0 \rightarrow \pi", font_size=20).next_to(populations, DOWN, buff=0.1)
+        axes, ground_curve, excited_curve = populations
+
+        self.play(Create(axes), Write(pulse_label))
+        self.play(Create(ground_curve), Create(excited_curve), run_time=2)
         self.wait(1)
 
         # 補足説明
@@ -470,6 +547,21 @@ class RamanTransitionCombined(Scene):
         self.play(GrowArrow(arrow1), GrowArrow(arrow2))
         self.wait(1)
 
+        # レーザー照射中の占有確率の変化（ラビ振動の半周期 = π パルス）
+        populations = rabi_population_plot(
+            x_length=2.0, y_length=1.6, ground_color=GROUND_COLOR, excited_color=EXCITED_COLOR
+        ).move_to(laser_box)
+        axes, ground_curve, excited_curve = populations
+        pulse_label = MathTex(r"\Omega t: 0 \rightarrow \pi", font_size=20).next_to(axes, DOWN, buff=0.1)
+
+        self.play(
+            FadeOut(laser1_line), FadeOut(laser1_freq),
+            FadeOut(laser2_line), FadeOut(laser2_freq),
+        )
+        self.play(Create(axes), Write(pulse_label))
+        self.play(Create(ground_curve), Create(excited_curve), run_time=2)
+        self.wait(1)
+
         # 結論ボックス
         conclusion = VGroup(
             MathTex(r"|g\rangle \xrightarrow{\text{Raman}} |e\rangle", font_size=28),
@@ -484,3 +576,122 @@ class RamanTransitionCombined(Scene):
 
         # フェードアウト
         self.play(*[FadeOut(mob) for mob in self.mobjects])
+
+
+class RabiOscillation(Scene):
+    """ラビ振動と、原子の速度分布による減衰・速度選択"""
+
+    def construct(self):
+        GROUND_COLOR = BLUE
+        EXCITED_COLOR = RED
+        WARM_COLOR = ORANGE
+
+        # タイトル
+        title = Text("ラビ振動", font_size=36, color=WHITE).to_edge(UP)
+        self.play(Write(title))
+
+        # ===== 上段: |e⟩ の占有確率の時間変化 =====
+        max_area = 4 * np.pi
+        axes = Axes(
+            x_range=[0, max_area, np.pi],
+            y_range=[0, 1, 0.5],
+            x_length=9,
+            y_length=2.2,
+            axis_config={"include_tip": False},
+            y_axis_config={
+                "include_numbers": True,
+                "numbers_to_include": [0, 0.5, 1],
+                "font_size": 22,
+            },
+        ).shift(UP * 1)
+        x_labels = VGroup(*[
+            MathTex(label, font_size=22).next_to(axes.c2p(k * np.pi, 0), DOWN, buff=0.15)
+            for k, label in enumerate([r"0", r"\pi", r"2\pi", r"3\pi", r"4\pi"])
+        ])
+        x_label = MathTex(r"\Omega t", font_size=26).next_to(axes.x_axis, RIGHT, buff=0.2)
+        y_label = MathTex(r"P_e", font_size=26).next_to(axes.y_axis, UP, buff=0.1)
+
+        self.play(Create(axes), Write(x_labels), Write(x_label), Write(y_label))
+
+        # 静止原子（共鳴）、冷たい集団、温かい集団
+        curves = VGroup(
+            axes.plot(
+                lambda theta: excited_population(RABI, 0.0, theta / RABI),
+                x_range=[0, max_area],
+                use_vectorized=True,
+                color=EXCITED_COLOR,
+                stroke_width=3,
+            ),
+            axes.plot(
+                lambda theta: thermal_excited_population(RABI, ATOM_TEMPERATURE, theta / RABI),
+                x_range=[0, max_area],
+                use_vectorized=True,
+                color=YELLOW,
+                stroke_width=3,
+            ),
+            axes.plot(
+                lambda theta: thermal_excited_population(RABI, 10 * ATOM_TEMPERATURE, theta / RABI),
+                x_range=[0, max_area],
+                use_vectorized=True,
+                color=WARM_COLOR,
+                stroke_width=3,
+            ),
+        )
+        legend = VGroup(
+            Text("静止原子", font_size=16, color=EXCITED_COLOR),
+            Text(f"{ATOM_TEMPERATURE * 1e6:g} μK", font_size=16, color=YELLOW),
+            Text(f"{10 * ATOM_TEMPERATURE * 1e6:g} μK", font_size=16, color=WARM_COLOR),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.1)
+        legend.next_to(axes, RIGHT, buff=0.2).shift(UP * 0.3)
+
+        for curve, label in zip(curves, legend):
+            self.play(Create(curve), FadeIn(label), run_time=1.5)
+        self.wait(0.5)
+
+        # ===== 下段: π パルスの速度選択 =====
+        velocities, weights, selected = velocity_selectivity(RABI, 10 * ATOM_TEMPERATURE)
+        mm_per_s = velocities * 1e3
+        density = weights / weights.max()
+        selected_density = selected / weights.max()
+        v_max = float(mm_per_s[-1])
+
+        v_axes = Axes(
+            x_range=[-v_max, v_max, v_max / 2],
+            y_range=[0, 1.1, 0.5],
+            x_length=6,
+            y_length=1.8,
+            axis_config={"include_tip": False},
+        ).shift(DOWN * 2.1 + LEFT * 1.5)
+        v_label = Text("速度 (mm/s)", font_size=16).next_to(v_axes.x_axis, DOWN, buff=0.15)
+
+        distribution = v_axes.plot(
+            lambda v: np.interp(v, mm_per_s, density),
+            x_range=[-v_max, v_max],
+            use_vectorized=True,
+            color=GROUND_COLOR,
+            stroke_width=2,
+        )
+        transferred = v_axes.plot(
+            lambda v: np.interp(v, mm_per_s, selected_density),
+            x_range=[-v_max, v_max],
+            use_vectorized=True,
+            color=EXCITED_COLOR,
+            stroke_width=3,
+        )
+        transferred_area = v_axes.get_area(transferred, x_range=[-v_max, v_max], color=EXCITED_COLOR, opacity=0.4)
+
+        fidelity = thermal_pulse_fidelity(RABI, 10 * ATOM_TEMPERATURE, "pi")
+        selectivity_text = VGroup(
+            Text("πパルスで |e⟩ に移る原子", font_size=18, color=EXCITED_COLOR),
+            Text("= 速度が揃った原子だけ", font_size=18, color=WHITE),
+            Text(f"転送効率: {fidelity:.0%}", font_size=18, color=YELLOW),
+        ).arrange(DOWN, aligned_edge=LEFT, buff=0.15)
+        selectivity_text.next_to(v_axes, RIGHT, buff=0.5)
+
+        self.play(Create(v_axes), Write(v_label), Create(distribution))
+        self.play(Create(transferred), FadeIn(transferred_area), run_time=1.5)
+        self.play(Write(selectivity_text))
+        self.wait(2)
+
+        # フェードアウト
+        self.play(*[FadeOut(mob) for mob in self.mobjects])
@@ -0,0 +1,34 @@
+"""
+⁸⁷Rb と物理定数
+
+シーンと物理計算モジュールで共通に使う値（SI単位）
+"""
+
+import numpy as np
+
+# 基礎物理定数
+K_B = 1.38065e-23  # ボルツマン定数 [J/K]
+AMU = 1.66054e-27  # 原子質量単位 [kg]
+HBAR = 1.054571817e-34  # ディラック定数 [J·s]
+MU_B = 9.2740100783e-24  # ボーア磁子 [J/T]
+
+# ⁸⁷Rb
+M_RB87 = 87 * AMU  # ⁸⁷Rbの質量 [kg]
+
+# 地球
+G = 9.80665  # 標準重力加速度 [m/s²]
+GRAVITY_GRADIENT = 3.1e-6  # 鉛直方向の重力勾配 ∂g/∂z [1/s²]
+OMEGA_EARTH = 7.2921e-5  # 自転角速度 [rad/s]
+
+# ⁸⁷Rb D2線（5S₁/₂ → 5P₃/₂）
+WAVELENGTH_D2 = 780.241e-9  # 波長 [m]
+K_D2 = 2 * np.pi / WAVELENGTH_D2  # 波数 [1/m]
+GAMMA_D2 = 2 * np.pi * 6.0666e6  # 自然幅 [rad/s]
+I_SAT_D2 = 16.69  # 飽和強度（σ±サイクリング遷移）[W/m²]
+
+V_RECOIL = HBAR * K_D2 / M_RB87  # 反跳速度 [m/s]（約 5.9 mm/s）
+T_DOPPLER = HBAR * GAMMA_D2 / (2 * K_B)  # ドップラー限界温度 [K]（約 146 μK）
+
+# 対向ビームによる2光子ラマン遷移（原子干渉計）
+K_EFF = 2 * K_D2  # 実効波数 [1/m]
+V_RECOIL_EFF = HBAR * K_EFF / M_RB87  # 2光子反跳速度 [m/s]（約 1.2 cm/s）
@@ -0,0 +1,411 @@
+"""
+全シーンの一括並列レンダリング
+
+scripts/ 以下のモジュールをASTで走査してSceneサブクラスを列挙し、
+CPUコア数に合わせたプロセスプールで並列にレンダリングする
+
+使用方法:
+    python scripts/render_all.py                       # 全シーンを高画質で
+    python scripts/render_all.py -q l                  # 低画質プレビュー
+    python scripts/render_all.py -j 8                  # 8並列
+    python scripts/render_all.py --only Rb87LaserCooling MOTAnimation
+    python scripts/render_all.py --list                # 一覧表示のみ
+    python scripts/render_all.py --force               # 変更のないシーンも再レンダリング
+    python scripts/render_all.py --seed 7              # 乱数のシード値を変更（scene_rng）
+    python scripts/render_all.py --profile --force     # 時間の内訳を media/profiles/ に記録
+    python scripts/render_all.py --prewarm             # TeX・Text のリテラルを先に並列コンパイル
+    python scripts/render_all.py -q h --also l         # 1回のレンダリングで 1080p60 と 480p15 を書き出す
+
+ソースに変更のないシーンは media/render_manifest.json のハッシュと照合して省略する。
+"""
+
+import argparse
+import ast
+import importlib.util
+import os
+import sys
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import nullcontext, redirect_stderr, redirect_stdout
+from dataclasses import dataclass, field
+from pathlib import Path
+
+import glyph_cache
+import tex_cache
+from render_manifest import RenderManifest, manim_version, scene_hash
+from scene_rng import SEED_ENV
+
+SCRIPTS_DIR = Path(__file__).resolve().parent
+REPO_DIR = SCRIPTS_DIR.parent
+
+# manim の -q フラグと config["quality"] の対応
+QUALITY_NAMES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+# Scene として扱う manim の基底クラス
+SCENE_BASES = {
+    "Scene",
+    "MovingCameraScene",
+    "ThreeDScene",
+    "ZoomedScene",
+    "VectorScene",
+    "LinearTransformationScene",
+}
+
+
+@dataclass(frozen=True)
+class SceneJob:
+    """レンダリング対象のシーン（モジュールパスとクラス名）"""
+
+    script: Path
+    scene_name: str
+
+    @property
+    def module_name(self):
+        return self.script.stem
+
+    @property
+    def label(self):
+        return f"{self.module_name}:{self.scene_name}"
+
+
+@dataclass
+class RenderResult:
+    """1シーン分のレンダリング結果"""
+
+    job: SceneJob
+    status: str
+    elapsed: float
+    log_path: Path
+    output: str = ""
+    error: str = ""
+    # 同じレンダリングで書き出した他の画質の動画（-q フラグ → パス）
+    extra_outputs: dict = field(default_factory=dict)
+
+
+def _base_name(node):
+    """ast のクラス基底ノードから名前を取り出す（manim.Scene なども可）"""
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def find_scene_classes(script):
+    """モジュールをimportせずにASTからSceneサブクラス名を列挙する
+
+    同じモジュール内で Scene を継承したクラスをさらに継承している場合も拾う。
+    """
+    tree = ast.parse(Path(script).read_text(encoding="utf-8"), filename=str(script))
+    classes = [node for node in tree.body if isinstance(node, ast.ClassDef)]
+
+    scene_names = set()
+    changed = True
+    while changed:
+        changed = False
+        for node in classes:
+            if node.name in scene_names:
+                continue
+            bases = {_base_name(base) for base in node.bases}
+            if bases & (SCENE_BASES | scene_names):
+                scene_names.add(node.name)
+                changed = True
+
+    # ソース上の定義順を保つ
+    return [node.name for node in classes if node.name in scene_names]
+
+
+def discover_jobs(scripts_dir=SCRIPTS_DIR, only=None):
+    """scripts/*.py から全シーンのジョブを作成する"""
+    jobs = []
+    for script in sorted(Path(scripts_dir).glob("*.py")):
+        for scene_name in find_scene_classes(script):
+            job = SceneJob(script.resolve(), scene_name)
+            if only and scene_name not in only and job.label not in only:
+                continue
+            jobs.append(job)
+    return jobs
+
+
+def load_scene_module(script):
+    """manim CLI と同じ方法でシーンモジュールを読み込む"""
+    script = Path(script)
+    module_name = script.stem
+    spec = importlib.util.spec_from_file_location(module_name, script)
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[module_name] = module
+    if str(script.parent) not in sys.path:
+        sys.path.insert(0, str(script.parent))
+    spec.loader.exec_module(module)
+    return module
+
+
+def render_config(job, quality, media_dir):
+    """1シーン分の tempconfig に渡す設定"""
+    return {
+        "quality": QUALITY_NAMES[quality],
+        "media_dir": str(media_dir),
+        "input_file": str(job.script),
+        "scene_names": [job.scene_name],
+        "progress_bar": "none",
+        "preview": False,
+    }
+
+
+def render_scene(job, quality, media_dir, log_dir, load_module=load_scene_module,
+                 profile_dir=None, profile_detail=True, also=()):
+    """ワーカープロセス内で1シーンをレンダリングする
+
+    標準出力・標準エラー（manim のログを含む）はシーンごとのログファイルに書き出す。
+    load_module を差し替えると、読み込み済みモジュールを再利用できる（render_daemon.py）。
+    profile_dir を指定すると render_profiler で計測し、そこにプロファイルを書き出す
+    （profile_detail=False なら updater と Mobject の生成は計測しない）。
+    also に画質を渡すと、同じタイムラインからその画質の動画も書き出す（multi_quality）。
+    """
+    log_path = Path(log_dir) / f"{job.module_name}.{job.scene_name}.log"
+    start = time.perf_counter()
+    output = ""
+    error = ""
+    extra_outputs = {}
+
+    with open(log_path, "w", encoding="utf-8") as log, redirect_stdout(log), redirect_stderr(log):
+        try:
+            from manim import tempconfig
+
+            # TeX の SVG はワーカー・シーンをまたいで共有し（MANIM_TEX_CACHE=off で無効）、
+            # MANIM_GLYPH_CACHE で有効にしていれば、Text は文字ごとの輪郭から組み立てる
+            tex_cache.install()
+            glyph_cache.install()
+            module = load_module(job.script)
+            scene_cls = getattr(module, job.scene_name)
+            config = render_config(job, quality, media_dir)
+            profiler = None
+            if profile_dir is not None:
+                from render_profiler import RenderProfiler
+
+                profiler = RenderProfiler(job.scene_name, detailed=profile_detail)
+                # 部分動画のキャッシュがあると play が描画されず計測にならない
+                config["disable_caching"] = True
+            fanout = None
+            if also:
+                from multi_quality import FanOut
+
+                fanout = FanOut(also)
+                # キャッシュ済みの区間は描画されず、追加の画質にフレームが届かない
+                config["disable_caching"] = True
+            with tempconfig(config), profiler or nullcontext(), fanout or nullcontext():
+                scene = scene_cls()
+                scene.render()
+                output = str(scene.renderer.file_writer.movie_file_path)
+            if fanout is not None:
+                extra_outputs = {flag: str(path) for flag, path in fanout.paths.items()}
+            if profiler is not None:
+                profiler.write(profile_dir, f"{job.module_name}.{job.scene_name}")
+            status = "ok"
+        except Exception as exc:
+            traceback.print_exc()
+            status = "failed"
+            error = f"{type(exc).__name__}: {exc}"
+
+    return RenderResult(job, status, time.perf_counter() - start, log_path, output, error,
+                        extra_outputs)
+
+
+def run_jobs(jobs, quality="h", workers=None, media_dir=None, log_dir=None, on_result=None,
+             profile_dir=None, also=()):
+    """ジョブ一覧をプロセスプールで並列レンダリングし、結果を返す"""
+    media_dir = Path(media_dir or REPO_DIR / "media")
+    log_dir = Path(log_dir or media_dir / "logs" / QUALITY_NAMES[quality])
+    log_dir.mkdir(parents=True, exist_ok=True)
+    workers = workers or os.cpu_count() or 1
+
+    results = []
+    with ProcessPoolExecutor(max_workers=min(workers, max(len(jobs), 1))) as pool:
+        futures = {
+            pool.submit(render_scene, job, quality, media_dir, log_dir,
+                        profile_dir=profile_dir, also=also): job
+            for job in jobs
+        }
+        for future in as_completed(futures):
+            try:
+                result = future.result()
+            except Exception as exc:
+                # ワーカープロセス自体が落ちた場合
+                job = futures[future]
+                result = RenderResult(
+                    job, "crashed", 0.0,
+                    log_dir / f"{job.module_name}.{job.scene_name}.log",
+                    error=f"{type(exc).__name__}: {exc}",
+                )
+            results.append(result)
+            if on_result:
+                on_result(result)
+
+    order = {job: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda r: order[r.job])
+    return results
+
+
+def format_summary(results, wall_time):
+    """結果のサマリーテーブルを文字列で返す"""
+    headers = ("Scene", "Status", "Time [s]", "Output / Error")
+    rows = [
+        (
+            r.job.label,
+            r.status,
+            f"{r.elapsed:.1f}",
+            r.output if r.status in ("ok", "cached") else f"{r.error} ({r.log_path})",
+        )
+        for r in results
+    ]
+    widths = [
+        max(len(headers[i]), *(len(row[i]) for row in rows)) if rows else len(headers[i])
+        for i in range(3)
+    ]
+
+    lines = [
+        "  ".join(h.ljust(w) for h, w in zip(headers[:3], widths)) + "  " + headers[3],
+        "  ".join("-" * w for w in widths) + "  " + "-" * len(headers[3]),
+    ]
+    for row in rows:
+        lines.append("  ".join(c.ljust(w) for c, w in zip(row[:3], widths)) + "  " + row[3])
+
+    ok = sum(r.status in ("ok", "cached") for r in results)
+    cpu_time = sum(r.elapsed for r in results)
+    lines.append("")
+    lines.append(
+        f"{ok}/{len(results)} scenes rendered in {wall_time:.1f} s "
+        f"(sum of scene times {cpu_time:.1f} s)"
+    )
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="scripts/ 以下の全シーンを並列レンダリングする")
+    parser.add_argument("-q", "--quality", choices=sorted(QUALITY_NAMES), default="h",
+                        help="manim の -q フラグと同じ画質指定（既定: h）")
+    parser.add_argument("--also", nargs="+", choices=sorted(QUALITY_NAMES), default=[],
+                        metavar="Q",
+                        help="同じレンダリングで書き出す他の画質（-q より低いもの。例: -q h --also l）")
+    parser.add_argument("-j", "--jobs", type=int, default=None,
+                        help="並列ワーカー数（既定: CPUコア数）")
+    parser.add_argument("--only", nargs="+", metavar="SCENE",
+                        help="対象シーン名（Scene または module:Scene）")
+    parser.add_argument("--media-dir", type=Path, default=REPO_DIR / "media",
+                        help="manim の media_dir（既定: ./media）")
+    parser.add_argument("--log-dir", type=Path, default=None,
+                        help="シーンごとのログ出力先（既定: <media-dir>/logs/<quality>）")
+    parser.add_argument("--seed", type=int, default=None,
+                        help="scene_rng の乱数のシード値（既定: 環境変数 MANIM_SCENE_SEED または 42）")
+    parser.add_argument("--force", action="store_true",
+                        help="マニフェストを無視して全シーンを再レンダリングする")
+    parser.add_argument("--profile", type=Path, nargs="?", const=REPO_DIR / "media" / "profiles",
+                        default=None, metavar="DIR",
+                        help="render_profiler で時間の内訳を記録する（既定の出力先: media/profiles）")
+    parser.add_argument("--prewarm", action="store_true",
+                        help="レンダリングの前に TeX・Text のリテラルを並列にコンパイルする（prewarm.py）")
+    parser.add_argument("--list", action="store_true",
+                        help="レンダリングせずにシーン一覧を表示する")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    if args.seed is not None:
+        # ワーカープロセスは環境変数を引き継ぐ
+        os.environ[SEED_ENV] = str(args.seed)
+    jobs = discover_jobs(only=set(args.only) if args.only else None)
+
+    if args.list:
+        for job in jobs:
+            print(job.label)
+        print(f"\n{len(jobs)} scenes")
+        return 0
+
+    if not jobs:
+        print("レンダリング対象のシーンがありません", file=sys.stderr)
+        return 1
+
+    # --also があれば最も高い画質で描き、ほかの画質は同じレンダリングから書き出す
+    qualities = list(dict.fromkeys([args.quality, *args.also]))
+    quality = args.quality
+    if len(qualities) > 1:
+        from multi_quality import primary_quality
+
+        quality = primary_quality(qualities)
+    also = [q for q in qualities if q != quality]
+
+    # ソースのハッシュが変わっていないシーンは省略する（すべての画質が最新のときだけ）
+    manifest = RenderManifest(args.media_dir / "render_manifest.json")
+    version = manim_version()
+    digests = {
+        (job, q): scene_hash(job.script, job.scene_name, q, version)
+        for job in jobs for q in qualities
+    }
+    cached = []
+    if not args.force:
+        cached = [
+            job for job in jobs
+            if all(manifest.is_fresh(job.label, q, digests[(job, q)]) for q in qualities)
+        ]
+    pending = [job for job in jobs if job not in cached]
+
+    workers = args.jobs or os.cpu_count() or 1
+    print(
+        f"{len(pending)} scenes to render ({len(cached)} unchanged), "
+        f"{workers} workers, quality={QUALITY_NAMES[quality]}"
+        + (f" (+ {', '.join(QUALITY_NAMES[q] for q in also)})" if also else "")
+    )
+
+    def report(result):
+        print(f"[{result.status:>7}] {result.job.label} ({result.elapsed:.1f} s)", flush=True)
+        if result.status == "ok":
+            outputs = {quality: result.output, **result.extra_outputs}
+            for q, output in outputs.items():
+                manifest.record(result.job.label, q, digests[(result.job, q)], output)
+            manifest.save()
+
+    start = time.perf_counter()
+    if pending and args.prewarm:
+        from prewarm import prewarm
+
+        scripts = sorted({job.script for job in pending})
+        count, errors = prewarm(scripts, workers, args.media_dir)
+        print(f"prewarmed {count} literals from {len(scripts)} scripts "
+              f"({len(errors)} failed) in {time.perf_counter() - start:.1f} s")
+        for error in errors:
+            print(f"  {error}", file=sys.stderr)
+
+    results = []
+    if pending:
+        results = run_jobs(
+            pending,
+            quality=quality,
+            workers=workers,
+            media_dir=args.media_dir,
+            log_dir=args.log_dir,
+            on_result=report,
+            profile_dir=args.profile,
+            also=also,
+        )
+    results.extend(
+        RenderResult(job, "cached", 0.0, Path(), manifest.output_of(job.label, quality))
+        for job in cached
+    )
+    order = {job: i for i, job in enumerate(jobs)}
+    results.sort(key=lambda r: order[r.job])
+
+    print()
+    print(format_summary(results, time.perf_counter() - start))
+    return 0 if all(r.status in ("ok", "cached") for r in results) else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
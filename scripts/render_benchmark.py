@@ -0,0 +1,339 @@
+"""
+シーンのレンダリング時間のベンチマーク
+
+選んだシーンを画質ごとに繰り返しレンダリングし、レンダリング時間（中央値・最小・最大）、
+フレーム/秒、TeX・Pango のコンパイル回数、ピークメモリを記録して、
+保存しておいたベースラインと比べる。中央値がベースラインより threshold 以上遅い、
+またはピークメモリが同じ割合以上増えた組み合わせがあれば終了コード 1 を返す
+
+既定の対象は性質の違う3シーン:
+    Rb87LaserCooling   LiveFunctionGraph の点列と NumericReadout を毎フレーム書き換える
+    MOTAnimation       1万個の点を毎フレーム動かす（MOT のシミュレーションはアーカイブから）
+    PulseSequence      FunctionGraph と TeX のラベルが多い
+
+1回ごとに新しいプロセスでレンダリングするので、ピークメモリはその回だけのもの。
+時間は manim の import を除いたシーンの生成とレンダリングの時間（render_profiler の
+updater・生成を計測しないモードで、TeX・Pango の回数とフレーム数だけを数える）。
+manim の部分動画キャッシュは無効にするが、TeX・テキストの SVG は media ディレクトリに、
+TeX の SVG と文字の輪郭は共有キャッシュ（tex_cache・有効なら glyph_cache）に残るので、
+2回目以降は温まった状態になる。シミュレーションのアーカイブ（frame_archive）も同じで、
+ヒット・ミスと計算時間を回ごとに記録する（Sim 列は1回目に計算したアーカイブの数）。
+--cold では1回ごとに media ディレクトリと共有キャッシュ・アーカイブの場所を空の
+ディレクトリにするので、毎回 latex・Pango・シミュレーションから始まる
+
+使用方法:
+    python scripts/render_benchmark.py                         # 既定のシーン × l/m/h × 3回、ベースラインと比較
+    python scripts/render_benchmark.py --only MOTAnimation -q l m --repeat 5
+    python scripts/render_benchmark.py --all -q l              # 全シーン
+    python scripts/render_benchmark.py --save-baseline         # 今回の結果をベースラインにする
+    python scripts/render_benchmark.py --threshold 0.1 --cold
+
+結果は media/benchmarks/latest.json、ベースラインは media/benchmarks/baseline.json（既定）。
+時間は環境に依存するので、ベースラインは同じマシンで取ったものと比べる
+"""
+
+import argparse
+import json
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import frame_archive
+import glyph_cache
+import tex_cache
+from render_all import QUALITY_NAMES, REPO_DIR, discover_jobs, render_scene
+from render_manifest import manim_version
+
+BENCHMARK_DIR = REPO_DIR / "media" / "benchmarks"
+DEFAULT_BASELINE = BENCHMARK_DIR / "baseline.json"
+DEFAULT_SCENES = ("Rb87LaserCooling", "MOTAnimation", "PulseSequence")
+DEFAULT_QUALITIES = ("l", "m", "h")
+DEFAULT_THRESHOLD = 0.15
+
+
+def environment():
+    """ベースラインと比べてよいかを判断するための実行環境"""
+    return {
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+        "cpu_count": os.cpu_count(),
+        "python": platform.python_version(),
+        "manim": manim_version(),
+    }
+
+
+def cold_environment(media_dir):
+    """共有キャッシュを media_dir の中の空のディレクトリに向ける環境変数
+
+    glyph_cache はオプトインなので、有効にしているときだけ向け直す
+    """
+    env = {
+        tex_cache.CACHE_ENV: str(Path(media_dir) / "tex_cache"),
+        frame_archive.CACHE_ENV: str(Path(media_dir) / "sim_cache"),
+    }
+    if glyph_cache.cache_dir_from_env() is not None:
+        env[glyph_cache.CACHE_ENV] = str(Path(media_dir) / "glyph_cache")
+    return env
+
+
+def _set_environment(env):
+    os.environ.update(env)
+
+
+def run_once(job, quality, media_dir, work_dir, env=None):
+    """新しいプロセスで1回レンダリングし、計測値を返す
+
+    env はワーカープロセスで設定する環境変数（--cold の共有キャッシュの場所）
+    """
+    profile_dir = Path(work_dir) / "profiles"
+    log_dir = Path(work_dir) / "logs"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    with ProcessPoolExecutor(max_workers=1, initializer=_set_environment,
+                             initargs=(env or {},)) as pool:
+        result = pool.submit(
+            render_scene, job, quality, media_dir, log_dir,
+            profile_dir=profile_dir, profile_detail=False,
+        ).result()
+    if result.status != "ok":
+        raise RuntimeError(f"{job.label} ({quality}): {result.error} ({result.log_path})")
+
+    report_path = profile_dir / f"{job.module_name}.{job.scene_name}.profile.json"
+    report = json.loads(report_path.read_text(encoding="utf-8"))
+    stages = report["stages"]
+    return {
+        "render_time": report["wall_time"],
+        "total_time": result.elapsed,
+        "frames": report["frames_encoded"],
+        "tex_compiles": stages.get("tex_compile", {}).get("count", 0),
+        "pango_compiles": sum(
+            stages.get(stage, {}).get("count", 0) for stage in ("pango", "pango_markup")
+        ),
+        "peak_rss_mb": report["peak_rss_mb"],
+        "sim_archive": report.get("sim_archive") or {"hits": 0, "misses": 0, "compute_time": 0.0},
+    }
+
+
+def summarize(runs):
+    """繰り返しの計測値をまとめる（コンパイル・アーカイブの計算回数は1回目、メモリは最大値）"""
+    times = [run["render_time"] for run in runs]
+    median = statistics.median(times)
+    rss = [run["peak_rss_mb"] for run in runs if run["peak_rss_mb"] is not None]
+    return {
+        "render_time": {"median": median, "min": min(times), "max": max(times)},
+        "fps": runs[0]["frames"] / median if median > 0 else None,
+        "frames": runs[0]["frames"],
+        "tex_compiles": runs[0]["tex_compiles"],
+        "pango_compiles": runs[0]["pango_compiles"],
+        "sim_computes": runs[0]["sim_archive"]["misses"],
+        "peak_rss_mb": max(rss) if rss else None,
+        "runs": runs,
+    }
+
+
+def run_benchmark(jobs, qualities, repeat=3, cold=False, on_run=None):
+    """jobs × qualities を repeat 回ずつレンダリングし、{シーン: {画質: 要約}} を返す
+
+    時間のゆらぎ（温度や他のプロセス）が特定の組み合わせに偏らないよう、
+    繰り返しは外側のループにする
+    """
+    runs = {(job, quality): [] for job in jobs for quality in qualities}
+    work_dir = Path(tempfile.mkdtemp(prefix="render_benchmark_"))
+    try:
+        for i in range(repeat):
+            for job in jobs:
+                for quality in qualities:
+                    env = None
+                    if cold:
+                        media_dir = work_dir / f"media-{i}-{job.scene_name}-{quality}"
+                        env = cold_environment(media_dir)
+                    else:
+                        media_dir = BENCHMARK_DIR / "media"
+                    run = run_once(job, quality, media_dir, work_dir, env)
+                    runs[(job, quality)].append(run)
+                    if on_run:
+                        on_run(job, quality, i, run)
+                    if cold:
+                        shutil.rmtree(media_dir, ignore_errors=True)
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    results = {}
+    for (job, quality), scene_runs in runs.items():
+        results.setdefault(job.scene_name, {})[quality] = summarize(scene_runs)
+    return results
+
+
+def compare(results, baseline, threshold=DEFAULT_THRESHOLD):
+    """ベースラインとの比較結果の行 (シーン, 画質, 基準 [s], 今回 [s], 比, 状態) を返す
+
+    状態は ok / faster / slower（時間の中央値が threshold 以上変化）/ memory（ピークメモリが
+    threshold 以上増加）/ new（ベースラインにない）
+    """
+    rows = []
+    for scene, qualities in results.items():
+        for quality, current in qualities.items():
+            base = baseline.get(scene, {}).get(quality)
+            now = current["render_time"]["median"]
+            if base is None:
+                rows.append((scene, quality, None, now, None, "new"))
+                continue
+            before = base["render_time"]["median"]
+            ratio = now / before if before > 0 else float("inf")
+            status = "ok"
+            if ratio > 1 + threshold:
+                status = "slower"
+            elif ratio < 1 - threshold:
+                status = "faster"
+            if (status != "slower" and current["peak_rss_mb"] and base.get("peak_rss_mb")
+                    and current["peak_rss_mb"] > base["peak_rss_mb"] * (1 + threshold)):
+                status = "memory"
+            rows.append((scene, quality, before, now, ratio, status))
+    return rows
+
+
+def format_results(results, rows):
+    """結果と比較のテーブルを文字列で返す"""
+    headers = ("Scene", "Q", "Median [s]", "Min [s]", "FPS", "TeX", "Pango", "Sim", "RSS [MB]",
+               "Baseline [s]", "Ratio", "Status")
+    compared = {(scene, quality): row for scene, quality, *row in rows}
+    table = []
+    for scene, qualities in results.items():
+        for quality, r in qualities.items():
+            before, _, ratio, status = compared[(scene, quality)]
+            table.append((
+                scene,
+                quality,
+                f"{r['render_time']['median']:.2f}",
+                f"{r['render_time']['min']:.2f}",
+                f"{r['fps']:.1f}" if r["fps"] else "-",
+                str(r["tex_compiles"]),
+                str(r["pango_compiles"]),
+                str(r.get("sim_computes", "-")),
+                f"{r['peak_rss_mb']:.0f}" if r["peak_rss_mb"] is not None else "-",
+                f"{before:.2f}" if before is not None else "-",
+                f"{ratio:.2f}" if ratio is not None else "-",
+                status,
+            ))
+    widths = [max(len(headers[i]), *(len(row[i]) for row in table)) if table else len(headers[i])
+              for i in range(len(headers))]
+    lines = [
+        "  ".join(h.ljust(w) for h, w in zip(headers, widths)),
+        "  ".join("-" * w for w in widths),
+    ]
+    lines.extend("  ".join(c.ljust(w) for c, w in zip(row, widths)) for row in table)
+    return "\n".join(lines)
+
+
+def write_json(path, data):
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.tmp")
+    tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False) + "\n", encoding="utf-8")
+    os.replace(tmp, path)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="シーンのレンダリング時間を計測してベースラインと比べる")
+    parser.add_argument("--only", nargs="+", metavar="SCENE", default=list(DEFAULT_SCENES),
+                        help="対象シーン名（Scene または module:Scene、既定: 代表的な3シーン）")
+    parser.add_argument("--all", action="store_true", help="scripts/ 以下の全シーンを対象にする")
+    parser.add_argument("-q", "--quality", nargs="+", choices=sorted(QUALITY_NAMES),
+                        default=list(DEFAULT_QUALITIES), help="画質（既定: l m h）")
+    parser.add_argument("--repeat", type=int, default=3, help="繰り返し回数（既定: 3）")
+    parser.add_argument("--cold", action="store_true",
+                        help="毎回空の media ディレクトリでレンダリングする"
+                             "（TeX・Pango のキャッシュ、シミュレーションのアーカイブなし）")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE,
+                        help="比較するベースライン（既定: media/benchmarks/baseline.json）")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="遅くなったとみなす割合（既定: 0.15 = 15%%）")
+    parser.add_argument("--save-baseline", action="store_true",
+                        help="今回の結果をベースラインとして保存する（同じシーン・画質の値は置き換える）")
+    parser.add_argument("-o", "--output", type=Path, default=BENCHMARK_DIR / "latest.json",
+                        help="結果の出力先（既定: media/benchmarks/latest.json）")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    only = None if args.all else set(args.only)
+    jobs = discover_jobs(only=only)
+    if only:
+        found = {job.scene_name for job in jobs} | {job.label for job in jobs}
+        missing = sorted(only - found)
+        if missing:
+            print(f"シーンが見つかりません: {', '.join(missing)}", file=sys.stderr)
+            return 1
+    if not jobs:
+        print("対象のシーンがありません", file=sys.stderr)
+        return 1
+
+    print(f"{len(jobs)} scenes × {len(args.quality)} qualities × {args.repeat} runs"
+          + (" (cold)" if args.cold else ""))
+
+    def report(job, quality, i, run):
+        print(f"[{i + 1}/{args.repeat}] {job.label} -q{quality}: "
+              f"{run['render_time']:.2f} s, {run['frames']} frames, "
+              f"TeX {run['tex_compiles']}, Pango {run['pango_compiles']}, "
+              f"Sim {run['sim_archive']['misses']}", flush=True)
+
+    start = time.perf_counter()
+    try:
+        results = run_benchmark(jobs, args.quality, args.repeat, args.cold, on_run=report)
+    except RuntimeError as exc:
+        print(f"レンダリングに失敗しました: {exc}", file=sys.stderr)
+        return 1
+
+    data = {
+        "created": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        "environment": environment(),
+        "repeat": args.repeat,
+        "cold": args.cold,
+        "results": results,
+    }
+    write_json(args.output, data)
+
+    baseline = {}
+    if args.baseline.exists():
+        stored = json.loads(args.baseline.read_text(encoding="utf-8"))
+        baseline = stored["results"]
+        if stored.get("environment") != data["environment"]:
+            print("注意: ベースラインは別の環境で計測されています", file=sys.stderr)
+        if stored.get("cold") != args.cold:
+            print("注意: ベースラインとキャッシュの条件（--cold）が異なります", file=sys.stderr)
+    rows = compare(results, baseline, args.threshold)
+
+    print()
+    print(format_results(results, rows))
+    for scene, qualities in results.items():
+        for quality, current in qualities.items():
+            base = baseline.get(scene, {}).get(quality)
+            if base is not None and base.get("sim_computes") != current["sim_computes"]:
+                print(f"注意: {scene} -q{quality} はシミュレーションのアーカイブの状態が"
+                      f"ベースラインと異なります（計算 {base.get('sim_computes', '?')} → "
+                      f"{current['sim_computes']} 回）", file=sys.stderr)
+    print(f"\n{time.perf_counter() - start:.1f} s, results: {args.output}")
+
+    if args.save_baseline:
+        merged = {scene: dict(qualities) for scene, qualities in baseline.items()}
+        for scene, qualities in results.items():
+            merged.setdefault(scene, {}).update(qualities)
+        write_json(args.baseline, {**data, "results": merged})
+        print(f"baseline saved: {args.baseline}")
+        return 0
+
+    regressions = [row for row in rows if row[5] in ("slower", "memory")]
+    if regressions:
+        print(f"\n{len(regressions)} regressions (threshold {args.threshold:.0%})", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,276 @@
+"""
+manim を読み込んだまま待機するレンダリングデーモン
+
+manim の起動（from manim import *、Pango/Cairo とフォントマップの初期化、
+TeX テンプレートのコンパイル）を1度だけ行い、Unixソケットでジョブを受け付ける。
+ジョブごとに変更のあった scripts/ のモジュールだけを読み込み直すので、
+DistanceFormula のような短いシーンのプレビューがすぐに返ってくる
+
+使用方法:
+    python scripts/render_daemon.py serve &                     # デーモン起動
+    python scripts/render_daemon.py render scripts/distance_formula_animation.py DistanceFormula -q l
+    python scripts/render_daemon.py render scripts/mach_zehnder_animation.py MachZehnderAtomic --profile
+    python scripts/render_daemon.py ping
+    python scripts/render_daemon.py stop
+
+プロトコル:
+    1接続につき JSON 1行のリクエストを送り、JSON 1行のレスポンスを受け取る。
+    {"command": "render", "script": "...", "scene": "...", "quality": "l", "profile": false}
+"""
+
+import argparse
+import ast
+import json
+import os
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+
+from render_all import (
+    QUALITY_NAMES,
+    REPO_DIR,
+    SCRIPTS_DIR,
+    SceneJob,
+    load_scene_module,
+    render_scene,
+)
+import glyph_cache
+import tex_cache
+from render_manifest import local_imports
+
+DEFAULT_SOCKET = REPO_DIR / "media" / "render_daemon.sock"
+
+
+class ModuleReloader:
+    """scripts/ のモジュールを変更があったときだけ読み込み直す
+
+    変更されたモジュールと、それを（間接的に）import しているモジュールだけを
+    sys.modules から外す。変更のない補助モジュール（グリフキャッシュなど）は保持される。
+    デーモン自身が起動時に読み込んだモジュールは対象外。
+    """
+
+    def __init__(self, scripts_dir=SCRIPTS_DIR):
+        self.scripts_dir = Path(scripts_dir).resolve()
+        self.mtimes = {}
+        self.pinned = set()
+        self.pinned = set(self._local_modules()) | {"__main__"}
+
+    def _local_modules(self):
+        modules = {}
+        for name, module in list(sys.modules.items()):
+            path = getattr(module, "__file__", None)
+            if name in self.pinned or not path:
+                continue
+            if Path(path).resolve().parent == self.scripts_dir:
+                modules[name] = Path(path).resolve()
+        return modules
+
+    def invalidate_changed(self):
+        """変更のあったモジュールを sys.modules から外し、その名前を返す"""
+        modules = self._local_modules()
+        stale = {
+            name for name, path in modules.items()
+            if not path.exists() or path.stat().st_mtime_ns != self.mtimes.get(path)
+        }
+
+        # 変更されたモジュールを import しているモジュールも読み込み直す
+        deps = {}
+        for name, path in modules.items():
+            if path.exists():
+                tree = ast.parse(path.read_text(encoding="utf-8"))
+                deps[name] = set(local_imports(tree, self.scripts_dir))
+        changed = True
+        while changed:
+            changed = False
+            for name, imports in deps.items():
+                if name not in stale and imports & stale:
+                    stale.add(name)
+                    changed = True
+
+        for name in stale:
+            sys.modules.pop(name, None)
+            self.mtimes.pop(modules[name], None)
+        return sorted(stale)
+
+    def load(self, script):
+        """シーンモジュールを返す（変更がなければ読み込み済みのものを再利用）"""
+        script = Path(script).resolve()
+        module = sys.modules.get(script.stem)
+        if module is None or getattr(module, "__file__", None) is None:
+            module = load_scene_module(script)
+        # 新たに読み込まれたモジュールの更新時刻を記録する
+        for path in self._local_modules().values():
+            self.mtimes.setdefault(path, path.stat().st_mtime_ns)
+        return module
+
+
+def warm_up(media_dir):
+    """manim・Pango のフォントマップ・TeX テンプレートを初期化しておく"""
+    from manim import MathTex, Text, tempconfig
+
+    tex_cache.install()
+    glyph_cache.install()
+    with tempconfig({"media_dir": str(media_dir), "progress_bar": "none"}):
+        Text("ウォームアップ 0123456789")
+        MathTex(r"|g\rangle")
+
+
+class RenderHandler(socketserver.StreamRequestHandler):
+    def handle(self):
+        try:
+            request = json.loads(self.rfile.readline().decode("utf-8"))
+            response = self.server.dispatch(request)
+        except Exception as exc:
+            response = {"status": "error", "error": f"{type(exc).__name__}: {exc}"}
+        self.wfile.write((json.dumps(response, ensure_ascii=False) + "\n").encode("utf-8"))
+
+
+class RenderDaemon(socketserver.UnixStreamServer):
+    """ジョブを1件ずつ順番に処理するサーバー（manim の config はプロセス共通のため）"""
+
+    def __init__(self, socket_path, media_dir):
+        self.socket_path = Path(socket_path)
+        self.media_dir = Path(media_dir)
+        self.log_dir = self.media_dir / "logs" / "daemon"
+        self.log_dir.mkdir(parents=True, exist_ok=True)
+        self.reloader = ModuleReloader()
+        self.started = time.time()
+        self.rendered = 0
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(str(self.socket_path), RenderHandler)
+
+    def dispatch(self, request):
+        command = request.get("command")
+        if command == "ping":
+            return {
+                "status": "ok",
+                "pid": os.getpid(),
+                "uptime": time.time() - self.started,
+                "rendered": self.rendered,
+            }
+        if command == "stop":
+            # shutdown() は serve_forever のループ終了を待つので別スレッドから呼ぶ
+            threading.Thread(target=self.shutdown, daemon=True).start()
+            return {"status": "ok"}
+        if command == "render":
+            return self.render(request)
+        return {"status": "error", "error": f"unknown command: {command}"}
+
+    def render(self, request):
+        quality = request.get("quality", "l")
+        if quality not in QUALITY_NAMES:
+            return {"status": "error", "error": f"unknown quality: {quality}"}
+
+        reloaded = self.reloader.invalidate_changed()
+        job = SceneJob(Path(request["script"]).resolve(), request["scene"])
+        profile_dir = self.media_dir / "profiles" if request.get("profile") else None
+        result = render_scene(
+            job, quality, self.media_dir, self.log_dir, load_module=self.reloader.load,
+            profile_dir=profile_dir,
+        )
+        self.rendered += 1
+        return {
+            "status": result.status,
+            "elapsed": result.elapsed,
+            "output": result.output,
+            "error": result.error,
+            "log": str(result.log_path),
+            "reloaded": reloaded,
+            "profile": str(profile_dir) if profile_dir else None,
+        }
+
+    def server_close(self):
+        super().server_close()
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+
+
+def send_request(request, socket_path=DEFAULT_SOCKET):
+    """デーモンにリクエストを送り、レスポンスを返す"""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.connect(str(socket_path))
+        sock.sendall((json.dumps(request) + "\n").encode("utf-8"))
+        with sock.makefile("r", encoding="utf-8") as stream:
+            return json.loads(stream.readline())
+
+
+def serve(socket_path, media_dir):
+    start = time.perf_counter()
+    warm_up(media_dir)
+    print(f"manim warmed up in {time.perf_counter() - start:.1f} s", flush=True)
+
+    with RenderDaemon(socket_path, media_dir) as daemon:
+        print(f"listening on {socket_path}", flush=True)
+        try:
+            daemon.serve_forever(poll_interval=0.2)
+        except KeyboardInterrupt:
+            pass
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="manim を常駐させるレンダリングデーモン")
+    parser.add_argument("--socket", type=Path, default=DEFAULT_SOCKET,
+                        help="Unixソケットのパス（既定: media/render_daemon.sock）")
+    sub = parser.add_subparsers(dest="command", required=True)
+
+    serve_parser = sub.add_parser("serve", help="デーモンを起動する")
+    serve_parser.add_argument("--media-dir", type=Path, default=REPO_DIR / "media")
+
+    render_parser = sub.add_parser("render", help="シーンのレンダリングを依頼する")
+    render_parser.add_argument("script", type=Path)
+    render_parser.add_argument("scene")
+    render_parser.add_argument("-q", "--quality", choices=sorted(QUALITY_NAMES), default="l")
+    render_parser.add_argument("--profile", action="store_true",
+                               help="render_profiler で計測して media/profiles/ に書き出す")
+
+    sub.add_parser("ping", help="デーモンの状態を表示する")
+    sub.add_parser("stop", help="デーモンを停止する")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+
+    if args.command == "serve":
+        serve(args.socket, args.media_dir)
+        return 0
+
+    if args.command == "render":
+        request = {
+            "command": "render",
+            "script": str(args.script.resolve()),
+            "scene": args.scene,
+            "quality": args.quality,
+            "profile": args.profile,
+        }
+    else:
+        request = {"command": args.command}
+
+    start = time.perf_counter()
+    try:
+        response = send_request(request, args.socket)
+    except (FileNotFoundError, ConnectionRefusedError):
+        print(f"デーモンが起動していません: {args.socket}", file=sys.stderr)
+        return 1
+
+    if args.command == "render":
+        if response.get("reloaded"):
+            print(f"reloaded: {', '.join(response['reloaded'])}")
+        print(f"[{response['status']}] {args.scene} "
+              f"(render {response.get('elapsed', 0):.2f} s, "
+              f"round trip {time.perf_counter() - start:.2f} s)")
+        print(response.get("output") or f"{response.get('error')} ({response.get('log', '')})")
+        if response.get("profile"):
+            print(f"profile: {response['profile']}")
+    else:
+        print(json.dumps(response, ensure_ascii=False))
+    return 0 if response.get("status") == "ok" else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
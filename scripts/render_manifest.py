@@ -0,0 +1,195 @@
+"""
+レンダリング済みシーンのビルドマニフェスト
+
+シーンごとにソースのハッシュ（クラス本体・ヘルパーメソッド・モジュールレベルの
+関数と定数・scripts/ 内の補助モジュール）、manim のバージョン、画質フラグを記録し、
+ハッシュが変わっていないシーンの再レンダリングを省略する
+
+ハッシュは ast.dump() から計算するため、コメントや空白だけの変更では変化しない。
+同じファイル内の別シーンを編集しても、そのシーンのハッシュには影響しない。
+scene_rng を使うシーンは乱数のシード値もハッシュに含める。
+glyph_cache（文字ごとの輪郭から Text を組み立てる）を有効にしていればそれも含める。
+"""
+
+import ast
+import hashlib
+import inspect
+import json
+import time
+from importlib import metadata
+from pathlib import Path
+
+import glyph_cache
+from scene_rng import base_seed
+
+MANIFEST_VERSION = 1
+
+
+def manim_version():
+    """manim を import せずにインストール済みのバージョンを返す"""
+    try:
+        return metadata.version("manim")
+    except metadata.PackageNotFoundError:
+        return "unknown"
+
+
+def _parse(script):
+    return ast.parse(Path(script).read_text(encoding="utf-8"), filename=str(script))
+
+
+def local_imports(tree, scripts_dir):
+    """scripts/ 内の補助モジュールへの import を列挙する"""
+    names = []
+    for node in tree.body:
+        if isinstance(node, ast.Import):
+            names.extend(alias.name.split(".")[0] for alias in node.names)
+        elif isinstance(node, ast.ImportFrom) and node.module and node.level == 0:
+            names.append(node.module.split(".")[0])
+    return [name for name in names if (Path(scripts_dir) / f"{name}.py").exists()]
+
+
+def imported_modules(script):
+    """シーンモジュールが（間接的に）import している scripts/ 内のモジュール名"""
+    script = Path(script).resolve()
+    scripts_dir = script.parent
+    found = set()
+    pending = [script]
+    while pending:
+        tree = _parse(pending.pop())
+        for name in local_imports(tree, scripts_dir):
+            if name not in found:
+                found.add(name)
+                pending.append(scripts_dir / f"{name}.py")
+    return found
+
+
+def _module_digest(script, scripts_dir, seen):
+    """補助モジュール全体（とその補助モジュール）の AST ダイジェスト"""
+    script = Path(script).resolve()
+    if script in seen:
+        return ""
+    seen.add(script)
+    tree = _parse(script)
+    parts = [ast.dump(tree)]
+    for name in sorted(set(local_imports(tree, scripts_dir))):
+        parts.append(_module_digest(Path(scripts_dir) / f"{name}.py", scripts_dir, seen))
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def module_digest(script):
+    """補助モジュール1つ（と、それが import する scripts/ 内のモジュール）のダイジェスト"""
+    script = Path(script).resolve()
+    return _module_digest(script, script.parent, set())
+
+
+def function_digest(function):
+    """関数を定義したモジュール全体（と、それが import する scripts/ 内のモジュール）のダイジェスト
+
+    シミュレーション結果のキャッシュ（frame_archive）のキーに使い、計算のコードが
+    変わったら別のキーになるようにする。関数の本体だけでは、construct 内の別の
+    ヘルパー関数や正規化の値など、クロージャで参照しているものの変更を見落とすので、
+    定義しているモジュール全体を対象にする（同じファイルの別の変更でも再計算になる）
+    """
+    source_file = Path(inspect.getsourcefile(function) or "").resolve()
+    if source_file.is_file():
+        return module_digest(source_file)
+    # ファイルのない関数（対話環境で定義したものなど）はバイトコードで代用する
+    return hashlib.sha256(function.__code__.co_code).hexdigest()
+
+
+def scene_source_digest(script, scene_name):
+    """1シーンが依存するソースだけから計算したダイジェスト
+
+    対象:
+        - シーンクラス本体（construct とヘルパーメソッド）
+        - 同じモジュール内で継承している基底クラス
+        - モジュールレベルの import・関数・定数（他のクラスは含めない）
+        - import している scripts/ 内の補助モジュール
+    """
+    script = Path(script).resolve()
+    scripts_dir = script.parent
+    tree = _parse(script)
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    if scene_name not in classes:
+        raise KeyError(f"{scene_name} is not defined in {script.name}")
+
+    # シーンクラスと、モジュール内の基底クラスを辿る
+    class_nodes = []
+    pending = [scene_name]
+    while pending:
+        name = pending.pop()
+        node = classes.get(name)
+        if node is None or node in class_nodes:
+            continue
+        class_nodes.append(node)
+        pending.extend(base.id for base in node.bases if isinstance(base, ast.Name))
+
+    parts = [ast.dump(node) for node in tree.body if not isinstance(node, ast.ClassDef)]
+    parts.extend(ast.dump(node) for node in class_nodes)
+
+    seen = {script}
+    for name in sorted(set(local_imports(tree, scripts_dir))):
+        parts.append(_module_digest(scripts_dir / f"{name}.py", scripts_dir, seen))
+
+    return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+
+def scene_hash(script, scene_name, quality, version=None):
+    """ソース・manim バージョン・画質フラグ（・乱数のシード値）を合わせたシーンのハッシュ"""
+    key = {
+        "manifest": MANIFEST_VERSION,
+        "source": scene_source_digest(script, scene_name),
+        "manim": version or manim_version(),
+        "quality": quality,
+    }
+    if "scene_rng" in imported_modules(script):
+        key["seed"] = base_seed()
+    # 文字ごとの輪郭から組み立てた Text は Pango のものと字詰めが違う
+    if glyph_cache.cache_dir_from_env() is not None:
+        key["glyphs"] = "composed"
+    return hashlib.sha256(json.dumps(key, sort_keys=True).encode()).hexdigest()
+
+
+class RenderManifest:
+    """media/render_manifest.json の読み書き
+
+    エントリは "<quality>/<module>:<Scene>" をキーに、ハッシュと出力ファイルを保持する。
+    """
+
+    def __init__(self, path):
+        self.path = Path(path)
+        self.entries = {}
+        if self.path.exists():
+            data = json.loads(self.path.read_text(encoding="utf-8"))
+            if data.get("version") == MANIFEST_VERSION:
+                self.entries = data.get("scenes", {})
+
+    @staticmethod
+    def key(label, quality):
+        return f"{quality}/{label}"
+
+    def is_fresh(self, label, quality, digest):
+        """ハッシュが一致し、出力ファイルも残っていれば True"""
+        entry = self.entries.get(self.key(label, quality))
+        if entry is None or entry.get("hash") != digest:
+            return False
+        output = entry.get("output")
+        return bool(output) and Path(output).exists()
+
+    def output_of(self, label, quality):
+        entry = self.entries.get(self.key(label, quality))
+        return entry.get("output", "") if entry else ""
+
+    def record(self, label, quality, digest, output):
+        self.entries[self.key(label, quality)] = {
+            "hash": digest,
+            "output": str(output),
+            "rendered_at": time.strftime("%Y-%m-%dT%H:%M:%S"),
+        }
+
+    def save(self):
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        data = {"version": MANIFEST_VERSION, "scenes": dict(sorted(self.entries.items()))}
+        tmp = self.path.with_suffix(".tmp")
+        tmp.write_text(json.dumps(data, indent=2, ensure_ascii=False), encoding="utf-8")
+        tmp.replace(self.path)
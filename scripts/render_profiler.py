@@ -0,0 +1,505 @@
+"""
+レンダリング時間の内訳を記録するプロファイラ（オプトイン）
+
+インストールしているあいだだけ manim の関数を差し替え、
+    Scene.play / Scene.wait          play ごとの実時間・動画上の長さ・書き出したフレーム数
+    Mobject の updater               updater（関数の __qualname__）ごとの呼び出し回数と時間
+    Mobject の生成（__init__）        型ごとの生成回数と時間（部分 Mobject の生成を含む）
+    TeX・dvisvgm・Pango              要求回数と実際のコンパイル回数・時間
+    frame_archive                    シミュレーションのアーカイブのヒット・ミスと計算時間
+    Cairo のラスタライズ・ffmpeg      capture_mobjects と write_frame の時間
+を計測する。シーンごとに
+    <名前>.profile.json   上の集計とピーク RSS（Linux ではシーンごと、それ以外はワーカープロセスの値）
+    <名前>.folded         フレームグラフ用の折りたたみスタック（flamegraph.pl・speedscope で表示、重みは μs）
+を書き出す。manim のバージョンによって存在しない関数は計測せずに飛ばす。
+計測中は manim の部分動画キャッシュを無効にする（キャッシュ済みの play は描画されないため）
+
+使用方法:
+    python scripts/render_profiler.py scripts/mach_zehnder_animation.py MachZehnderAtomic -q l
+    python scripts/render_profiler.py --show media/profiles/mach_zehnder_animation.MachZehnderAtomic.profile.json
+    python scripts/render_all.py -q l --only MOTAnimation --force --profile
+    python scripts/render_daemon.py render scripts/laser_cooling_animation.py MOTAnimation --profile
+
+使用例:
+    with RenderProfiler("MachZehnderAtomic") as profiler:
+        MachZehnderAtomic().render()
+    profiler.write(Path("media/profiles"))
+"""
+
+import argparse
+import functools
+import inspect
+import json
+import sys
+import time
+from collections import defaultdict
+from contextlib import contextmanager
+from pathlib import Path
+
+import frame_archive
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+REPO_DIR = Path(__file__).resolve().parent.parent
+DEFAULT_PROFILE_DIR = REPO_DIR / "media" / "profiles"
+
+# 差し替え前に属性がなかったことを表す印
+_MISSING = object()
+
+
+def reset_peak_rss():
+    """ピーク RSS（/proc/self/status の VmHWM）を現在の RSS に戻す（Linux のみ）
+
+    ワーカープロセスを使い回すと ru_maxrss はそれまでのシーンの最大値のままなので、
+    シーンごとのピークを測るときは計測の前に呼ぶ
+
+    Returns:
+        戻せたら True
+    """
+    try:
+        with open("/proc/self/clear_refs", "w") as clear_refs:
+            clear_refs.write("5")
+        return True
+    except OSError:
+        return False
+
+
+def _vm_hwm_mb():
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    return None
+
+
+def peak_rss_mb(since_reset=False):
+    """ピーク RSS [MB]（取得できない環境では None）
+
+    since_reset が True なら reset_peak_rss() 以降のピーク（VmHWM）、
+    False ならプロセスの起動からのピーク（ru_maxrss）
+    """
+    if since_reset:
+        return _vm_hwm_mb()
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux は KB、macOS はバイト単位
+    return peak / (1 << 20) if sys.platform == "darwin" else peak / 1024
+
+
+def animation_name(animation):
+    """play の引数の表示名（例: Create(Circle)、animate(Dot)）"""
+    name = type(animation).__name__
+    if name == "_AnimationBuilder":
+        name = "animate"
+    mobject = getattr(animation, "mobject", None)
+    return f"{name}({type(mobject).__name__})" if mobject is not None else name
+
+
+def updater_name(updater):
+    return getattr(updater, "__qualname__", type(updater).__name__)
+
+
+def _all_subclasses(cls):
+    """cls とその（間接的な）サブクラス（重複なし）"""
+    seen = {cls: None}
+    stack = [cls]
+    while stack:
+        for sub in stack.pop().__subclasses__():
+            if sub not in seen:
+                seen[sub] = None
+                stack.append(sub)
+    return list(seen)
+
+
+def _stat():
+    return {"count": 0, "time": 0.0}
+
+
+def _sorted_stats(stats):
+    return dict(sorted(stats.items(), key=lambda item: item[1]["time"], reverse=True))
+
+
+class _Span:
+    __slots__ = ("name", "child", "elapsed")
+
+    def __init__(self, name):
+        self.name = name
+        self.child = 0.0
+        self.elapsed = 0.0
+
+
+class RenderProfiler:
+    """1シーン分の計測（with 文のあいだだけ manim の関数を差し替える）
+
+    Args:
+        name: シーン名（フレームグラフの根になる）
+        detailed: False にすると updater と Mobject の生成を計測しない
+            （オーバーヘッドが小さいので、ベンチマークで回数だけを数えるときに使う）
+    """
+
+    def __init__(self, name, detailed=True):
+        self.name = name
+        self.detailed = detailed
+        self.wall_time = 0.0
+        self.frames = 0
+        self.plays = []
+        self.updaters = defaultdict(_stat)
+        self.constructions = defaultdict(_stat)
+        self.stages = defaultdict(_stat)
+        self.folded = defaultdict(float)
+        self._stack = []
+        self._patches = []
+        self._building = set()
+        self._signatures = {}
+        self._in_play = False
+        self._start = None
+        self._archive_start = None
+        self.sim_archive = None
+        self._rss_reset = False
+        self.peak_rss = None
+
+    # --- 計測の区間 ---
+
+    @contextmanager
+    def span(self, name):
+        """フレームグラフの1区間（入れ子にでき、自分自身の時間だけをスタックに加算する）"""
+        span = _Span(name.replace(";", ",").replace("\n", " "))
+        self._stack.append(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        finally:
+            span.elapsed = time.perf_counter() - start
+            self._stack.pop()
+            path = ";".join([self.name, *(s.name for s in self._stack), span.name])
+            self.folded[path] += span.elapsed - span.child
+            if self._stack:
+                self._stack[-1].child += span.elapsed
+
+    def _timed(self, stats, key, label, func, args, kwargs):
+        with self.span(label) as span:
+            result = func(*args, **kwargs)
+        stat = stats[key]
+        stat["count"] += 1
+        stat["time"] += span.elapsed
+        return result
+
+    # --- 差し替え ---
+
+    def _set(self, owner, attr, value):
+        saved = vars(owner).get(attr, _MISSING)
+        if isinstance(saved, staticmethod):
+            value = staticmethod(value)
+        try:
+            setattr(owner, attr, value)
+        except (AttributeError, TypeError):
+            # Cython の型など書き換えられないものは計測しない
+            return False
+        self._patches.append((owner, attr, saved))
+        return True
+
+    def _patch_stage(self, owner, attr, stage):
+        """owner.attr の呼び出しを stages[stage] に記録する"""
+        original = getattr(owner, attr, None)
+        if original is None:
+            return None
+        profiler = self
+
+        @functools.wraps(original)
+        def wrapper(*args, **kwargs):
+            return profiler._timed(profiler.stages, stage, stage, original, args, kwargs)
+
+        return wrapper if self._set(owner, attr, wrapper) else None
+
+    def _patch_function(self, module_name, attr, stage):
+        """モジュール関数を、from import で同じ関数を参照している manim のモジュールごと差し替える"""
+        module = sys.modules.get(module_name)
+        original = getattr(module, attr, None) if module else None
+        wrapper = self._patch_stage(module, attr, stage) if original else None
+        if wrapper is None:
+            return
+        for name, other in list(sys.modules.items()):
+            if other is not module and name.startswith("manim") and vars(other).get(attr) is original:
+                self._set(other, attr, wrapper)
+
+    def install(self):
+        from manim.camera.camera import Camera
+        from manim.mobject.mobject import Mobject
+        from manim.scene.scene import Scene
+        from manim.scene.scene_file_writer import SceneFileWriter
+
+        # sys.modules に載せる
+        import manim.utils.tex_file_writing  # noqa: F401
+
+        profiler = self
+        original_play = Scene.play
+        original_wait = Scene.wait
+        original_write_frame = SceneFileWriter.write_frame
+
+        @functools.wraps(original_play)
+        def play(scene, *args, **kwargs):
+            names = [animation_name(a) for a in args]
+            return profiler._record_play(original_play, scene, "play", names, args, kwargs)
+
+        @functools.wraps(original_wait)
+        def wait(scene, *args, **kwargs):
+            # Scene.wait は内部で play(Wait(...)) を呼ぶので、外側の wait として1回だけ記録する
+            return profiler._record_play(original_wait, scene, "wait", [], args, kwargs)
+
+        def update(mob, dt=0, recursive=True):
+            # Mobject.update と同じ処理を updater ごとに計測しながら行う
+            if getattr(mob, "updating_suspended", False):
+                return mob
+            for updater in mob.updaters:
+                profiler._call_updater(updater, mob, dt)
+            if recursive:
+                for submob in mob.submobjects:
+                    submob.update(dt, recursive)
+            return mob
+
+        @functools.wraps(original_write_frame)
+        def write_frame(writer, *args, **kwargs):
+            count = kwargs.get("num_frames", args[1] if len(args) > 1 else 1)
+            profiler.frames += count
+            return profiler._timed(profiler.stages, "encode", "encode", original_write_frame,
+                                   (writer, *args), kwargs)
+
+        self._set(Scene, "play", play)
+        self._set(Scene, "wait", wait)
+        if self.detailed:
+            self._set(Mobject, "update", functools.wraps(Mobject.update)(update))
+        self._set(SceneFileWriter, "write_frame", write_frame)
+        self._patch_stage(Scene, "update_mobjects", "update_mobjects")
+        self._patch_stage(Camera, "capture_mobjects", "raster")
+        self._patch_stage(SceneFileWriter, "combine_to_movie", "combine")
+
+        # TeX（tex_to_svg_file は要求回数、compile_tex・convert_to_svg はキャッシュにないときだけ呼ばれる）
+        self._patch_function("manim.utils.tex_file_writing", "tex_to_svg_file", "tex")
+        self._patch_function("manim.utils.tex_file_writing", "compile_tex", "tex_compile")
+        self._patch_function("manim.utils.tex_file_writing", "convert_to_svg", "dvisvgm")
+
+        # Pango（Text・MarkupText は SVG がキャッシュにないときだけ text2svg を呼ぶ）
+        try:
+            import manimpango
+        except ImportError:
+            manimpango = None
+        if manimpango is not None:
+            self._patch_function("manimpango", "text2svg", "pango")
+            if hasattr(manimpango, "MarkupUtils"):
+                self._patch_stage(manimpango.MarkupUtils, "text2svg", "pango_markup")
+
+        # 生成時間は __init__ を持つすべての Mobject の型で計測する
+        if self.detailed:
+            for cls in _all_subclasses(Mobject):
+                if "__init__" in vars(cls):
+                    self._set(cls, "__init__", self._wrap_init(vars(cls)["__init__"]))
+        return self
+
+    def uninstall(self):
+        for owner, attr, saved in reversed(self._patches):
+            if saved is _MISSING:
+                delattr(owner, attr)
+            else:
+                setattr(owner, attr, saved)
+        self._patches.clear()
+
+    def __enter__(self):
+        self.install()
+        self._rss_reset = reset_peak_rss()
+        self._archive_start = dict(frame_archive.stats)
+        self._start = time.perf_counter()
+        self._root = self.span("render")
+        self._root.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        self._root.__exit__(*exc_info)
+        self.wall_time = time.perf_counter() - self._start
+        self.peak_rss = peak_rss_mb(since_reset=self._rss_reset)
+        self.sim_archive = {
+            key: value - self._archive_start[key] for key, value in frame_archive.stats.items()
+        }
+        self.uninstall()
+        return False
+
+    # --- 差し替えた関数の本体 ---
+
+    def _record_play(self, original, scene, kind, names, args, kwargs):
+        if self._in_play:
+            return original(scene, *args, **kwargs)
+        index = len(self.plays)
+        label = f"{kind} {index}" + (f": {', '.join(names)}" if names else "")
+        renderer = getattr(scene, "renderer", None)
+        start_time = getattr(renderer, "time", 0.0)
+        frames = self.frames
+        self._in_play = True
+        try:
+            with self.span(label) as span:
+                result = original(scene, *args, **kwargs)
+        finally:
+            self._in_play = False
+        self.plays.append({
+            "index": index,
+            "kind": kind,
+            "animations": names,
+            "wall_time": span.elapsed,
+            "run_time": getattr(renderer, "time", 0.0) - start_time,
+            "frames": self.frames - frames,
+        })
+        return result
+
+    def _call_updater(self, updater, mob, dt):
+        takes_dt = self._signatures.get(updater)
+        if takes_dt is None:
+            takes_dt = "dt" in inspect.signature(updater).parameters
+            self._signatures[updater] = takes_dt
+        args = (mob, dt) if takes_dt else (mob,)
+        name = updater_name(updater)
+        self._timed(self.updaters, name, f"updater {name}", updater, args, {})
+
+    def _wrap_init(self, original):
+        profiler = self
+
+        @functools.wraps(original)
+        def __init__(mob, *args, **kwargs):
+            key = id(mob)
+            if key in profiler._building:
+                # super().__init__() の呼び出しは外側の生成に含める
+                return original(mob, *args, **kwargs)
+            profiler._building.add(key)
+            name = type(mob).__name__
+            try:
+                profiler._timed(profiler.constructions, name, f"new {name}", original,
+                                (mob, *args), kwargs)
+            finally:
+                profiler._building.discard(key)
+
+        return __init__
+
+    # --- 出力 ---
+
+    def report(self):
+        return {
+            "scene": self.name,
+            "detailed": self.detailed,
+            "wall_time": self.wall_time,
+            "frames_encoded": self.frames,
+            "peak_rss_mb": self.peak_rss if self.peak_rss is not None else peak_rss_mb(),
+            # scene: このシーンのあいだのピーク、process: ワーカープロセスの起動からのピーク
+            # （使い回したワーカーでは前のシーンの値を含む）
+            "peak_rss_scope": "scene" if self._rss_reset and self.peak_rss is not None else "process",
+            "plays": self.plays,
+            "stages": _sorted_stats(self.stages),
+            "updaters": _sorted_stats(self.updaters),
+            "constructions": _sorted_stats(self.constructions),
+            "sim_archive": self.sim_archive,
+        }
+
+    def write(self, directory=DEFAULT_PROFILE_DIR, stem=None):
+        """<stem>.profile.json と <stem>.folded を書き出し、そのパスを返す"""
+        directory = Path(directory)
+        directory.mkdir(parents=True, exist_ok=True)
+        stem = stem or self.name
+        report_path = directory / f"{stem}.profile.json"
+        folded_path = directory / f"{stem}.folded"
+        report_path.write_text(
+            json.dumps(self.report(), indent=2, ensure_ascii=False) + "\n", encoding="utf-8"
+        )
+        lines = [
+            f"{path} {round(seconds * 1e6)}"
+            for path, seconds in self.folded.items()
+            if seconds >= 0.5e-6
+        ]
+        folded_path.write_text("\n".join(lines) + "\n", encoding="utf-8")
+        return report_path, folded_path
+
+
+def format_report(report, top=10):
+    """プロファイルの要約を文字列で返す"""
+    rss = report.get("peak_rss_mb")
+    lines = [
+        f"{report['scene']}: {report['wall_time']:.2f} s, "
+        f"{report['frames_encoded']} frames"
+        + (f", peak RSS {rss:.0f} MB" if rss is not None else "")
+        + (" (worker process)" if rss is not None and report.get("peak_rss_scope") == "process" else ""),
+    ]
+    archive = report.get("sim_archive")
+    if archive and (archive["hits"] or archive["misses"]):
+        lines.append(f"sim archive: {archive['hits']} hits, {archive['misses']} misses "
+                     f"({archive['compute_time']:.2f} s computing)")
+
+    def table(title, rows):
+        if not rows:
+            return
+        width = max(len(name) for name, _, _ in rows)
+        lines.append("")
+        lines.append(title)
+        for name, count, seconds in rows:
+            lines.append(f"  {name.ljust(width)}  {count:>7}  {seconds:8.3f} s")
+
+    def top_stats(stats):
+        return [(name, s["count"], s["time"]) for name, s in list(stats.items())[:top]]
+
+    table("stages", top_stats(report["stages"]))
+    plays = sorted(report["plays"], key=lambda p: p["wall_time"], reverse=True)[:top]
+    table("slowest plays (frames)", [
+        (f"{p['kind']} {p['index']}: {', '.join(p['animations'])}".rstrip(": "),
+         p["frames"], p["wall_time"])
+        for p in plays
+    ])
+    table("updaters", top_stats(report["updaters"]))
+    table("mobject construction (inclusive)", top_stats(report["constructions"]))
+    return "\n".join(lines)
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="1シーンをプロファイラ付きでレンダリングする")
+    parser.add_argument("script", type=Path, nargs="?")
+    parser.add_argument("scene", nargs="?")
+    parser.add_argument("-q", "--quality", choices=["l", "m", "h", "p", "k"], default="l")
+    parser.add_argument("-o", "--output", type=Path, default=DEFAULT_PROFILE_DIR,
+                        help="プロファイルの出力先（既定: media/profiles）")
+    parser.add_argument("--top", type=int, default=10, help="要約に表示する件数")
+    parser.add_argument("--show", type=Path, metavar="PROFILE_JSON",
+                        help="レンダリングせずに既存のプロファイルの要約を表示する")
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    if args.show:
+        report = json.loads(args.show.read_text(encoding="utf-8"))
+        print(format_report(report, args.top))
+        return 0
+    if args.script is None or args.scene is None:
+        parser.error("script と scene を指定してください")
+
+    from render_all import SceneJob, render_scene
+
+    job = SceneJob(args.script.resolve(), args.scene)
+    media_dir = REPO_DIR / "media"
+    log_dir = media_dir / "logs" / "profile"
+    log_dir.mkdir(parents=True, exist_ok=True)
+    result = render_scene(job, args.quality, media_dir, log_dir, profile_dir=args.output)
+    if result.status != "ok":
+        print(f"[{result.status}] {result.error} ({result.log_path})", file=sys.stderr)
+        return 1
+
+    report_path = args.output / f"{job.module_name}.{job.scene_name}.profile.json"
+    print(format_report(json.loads(report_path.read_text(encoding="utf-8")), args.top))
+    print()
+    print(f"report: {report_path}")
+    print(f"flame graph: {report_path.with_name(f'{job.module_name}.{job.scene_name}.folded')}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
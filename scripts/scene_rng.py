@@ -0,0 +1,58 @@
+"""
+シーンごとの決定的な乱数生成器
+
+np.random.seed() でグローバルな状態を共有すると、同じプロセスで別のシーンを
+先にレンダリングしただけで結果が変わる。scene_rng() はシーン名（と用途名）と
+シード値から SeedSequence を作り、シーンごとに独立した np.random.Generator を返す。
+同じ入力からは常に同じ乱数列が得られるので、部分動画ファイルもバイト単位で一致し、
+コンテンツハッシュでキャッシュできる
+
+シード値は既定で DEFAULT_SEED。環境変数 MANIM_SCENE_SEED、または
+render_all.py の --seed で変更できる
+
+使用例:
+    class MOTAnimation(Scene):
+        def construct(self):
+            rng = scene_rng(self)
+            positions = rng.standard_normal((10000, 3)) * 0.5
+            emission = scene_rng(self, "emission")  # 用途ごとに独立した系列
+"""
+
+import hashlib
+import os
+
+import numpy as np
+
+DEFAULT_SEED = 42
+SEED_ENV = "MANIM_SCENE_SEED"
+
+
+def base_seed():
+    """設定されたシード値（環境変数 MANIM_SCENE_SEED、なければ DEFAULT_SEED）"""
+    return int(os.environ.get(SEED_ENV, DEFAULT_SEED))
+
+
+def _name_words(name):
+    """名前を SeedSequence 用の整数列にする（hash() と違いプロセスをまたいで不変）"""
+    digest = hashlib.sha256(name.encode("utf-8")).digest()
+    return [int.from_bytes(digest[i:i + 4], "little") for i in range(0, 16, 4)]
+
+
+def scene_rng(scene, stream="", seed=None):
+    """シーン名・用途名・シード値で決まる np.random.Generator を返す
+
+    Args:
+        scene: Scene インスタンス、Scene クラス、またはシーン名
+        stream: 同じシーン内で独立した乱数列が必要なときの用途名
+        seed: シード値（既定: base_seed()）
+    """
+    if isinstance(scene, str):
+        name = scene
+    elif isinstance(scene, type):
+        name = scene.__name__
+    else:
+        name = type(scene).__name__
+    if seed is None:
+        seed = base_seed()
+    key = f"{name}/{stream}" if stream else name
+    return np.random.default_rng(np.random.SeedSequence([seed, *_name_words(key)]))
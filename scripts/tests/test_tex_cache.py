@@ -0,0 +1,55 @@
+"""tex_cache.TexCache の容量制限のテスト（manim は不要）
+
+使用方法:
+    python -m pytest scripts/tests
+"""
+
+import os
+import sys
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from tex_cache import TexCache  # noqa: E402
+
+
+def _put(cache, tmp_path, i, size=100):
+    svg = tmp_path / f"src-{i}.svg"
+    svg.write_bytes(b"x" * size)
+    path = cache.put(TexCache.key(f"x_{i}"), svg)
+    # 書き込み順に更新時刻を並べる（ファイルシステムの時刻の分解能によらない）
+    os.utime(path, (1_000_000 + i, 1_000_000 + i))
+    return path
+
+
+def _disk_bytes(cache):
+    return sum(size for _, size, _ in cache.entries())
+
+
+def test_size_stays_bounded_for_short_lived_writers(tmp_path):
+    root = tmp_path / "cache"
+    # ワーカーごとに数個しか書かない場合（プロセスごとの書き込み回数に依存しない）
+    for worker in range(10):
+        cache = TexCache(root, max_bytes=1000)
+        for i in range(3):
+            _put(cache, tmp_path, worker * 3 + i)
+            assert _disk_bytes(cache) <= 1000
+    assert _disk_bytes(TexCache(root, max_bytes=1000)) <= 1000
+
+
+def test_eviction_keeps_most_recent_entries(tmp_path):
+    cache = TexCache(tmp_path / "cache", max_bytes=1000)
+    paths = [_put(cache, tmp_path, i) for i in range(30)]
+    assert paths[-1].exists()
+    assert not paths[0].exists()
+
+
+def test_clear_resets_tracked_size(tmp_path):
+    cache = TexCache(tmp_path / "cache", max_bytes=1000)
+    for i in range(5):
+        _put(cache, tmp_path, i)
+    assert cache.clear() == 5
+    for i in range(9):
+        _put(cache, tmp_path, 100 + i)
+    # 消したファイルが合計に残っていれば、ここで不要な削除が起きる
+    assert len(cache.entries()) == 9
@@ -0,0 +1,321 @@
+"""
+シーン・モジュール・マシンをまたいで共有する TeX の SVG キャッシュ
+
+manim は TeX の SVG を media/Tex/ に保存するが、このキャッシュは media ディレクトリごと
+（ベンチマークの --cold や別のマシンでは共有されない）で、大きさの上限もない。
+install() は manim の tex_to_svg_file を差し替え、コンパイル済みの SVG を
+内容で決まるキーのファイルとして共有ディレクトリに置く:
+
+    キー = sha256(TeX コンパイラ, 出力形式, テンプレートの本文, 環境, TeX 文字列)
+
+フォントサイズや色は SVG を読み込んだあとの拡大・着色なのでキーに含めない
+（含めると同じ r"|g\\rangle" がサイズの数だけコンパイルされる）。
+
+    <キャッシュ>/ab/abcdef....svg
+
+書き込みは同じディレクトリの一時ファイルに書いてから os.replace するので、
+複数のワーカーやマシンが同時に書いても、読み手が書きかけのファイルを見ることはない
+（同じキーなら内容も同じなので、どちらが勝っても結果は変わらない）。
+ヒットしたファイルの更新時刻を進め、合計サイズが上限を超えたら更新時刻の古い順
+（LRU）に上限の 90% まで消す。合計サイズはキャッシュ内の .size にロックファイルで
+排他しながら書き込みごとに足していくので、数個しか書かない短命のワーカーが
+並列に書き込んでも上限を超えたままにはならない
+
+キャッシュの場所は環境変数 MANIM_TEX_CACHE（既定: media/tex_cache、off で無効）、
+上限は MANIM_TEX_CACHE_MB（既定: 512 MB）で変えられる。NFS などの共有ディレクトリを
+指定すれば複数のマシンで共有できる。render_all.py / render_daemon.py のワーカーは自動で使う
+
+使用方法:
+    python scripts/tex_cache.py warm                        # scripts/*.py の MathTex・Tex のリテラルを並列にコンパイル
+    python scripts/tex_cache.py warm scripts/mach_zehnder_animation.py  # （prewarm.py --tex-only と同じ）
+    python scripts/tex_cache.py stats
+    python scripts/tex_cache.py prune --max-mb 128
+    python scripts/tex_cache.py clear
+
+使用例:
+    import tex_cache
+    tex_cache.install()             # 以降の MathTex / Tex は共有キャッシュを使う
+"""
+
+import argparse
+import hashlib
+import json
+import os
+import sys
+import time
+import uuid
+from pathlib import Path
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+FORMAT_VERSION = 1
+REPO_DIR = Path(__file__).resolve().parent.parent
+CACHE_ENV = "MANIM_TEX_CACHE"
+SIZE_ENV = "MANIM_TEX_CACHE_MB"
+DEFAULT_CACHE_DIR = REPO_DIR / "media" / "tex_cache"
+DEFAULT_MAX_MB = 512
+
+# 合計サイズを記録するファイル（キャッシュのディレクトリ内）
+SIZE_NAME = ".size"
+# この秒数以内に使ったファイルは更新時刻を進めない（共有ディレクトリへの書き込みを減らす）
+TOUCH_INTERVAL = 60.0
+# 書きかけのまま残った一時ファイルを消すまでの秒数
+STALE_TMP_SECONDS = 3600.0
+
+# install() 済みのキャッシュ（プロセスにつき1つ）
+_installed = {}
+
+
+class TexCache:
+    """内容で決まるキーの SVG ファイルを置くディレクトリ
+
+    Args:
+        root: キャッシュのディレクトリ
+        max_bytes: 合計サイズの上限（超えたら古いものから消す）
+    """
+
+    def __init__(self, root=DEFAULT_CACHE_DIR, max_bytes=DEFAULT_MAX_MB << 20):
+        self.root = Path(root)
+        self.max_bytes = int(max_bytes)
+        self.hits = 0
+        self.misses = 0
+
+    @classmethod
+    def from_env(cls):
+        """環境変数の設定で作る（MANIM_TEX_CACHE=off なら None）"""
+        root = os.environ.get(CACHE_ENV, "")
+        if root.lower() in ("off", "0", "false", "no"):
+            return None
+        max_mb = float(os.environ.get(SIZE_ENV, DEFAULT_MAX_MB))
+        return cls(Path(root) if root else DEFAULT_CACHE_DIR, max_mb * (1 << 20))
+
+    @staticmethod
+    def key(expression, environment=None, tex_template=None):
+        """TeX 文字列・環境・テンプレートから決まるキー（sha256 の16進）"""
+        payload = json.dumps(
+            [
+                FORMAT_VERSION,
+                getattr(tex_template, "tex_compiler", None),
+                getattr(tex_template, "output_format", None),
+                getattr(tex_template, "body", None),
+                environment,
+                expression,
+            ],
+            ensure_ascii=False,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def path(self, key):
+        return self.root / key[:2] / f"{key}.svg"
+
+    def get(self, key):
+        """キャッシュにあればそのパス（更新時刻を進める）、なければ None"""
+        path = self.path(key)
+        try:
+            mtime = path.stat().st_mtime
+        except FileNotFoundError:
+            self.misses += 1
+            return None
+        now = time.time()
+        if now - mtime > TOUCH_INTERVAL:
+            try:
+                os.utime(path, (now, now))
+            except OSError:
+                pass
+        self.hits += 1
+        return path
+
+    def put(self, key, svg_file):
+        """svg_file の内容をキャッシュに書き込み、キャッシュ内のパスを返す"""
+        path = self.path(key)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = path.with_name(f"{path.name}.{os.getpid()}.{uuid.uuid4().hex[:8]}.tmp")
+        tmp.write_bytes(Path(svg_file).read_bytes())
+        try:
+            replaced = path.stat().st_size
+        except FileNotFoundError:
+            replaced = 0
+        size = tmp.stat().st_size
+        os.replace(tmp, path)
+        self._add_size(size - replaced)
+        return path
+
+    def _lock(self, blocking=True):
+        """キャッシュ全体のロック（取れなければ None）。with 文で使う"""
+        self.root.mkdir(parents=True, exist_ok=True)
+        lock = open(self.root / ".lock", "a")
+        if fcntl is not None:
+            try:
+                fcntl.flock(lock, fcntl.LOCK_EX | (0 if blocking else fcntl.LOCK_NB))
+            except BlockingIOError:
+                lock.close()
+                return None
+        return lock
+
+    def _read_size(self):
+        """.size の合計サイズ（なければ数え直す）。ロック中に呼ぶ"""
+        try:
+            return int((self.root / SIZE_NAME).read_text())
+        except (FileNotFoundError, ValueError):
+            return sum(size for _, size, _ in self.entries())
+
+    def _write_size(self, total):
+        (self.root / SIZE_NAME).write_text(str(max(0, int(total))))
+
+    def _add_size(self, delta):
+        """合計サイズに delta を足し、上限を超えたら古いものから消す"""
+        lock = self._lock()
+        with lock:
+            total = self._read_size() + delta
+            self._write_size(total)
+            if total > self.max_bytes:
+                self._evict_locked(self.max_bytes)
+
+    def entries(self):
+        """(更新時刻, サイズ, パス) の一覧"""
+        entries = []
+        for path in self.root.glob("*/*.svg"):
+            try:
+                stat = path.stat()
+            except FileNotFoundError:
+                continue
+            entries.append((stat.st_mtime, stat.st_size, path))
+        return entries
+
+    def evict(self, max_bytes=None):
+        """合計サイズが上限を超えていたら、古いものから上限の 90% まで消す（消した数を返す）
+
+        別のプロセスが削除中なら何もしない
+        """
+        max_bytes = self.max_bytes if max_bytes is None else int(max_bytes)
+        lock = self._lock(blocking=False)
+        if lock is None:
+            return 0
+        with lock:
+            return self._evict_locked(max_bytes)
+
+    def _evict_locked(self, max_bytes):
+        """ロック中に呼ぶ。ファイルを数え直して .size も正しい値に戻す"""
+        # 中断されたプロセスの一時ファイル
+        cutoff = time.time() - STALE_TMP_SECONDS
+        for tmp in self.root.glob("*/*.tmp"):
+            try:
+                if tmp.stat().st_mtime < cutoff:
+                    tmp.unlink()
+            except FileNotFoundError:
+                pass
+
+        entries = self.entries()
+        total = sum(size for _, size, _ in entries)
+        removed = 0
+        if total > max_bytes:
+            target = 0.9 * max_bytes
+            for _, size, path in sorted(entries):
+                try:
+                    path.unlink()
+                except FileNotFoundError:
+                    pass
+                total -= size
+                removed += 1
+                if total <= target:
+                    break
+        self._write_size(total)
+        return removed
+
+    def clear(self):
+        removed = 0
+        lock = self._lock()
+        with lock:
+            for _, _, path in self.entries():
+                path.unlink(missing_ok=True)
+                removed += 1
+            self._write_size(0)
+        return removed
+
+    def stats(self):
+        entries = self.entries()
+        return {
+            "root": str(self.root),
+            "files": len(entries),
+            "bytes": sum(size for _, size, _ in entries),
+            "max_bytes": self.max_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+
+def install(cache=None):
+    """manim の tex_to_svg_file を共有キャッシュを使うものに差し替える（何度呼んでもよい）
+
+    Returns:
+        使っている TexCache（環境変数で無効にしている場合は None）
+    """
+    if "cache" in _installed:
+        return _installed["cache"]
+    cache = cache or TexCache.from_env()
+    _installed["cache"] = cache
+    if cache is None:
+        return None
+
+    from manim import config
+    import manim.utils.tex_file_writing as tex_file_writing
+
+    original = tex_file_writing.tex_to_svg_file
+
+    def tex_to_svg_file(expression, environment=None, tex_template=None):
+        template = tex_template if tex_template is not None else config["tex_template"]
+        key = cache.key(expression, environment, template)
+        cached = cache.get(key)
+        if cached is not None:
+            return cached
+        svg_file = original(expression, environment=environment, tex_template=tex_template)
+        cache.put(key, svg_file)
+        return svg_file
+
+    # from import で同じ関数を参照している manim のモジュール（tex_mobject など）も差し替える
+    for name, module in list(sys.modules.items()):
+        if name.startswith("manim") and vars(module).get("tex_to_svg_file") is original:
+            module.tex_to_svg_file = tex_to_svg_file
+    return cache
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(description="共有 TeX キャッシュの管理")
+    sub = parser.add_subparsers(dest="command", required=True)
+    warm_parser = sub.add_parser("warm", help="スクリプトの TeX リテラルを事前にコンパイルする")
+    warm_parser.add_argument("scripts", nargs="*", type=Path,
+                             help="対象のスクリプト（既定: scripts/*.py）")
+    sub.add_parser("stats", help="キャッシュの大きさを表示する")
+    prune_parser = sub.add_parser("prune", help="上限を超えた分を古いものから消す")
+    prune_parser.add_argument("--max-mb", type=float, default=None)
+    sub.add_parser("clear", help="キャッシュを空にする")
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    cache = TexCache.from_env()
+    if cache is None:
+        print(f"{CACHE_ENV} でキャッシュが無効になっています", file=sys.stderr)
+        return 1
+
+    if args.command == "warm":
+        import prewarm
+
+        return prewarm.main(["--tex-only", *map(str, args.scripts)])
+    if args.command == "prune":
+        max_bytes = None if args.max_mb is None else args.max_mb * (1 << 20)
+        print(f"{cache.evict(max_bytes)} files removed")
+    elif args.command == "clear":
+        print(f"{cache.clear()} files removed")
+    stats = cache.stats()
+    print(f"{stats['root']}: {stats['files']} files, {stats['bytes'] / (1 << 20):.1f} MB "
+          f"(limit {stats['max_bytes'] / (1 << 20):.0f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())